@@ -1,54 +1,97 @@
+from collections import deque
 import numpy as np
 import pandas as pd
+from common.profiling import count, stage
 
-def find_cycle(basis, start):
-    """
-    Znajduje cykl w bazie z punktu startowego
-    """
-    from collections import defaultdict
+DELTA_TOLERANCE = 1e-9
 
-    basis_plus = basis + [start]
-    rows = defaultdict(list)
-    columns = defaultdict(list)
 
-    # Build row and column maps from basis cells
-    for (i, j) in basis_plus:
-        rows[i].append((i, j))
-        columns[j].append((i, j))
-
-    def dfs(path, visited, level=0):
-        last = path[-1]
-        row_idx, col_idx = last
+def basis_graph(basis):
+    """
+    Sąsiedztwo w drzewie bazy: {("row", i) lub ("col", j): [(sąsiad, komórka)]}.
+    """
+    neighbours = {}
+    for (i, j) in basis:
+        neighbours.setdefault(("row", i), []).append((("col", j), (i, j)))
+        neighbours.setdefault(("col", j), []).append((("row", i), (i, j)))
+    return neighbours
 
-        # Completed cycle
-        if len(path) >= 4 and last == start and level % 2 == 0:
-            return path
 
-        # Choose neighbors in the row or column, alternating
-        neighbors = rows[row_idx] if level % 2 == 0 else columns[col_idx]
+def find_cycle(basis, start):
+    """
+    Znajduje cykl w bazie z punktu startowego.
 
-        for (i, j) in neighbors:
-            if (i, j) == start and len(path) >= 4:
-                return path
-            if (i, j) not in visited:
-                new_path = dfs(path + [(i, j)], visited | {(i, j)}, level + 1)
-                if new_path:
-                    return new_path
+    Baza jest drzewem rozpinającym grafu dwudzielnego wierszy i kolumn (komórka
+    (i, j) łączy wiersz i z kolumną j), więc cykl tworzy komórka startowa i jedyna
+    ścieżka w drzewie od kolumny do wiersza komórki startowej. Zwraca komórki
+    cyklu zaczynając od startowej (parzyste +, nieparzyste -) lub None.
+    """
+    neighbours = basis_graph(basis)
+    source, target = ("col", start[1]), ("row", start[0])
+    parent = {source: None}
+    queue = deque([source])
+    while queue:
+        node = queue.popleft()
+        if node == target:
+            break
+        for other, cell in neighbours.get(node, ()):
+            if other not in parent:
+                parent[other] = (node, cell)
+                queue.append(other)
+    if target not in parent:
         return None
 
-    return dfs([start], {start})
+    path = []
+    node = target
+    while parent[node] is not None:
+        node, cell = parent[node]
+        path.append(cell)
+    return [tuple(start)] + path[::-1]
 
 
+def complete_basis(detailed_revenue, optimal_plan):
+    """
+    Uzupełnia bazę zdegenerowanego planu komórkami o ilości 0 (najpierw o największym
+    zysku), aż stanie się drzewem rozpinającym z m + n - 1 komórkami; wtedy potencjały
+    są wyznaczone dla wszystkich wierszy i kolumn.
+    """
+    rows, cols = optimal_plan.shape
+    root = list(range(rows + cols))
+
+    def find(node):
+        while root[node] != node:
+            root[node] = root[root[node]]
+            node = root[node]
+        return node
+
+    basic = ~np.isnan(optimal_plan)
+    for i, j in zip(*np.where(basic)):
+        root[find(i)] = find(rows + j)
+    missing = rows + cols - 1 - int(basic.sum())
+    for flat in np.argsort(detailed_revenue, axis=None)[::-1]:
+        if missing <= 0:
+            break
+        i, j = divmod(int(flat), cols)
+        if basic[i, j] or find(i) == find(rows + j):
+            continue
+        root[find(i)] = find(rows + j)
+        optimal_plan[i, j] = 0
+        missing -= 1
+    return optimal_plan
 
-def ZZT(supply, demand, purchase_cost, sell_price, unit_transport_costs, supplier_contracts, seller_contracts):
-    # --- Obliczanie zysku jednostkowego ---
+
+def balance_problem(supply, demand, purchase_cost, sell_price, unit_transport_costs, supplier_contracts,
+                    seller_contracts):
+    """
+    Oblicza zyski jednostkowe i, gdy podaż różni się od popytu, dodaje fikcyjnego
+    dostawcę i odbiorcę (umowy blokują trasy do fikcyjnych węzłów).
+    """
     detailed_revenue = sell_price - purchase_cost[:, np.newaxis] - unit_transport_costs
-    original_rows, original_cols = detailed_revenue.shape
 
     if supply.sum() != demand.sum():
         seller_contracts = np.append(seller_contracts, 0)
         supplier_contracts = np.append(supplier_contracts, 0)
-        
+
         total_supply = supply.sum()
         total_demand = demand.sum()
         new_z = np.zeros((detailed_revenue.shape[0] + 1, detailed_revenue.shape[1] + 1))
@@ -68,9 +111,15 @@ def ZZT(supply, demand, purchase_cost, sell_price, unit_transport_costs, supplie
 
         detailed_revenue[:, -1] += -block_val * supplier_contracts
         unit_transport_costs[:, -1] += block_val * supplier_contracts
-        
 
-    # --- Pierwsza propozycja planu dostaw ---
+    return (detailed_revenue, supply, demand, purchase_cost, sell_price, unit_transport_costs,
+            supplier_contracts, seller_contracts)
+
+
+def initial_plan(detailed_revenue, supply, demand):
+    """
+    Pierwsza propozycja planu dostaw metodą maksymalnego elementu macierzy zysków.
+    """
     # Kopia zysków, w celu poprawnego sortowania
     dt_rev_copy = detailed_revenue.copy()
     max_value = np.max(dt_rev_copy) + 1
@@ -91,99 +140,143 @@ def ZZT(supply, demand, purchase_cost, sell_price, unit_transport_costs, supplie
             demand_left[j] -= qty
 
     optimal_plan[optimal_plan < 0] = np.nan
+    return complete_basis(detailed_revenue, optimal_plan)
+
+
+def potentials(detailed_revenue, optimal_plan):
+    """
+    Wyznacza potencjały alfa (wiersze) i beta (kolumny) z komórek bazowych planu
+    jednym przejściem BFS po drzewie bazy od ostatniego wiersza (alfa = 0).
+    Potencjały wierszy i kolumn spoza drzewa pozostają NaN.
+    """
+    rows, cols = detailed_revenue.shape
+    alpha = np.full(rows, np.nan)
+    beta = np.full(cols, np.nan)
+    alpha[-1] = 0
+
+    neighbours = basis_graph(zip(*np.nonzero(~np.isnan(optimal_plan))))
+    queue = deque([("row", rows - 1)])
+    while queue:
+        node = queue.popleft()
+        for (kind, index), (i, j) in neighbours.get(node, ()):
+            if kind == "col" and np.isnan(beta[j]):
+                beta[j] = detailed_revenue[i, j] - alpha[i]
+            elif kind == "row" and np.isnan(alpha[i]):
+                alpha[i] = detailed_revenue[i, j] - beta[j]
+            else:
+                continue
+            queue.append((kind, index))
+    return alpha, beta
+
+
+def deltas(detailed_revenue, optimal_plan, alpha, beta):
+    """
+    Zwraca macierz wskaźników delta = z - alfa - beta; komórki bazowe (i te bez
+    potencjałów) mają wartość NaN.
+    """
+    delta = detailed_revenue - alpha[:, np.newaxis] - beta[np.newaxis, :]
+    delta[~np.isnan(optimal_plan)] = np.nan
+    return delta
+
+
+def shift_along_cycle(optimal_plan, cycle):
+    """
+    Przesuwa maksymalną możliwą ilość wzdłuż cyklu (komórki parzyste +, nieparzyste -).
+    Komórka startowa wchodzi do bazy, a opuszcza ją dokładnie jedna komórka o najmniejszej
+    ilości; pozostałe komórki, które spadły do 0, zostają w bazie, więc baza pozostaje drzewem.
+    """
+    leaving = min(cycle[1::2], key=lambda cell: optimal_plan[cell])
+    min_qty = optimal_plan[leaving]
+    for i, j in cycle[1::2]:
+        optimal_plan[i, j] -= min_qty
+    for i, j in cycle[::2]:
+        if np.isnan(optimal_plan[i, j]):
+            optimal_plan[i, j] = 0
+        optimal_plan[i, j] += min_qty
+    optimal_plan[leaving] = np.nan
+
+
+def ZZT(supply, demand, purchase_cost, sell_price, unit_transport_costs, supplier_contracts, seller_contracts,
+        progress=None):
+    """
+    Rozwiązuje zagadnienie pośrednika.
+    progress - opcjonalna funkcja progress(fraction, message) wywoływana co iterację optymalizacji;
+    może zgłosić wyjątek, aby przerwać obliczenia.
+    Etapy i liczba iteracji poprawy planu ("broker.pivots") są raportowane do common.profiling.
+    """
+    original_rows, original_cols = len(supply), len(demand)
+    count("broker.cells", original_rows * original_cols)
+
+    # --- Obliczanie zysku jednostkowego ---
+    with stage("broker.balancing"):
+        (detailed_revenue, supply, demand, purchase_cost, sell_price, unit_transport_costs,
+         supplier_contracts, seller_contracts) = balance_problem(
+            supply, demand, purchase_cost, sell_price, unit_transport_costs, supplier_contracts, seller_contracts)
+
+    # --- Pierwsza propozycja planu dostaw ---
+    with stage("broker.initial_plan"):
+        optimal_plan = initial_plan(detailed_revenue, supply, demand)
 
     # --- Sprawdzenie poprawności wyniku i optymalizacja ---
-    delta_results = []
-    max_delta = 0
+    iteration = 0
     while True:
-        alpha = [None] * detailed_revenue.shape[0]
-        beta = [None] * detailed_revenue.shape[1]
-        alpha[-1] = 0
-
-        while True:
-            changed = False
-            for i in range(detailed_revenue.shape[0]):
-                for j in range(detailed_revenue.shape[1]):
-                    if not np.isnan(optimal_plan[i, j]):
-                        if alpha[i] is not None and beta[j] is None:
-                            beta[j] = detailed_revenue[i, j] - alpha[i]
-                            changed = True
-                        elif alpha[i] is None and beta[j] is not None:
-                            alpha[i] = detailed_revenue[i, j] - beta[j]
-                            changed = True
-            if not changed:
-                break
-
-        delta_results = []
-        for i in range(detailed_revenue.shape[0]):
-            for j in range(detailed_revenue.shape[1]):
-                if np.isnan(optimal_plan[i, j]) and alpha[i] is not None and beta[j] is not None:
-                    delta = detailed_revenue[i, j] - alpha[i] - beta[j]
-                    delta_results.append((i, j, delta))
-
-        max_delta = max(delta_results, key=lambda x: x[2])
-        
+        iteration += 1
+        if progress:
+            progress(None, f"Iteration {iteration}")
+        with stage("broker.potentials"):
+            alpha, beta = potentials(detailed_revenue, optimal_plan)
+
+        with stage("broker.deltas"):
+            delta = deltas(detailed_revenue, optimal_plan, alpha, beta)
+            non_basic = ~np.isnan(delta)
+            # Every cell is basic when there are no non-basic cells (e.g. a single row)
+            if non_basic.any():
+                i, j = np.unravel_index(np.nanargmax(delta), delta.shape)
+                max_delta = (i, j, delta[i, j])
+            else:
+                max_delta = (None, None, 0)
+
         # --- Optymalizacja wyniku ---
-        if max_delta[2] > 0:
-            cycle = find_cycle(list(zip(*np.where(~np.isnan(optimal_plan)))), max_delta[:2])
-            if cycle is None:
-                raise ValueError("Nie można znaleźć cyklu.")
-
-            min_qty = min(optimal_plan[i, j] for i, j in cycle[1::2])
-            for i, j in cycle[1::2]:
-                if np.isnan(optimal_plan[i, j]):
-                    optimal_plan[i, j] = 0
-                optimal_plan[i, j] -= min_qty
-                if optimal_plan[i, j] == 0:
-                    optimal_plan[i, j] = np.nan
-            for i, j in cycle[::2]:
-                if np.isnan(optimal_plan[i, j]):
-                    optimal_plan[i, j] = 0
-                optimal_plan[i, j] += min_qty
-                if optimal_plan[i, j] == 0:
-                    optimal_plan[i, j] = np.nan
+        if max_delta[2] > DELTA_TOLERANCE:
+            with stage("broker.cycle_search"):
+                cycle = find_cycle(list(zip(*np.where(~np.isnan(optimal_plan)))), max_delta[:2])
+                if cycle is None:
+                    raise ValueError("Nie można znaleźć cyklu.")
+                shift_along_cycle(optimal_plan, cycle)
+            count("broker.pivots")
         else:
             break
 
-
-    # --- Obliczanie całkowitego zysku i kosztów ---
-    total_profit = 0
-    transport_cost_total = 0
-    purchase_cost_total = 0
-    revenue_total = 0
-
-    for i in range(detailed_revenue.shape[0]):
-        for j in range(detailed_revenue.shape[1]):
-            if not np.isnan(optimal_plan[i, j]):
-                qty = optimal_plan[i, j]
-                total_profit += detailed_revenue[i, j] * qty
-                if i < original_rows and j < original_cols:
-                    purchase_cost_total += purchase_cost[i] * qty
-                if i < original_rows and j < original_cols:
-                    revenue_total += sell_price[j] * qty
-                if i < original_rows and j < original_cols:
-                    transport_cost_total += unit_transport_costs[i][j] * qty
-
-
-    # --- Przygotowanie wyników do wyświetlenia ---
-    row_labels = [f"D{i+1}" if i < original_rows else "DF" for i in range(detailed_revenue.shape[0])]
-    col_labels = [f"O{j+1}" if j < original_cols else "OF" for j in range(detailed_revenue.shape[1])]
-    plan_df = pd.DataFrame(optimal_plan, index=row_labels, columns=col_labels).fillna("-").replace(0, "-")
-    z_df = pd.DataFrame(detailed_revenue, index=row_labels, columns=col_labels).astype(object)
-    z_df.loc[row_labels[-1], seller_contracts == 1] = "-M"
-    z_df.loc[supplier_contracts == 1, col_labels[-1]] = "-M"
-
-    delta_readable = [f"{row_labels[i]} -> {col_labels[j]} Δ = {delta:.2f}" for i, j, delta in delta_results]
-
-    has_similar_alt_solution=max_delta[2] == 0
-
-    return (
-        plan_df,
-        total_profit,
-        z_df,
-        delta_readable,
-        revenue_total,
-        purchase_cost_total,
-        transport_cost_total,
-        has_similar_alt_solution
-    )
+    with stage("broker.result_assembly"):
+        # --- Obliczanie całkowitego zysku i kosztów ---
+        quantity = np.nan_to_num(optimal_plan)
+        # Fikcyjny dostawca i odbiorca nie wchodzą do przychodu ani kosztów
+        real = quantity[:original_rows, :original_cols]
+        total_profit = (detailed_revenue * quantity).sum()
+        purchase_cost_total = (purchase_cost[:original_rows, np.newaxis] * real).sum()
+        revenue_total = (sell_price[:original_cols] * real).sum()
+        transport_cost_total = (unit_transport_costs[:original_rows, :original_cols] * real).sum()
+
+        # --- Przygotowanie wyników do wyświetlenia ---
+        row_labels = [f"D{i+1}" if i < original_rows else "DF" for i in range(detailed_revenue.shape[0])]
+        col_labels = [f"O{j+1}" if j < original_cols else "OF" for j in range(detailed_revenue.shape[1])]
+        plan_df = pd.DataFrame(optimal_plan, index=row_labels, columns=col_labels).fillna("-").replace(0, "-")
+        z_df = pd.DataFrame(detailed_revenue, index=row_labels, columns=col_labels).astype(object)
+        z_df.loc[row_labels[-1], seller_contracts == 1] = "-M"
+        z_df.loc[supplier_contracts == 1, col_labels[-1]] = "-M"
+
+        delta_readable = [f"{row_labels[i]} -> {col_labels[j]} Δ = {delta[i, j]:.2f}"
+                          for i, j in zip(*np.nonzero(non_basic))]
+
+        has_similar_alt_solution = bool(non_basic.any()) and abs(max_delta[2]) <= DELTA_TOLERANCE
+
+        return (
+            plan_df,
+            total_profit,
+            z_df,
+            delta_readable,
+            revenue_total,
+            purchase_cost_total,
+            transport_cost_total,
+            has_similar_alt_solution
+        )
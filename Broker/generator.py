@@ -0,0 +1,39 @@
+import numpy as np
+from Broker.workbook import BrokerProblem
+
+
+def generate_problem(suppliers, receivers, seed=None, balanced=True, density=1.0, contract=False,
+                     degenerate=False):
+    """
+    Generuje losowe zagadnienie pośrednika o całkowitych danych.
+
+    density - część tras z normalnym kosztem transportu; pozostałe mają koszt zaporowy
+    contract - dodaje umowę z pierwszym dostawcą ("D1")
+    degenerate - równe podaże i popyty, przez co plan początkowy ma mniej komórek bazowych
+    """
+    rng = np.random.default_rng(seed)
+    if degenerate:
+        supply = np.full(suppliers, 10 * receivers)
+        demand = np.full(receivers, 10 * suppliers)
+    else:
+        supply = rng.integers(10, 100, suppliers)
+        demand = rng.integers(10, 100, receivers)
+    if balanced:
+        # Move the difference onto the last receiver (or supplier) so the totals match
+        difference = supply.sum() - demand.sum()
+        if difference > 0:
+            demand[-1] += difference
+        else:
+            supply[-1] -= difference
+    elif supply.sum() == demand.sum():
+        demand[-1] += 1
+
+    purchase_cost = rng.integers(5, 20, suppliers)
+    sale_price = rng.integers(25, 60, receivers)
+    transport_costs = rng.integers(1, 15, (suppliers, receivers))
+    if density < 1.0:
+        blocked = rng.random((suppliers, receivers)) >= density
+        transport_costs[blocked] = 1000
+
+    return BrokerProblem(supply, demand, purchase_cost, sale_price, transport_costs,
+                         "D1" if contract else "None")
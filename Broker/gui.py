@@ -2,7 +2,10 @@ from tkinter import ttk, messagebox
 import numpy as np
 import tkinter as tk
 from Broker.broker import ZZT
-import pandas as pd
+from Broker.matrix_editor import MatrixEditor
+from Broker.workbook import BrokerProblem, write_problem
+from Broker.problem_file import load_problem, save_problem_npz
+from common.worker import BackgroundSolver
 from tkinter.filedialog import asksaveasfilename, askopenfilename
 
 
@@ -52,6 +55,11 @@ class IntermediaryProblemApp:
         self.suppliers = 2
         self.receivers = 3
 
+        # ZZT runs on a worker thread; results of outdated inputs are discarded
+        self.solver = BackgroundSolver(self.root)
+        self.last_problem = None
+        self.last_result = None
+
         self.create_widgets()
 
     def create_widgets(self):
@@ -83,7 +91,7 @@ class IntermediaryProblemApp:
         self.receivers_entry.grid(row=1, column=1, padx=5, pady=5)
 
         ttk.Button(input_inner, text="Update Table", style="Accent.TButton", command=self.update_input_tables).grid(row=2, column=0, columnspan=2, pady=10)
-        ttk.Button(input_inner, text="Load from Excel", style="Accent.TButton", command=self.load_from_excel).grid(row=3, column=0, columnspan=2, pady=10)
+        ttk.Button(input_inner, text="Load from File", style="Accent.TButton", command=self.load_from_excel).grid(row=3, column=0, columnspan=2, pady=10)
 
         self.tables_frame = ttk.LabelFrame(left_frame, text="Input Data")
         self.tables_frame.pack(fill="both", expand=True)
@@ -114,144 +122,140 @@ class IntermediaryProblemApp:
         button_frame.grid(row=1, column=0, pady=10)
 
         ttk.Button(button_frame, text="Solve", style="Accent.TButton", command=self.solve_problem).grid(row=0, column=0, padx=5)
-        ttk.Button(button_frame, text="Save to Excel", style="Accent.TButton", command=self.save_to_excel).grid(row=0, column=1, padx=5)
+        ttk.Button(button_frame, text="Cancel", style="Accent.TButton", command=self.solver.cancel).grid(row=0, column=1, padx=5)
+        ttk.Button(button_frame, text="Save to Excel", style="Accent.TButton", command=self.save_to_excel).grid(row=0, column=2, padx=5)
+        ttk.Button(button_frame, text="Save Problem (NPZ)", style="Accent.TButton", command=self.save_to_npz).grid(row=0, column=3, padx=5)
 
         self.update_input_tables()
 
     def update_input_tables(self, supply=None, demand=None, purchase_cost=None, sale_price=None, transport_costs=None, contract=None):
         try:
-            self.suppliers = len(supply) if supply else int(self.suppliers_entry.get())
-            self.receivers = len(demand) if demand else int(self.receivers_entry.get())
+            self.suppliers = len(supply) if supply is not None else int(self.suppliers_entry.get())
+            self.receivers = len(demand) if demand is not None else int(self.receivers_entry.get())
             if self.suppliers < 1 or self.receivers < 1:
                 raise ValueError("Number of suppliers and receivers must be positive.")
         except ValueError as e:
             messagebox.showerror("Error", f"Invalid input: {e}")
             return
 
+        self.solver.invalidate()
         for widget in self.tables_frame.winfo_children():
             widget.destroy()
-
-        row_offset = 0
-
-        # Supply
-        ttk.Label(self.tables_frame, text="Supply:", style="Header.TLabel", font=("Arial", 10, "bold")).grid(row=row_offset, column=0, padx=5, pady=5)
-        self.supply_entries = []
-        for i in range(self.suppliers):
-            ttk.Label(self.tables_frame, text=f"O{i+1}").grid(row=row_offset, column=i+1, padx=5, pady=5)
-            entry = ttk.Entry(self.tables_frame, width=5)
-            entry.grid(row=row_offset + 1, column=i+1, padx=5, pady=5)
-            entry.insert(0, str(supply[i]) if supply else "0")
-            self.supply_entries.append(entry)
-        row_offset += 2
-
-        ttk.Separator(self.tables_frame, orient='horizontal').grid(row=row_offset, column=0, columnspan=self.suppliers + 2, sticky="ew", pady=10)
-        row_offset += 1
-
-        # Purchase Costs
-        ttk.Label(self.tables_frame, text="Purchase Costs:", style="Header.TLabel", font=("Arial", 10, "bold")).grid(row=row_offset, column=0, padx=5, pady=5)
-        self.purchase_entries = []
-        for i in range(self.suppliers):
-            entry = ttk.Entry(self.tables_frame, width=5)
-            entry.grid(row=row_offset + 1, column=i+1, padx=5, pady=5)
-            entry.insert(0, str(purchase_cost[i]) if purchase_cost else "0")
-            self.purchase_entries.append(entry)
-        row_offset += 2
-
-        ttk.Separator(self.tables_frame, orient='horizontal').grid(row=row_offset, column=0, columnspan=self.suppliers + 2, sticky="ew", pady=10)
-        row_offset += 1
-
-        # Demand
-        ttk.Label(self.tables_frame, text="Demand:", style="Header.TLabel", font=("Arial", 10, "bold")).grid(row=row_offset, column=0, padx=5, pady=5)
-        self.demand_entries = []
-        for j in range(self.receivers):
-            ttk.Label(self.tables_frame, text=f"D{j+1}").grid(row=row_offset, column=j+1, padx=5, pady=5)
-            entry = ttk.Entry(self.tables_frame, width=5)
-            entry.grid(row=row_offset + 1, column=j+1, padx=5, pady=5)
-            entry.insert(0, str(demand[j]) if demand else "0")
-            self.demand_entries.append(entry)
-        row_offset += 2
-
-        ttk.Separator(self.tables_frame, orient='horizontal').grid(row=row_offset, column=0, columnspan=self.receivers + 2, sticky="ew", pady=10)
-        row_offset += 1
-
-        # Sale Prices
-        ttk.Label(self.tables_frame, text="Sale Prices:", style="Header.TLabel", font=("Arial", 10, "bold")).grid(row=row_offset, column=0, padx=5, pady=5)
-        self.sale_entries = []
-        for j in range(self.receivers):
-            entry = ttk.Entry(self.tables_frame, width=5)
-            entry.grid(row=row_offset + 1, column=j+1, padx=5, pady=5)
-            entry.insert(0, str(sale_price[j]) if sale_price else "0")
-            self.sale_entries.append(entry)
-        row_offset += 2
-
-        ttk.Separator(self.tables_frame, orient='horizontal').grid(row=row_offset, column=0, columnspan=self.receivers + 2, sticky="ew", pady=10)
-        row_offset += 1
-
-        # Transport Costs
-        ttk.Label(self.tables_frame, text="Transport Costs:", style="Header.TLabel", font=("Arial", 10, "bold")).grid(row=row_offset, column=0, padx=5, pady=5)
-        self.transport_entries = []
-        for i in range(self.suppliers):
-            ttk.Label(self.tables_frame, text=f"O{i+1}").grid(row=row_offset + i + 1, column=0, padx=5, pady=5)
-            row_entries = []
-            for j in range(self.receivers):
-                if i == 0:
-                    ttk.Label(self.tables_frame, text=f"D{j+1}").grid(row=row_offset, column=j+1, padx=5, pady=5)
-                entry = ttk.Entry(self.tables_frame, width=5)
-                entry.grid(row=row_offset + i + 1, column=j+1, padx=5, pady=5)
-                value = str(transport_costs[i][j]) if transport_costs else "0"
-                entry.insert(0, value)
-                row_entries.append(entry)
-            self.transport_entries.append(row_entries)
-        row_offset += self.suppliers + 2
-
-        ttk.Separator(self.tables_frame, orient='horizontal').grid(row=row_offset, column=0, columnspan=max(self.suppliers, self.receivers) + 2, sticky="ew", pady=10)
-        row_offset += 1
+        self.tables_frame.columnconfigure(0, weight=1)
+
+        def vector(values, size):
+            return np.zeros((1, size)) if values is None else np.asarray(values, dtype=float).reshape(1, size)
+
+        def section(row, title):
+            ttk.Label(self.tables_frame, text=title, style="Header.TLabel", font=("Arial", 10, "bold")).grid(
+                row=row, column=0, padx=5, pady=(5, 0), sticky="w")
+
+        # Matrix editors keep the data in NumPy arrays and draw only the visible cells
+        section(0, "Supply:")
+        self.supply_editor = MatrixEditor(self.tables_frame, vector(supply, self.suppliers),
+                                          col_label="O", show_row_headers=False,
+                                          on_change=self.solver.invalidate)
+        self.supply_editor.grid(row=1, column=0, padx=5, sticky="ew")
+
+        section(2, "Purchase Costs:")
+        self.purchase_editor = MatrixEditor(self.tables_frame, vector(purchase_cost, self.suppliers),
+                                            col_label="O", show_row_headers=False,
+                                            on_change=self.solver.invalidate)
+        self.purchase_editor.grid(row=3, column=0, padx=5, sticky="ew")
+
+        section(4, "Demand:")
+        self.demand_editor = MatrixEditor(self.tables_frame, vector(demand, self.receivers),
+                                          col_label="D", show_row_headers=False,
+                                          on_change=self.solver.invalidate)
+        self.demand_editor.grid(row=5, column=0, padx=5, sticky="ew")
+
+        section(6, "Sale Prices:")
+        self.sale_editor = MatrixEditor(self.tables_frame, vector(sale_price, self.receivers),
+                                        col_label="D", show_row_headers=False,
+                                        on_change=self.solver.invalidate)
+        self.sale_editor.grid(row=7, column=0, padx=5, sticky="ew")
+
+        section(8, "Transport Costs (click a cell to edit, Ctrl+V to paste a block):")
+        transport = (np.zeros((self.suppliers, self.receivers)) if transport_costs is None
+                     else np.asarray(transport_costs, dtype=float))
+        self.transport_editor = MatrixEditor(self.tables_frame, transport, row_label="O", col_label="D",
+                                             on_change=self.solver.invalidate)
+        self.transport_editor.grid(row=9, column=0, padx=5, sticky="nsew")
+        self.tables_frame.rowconfigure(9, weight=1)
+        ttk.Button(self.tables_frame, text="Import CSV", style="Accent.TButton",
+                   command=self.import_transport_costs).grid(row=10, column=0, padx=5, pady=5, sticky="w")
 
         # Contract
-        ttk.Label(self.tables_frame, text="Contract Options:", style="Header.TLabel", font=("Arial", 10, "bold")).grid(row=row_offset, column=0, padx=5, pady=5)
+        section(11, "Contract Options:")
         self.contract_var = tk.StringVar(value=contract or "None")
         contract_options = ["None"] + [f"O{i+1}" for i in range(self.suppliers)] + [f"D{j+1}" for j in range(self.receivers)]
-        self.contract_menu = ttk.OptionMenu(self.tables_frame, self.contract_var, self.contract_var.get(), *contract_options)
-        self.contract_menu.grid(row=row_offset, column=1, columnspan=max(self.receivers, 1), padx=5, pady=5)
+        self.contract_menu = ttk.Combobox(self.tables_frame, textvariable=self.contract_var,
+                                          values=contract_options, state="readonly", width=10)
+        # Editing any input discards the result of a solve that is still running
+        self.contract_menu.bind("<<ComboboxSelected>>", lambda e: self.solver.invalidate())
+        self.contract_menu.grid(row=12, column=0, padx=5, pady=5, sticky="w")
+
+    def import_transport_costs(self):
+        file_path = askopenfilename(filetypes=[("CSV files", "*.csv"), ("Text files", "*.txt"), ("All files", "*.*")])
+        if not file_path:
+            return
+        try:
+            self.transport_editor.importFile(file_path)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"Failed to import transport costs:\n{e}")
 
     def get_inputs(self):
         try:
-            supply = np.array([float(entry.get()) for entry in self.supply_entries])
-            demand = np.array([float(entry.get()) for entry in self.demand_entries])
-            purchase_cost = np.array([float(entry.get()) for entry in self.purchase_entries])
-            sale_price = np.array([float(entry.get()) for entry in self.sale_entries])
-            transport_costs = np.array([[float(entry.get()) for entry in row] for row in self.transport_entries])
+            supply = self.supply_editor.values()[0].copy()
+            demand = self.demand_editor.values()[0].copy()
+            purchase_cost = self.purchase_editor.values()[0].copy()
+            sale_price = self.sale_editor.values()[0].copy()
+            transport_costs = self.transport_editor.values().copy()
 
-            if any(s <= 0 for s in supply) or any(d <= 0 for d in demand):
+            if (supply <= 0).any() or (demand <= 0).any():
                 raise ValueError("Supply and demand must be positive.")
-            if any(c < 0 for c in purchase_cost) or any(p < 0 for p in sale_price):
+            if (purchase_cost < 0).any() or (sale_price < 0).any():
                 raise ValueError("Costs and prices must be non-negative.")
-            if any(c < 0 for row in transport_costs for c in row):
+            if (transport_costs < 0).any():
                 raise ValueError("Transport costs must be non-negative.")
 
-            selected_contract = self.contract_var.get()
-            supplier_contracts = np.zeros(len(supply), dtype=int)
-            receiver_contracts = np.zeros(len(demand), dtype=int)
-
-            if selected_contract.startswith("D"):
-                supplier_index = int(selected_contract.split("D")[1]) - 1
-                supplier_contracts[supplier_index] = 1
-            elif selected_contract.startswith("O"):
-                receiver_index = int(selected_contract.split("O")[1]) - 1
-                receiver_contracts[receiver_index] = 1
-
-            return supply, demand, purchase_cost, sale_price, transport_costs, supplier_contracts, receiver_contracts
+            return BrokerProblem(supply, demand, purchase_cost, sale_price, transport_costs, self.contract_var.get())
         except ValueError as e:
             messagebox.showerror("Input Error", str(e))
             return None
 
     def solve_problem(self):
-        inputs = self.get_inputs()
-        if inputs is None:
-            return
-        supply, demand, purchase_cost, sale_price, transport_costs, supplier_contracts, receiver_contracts = inputs
-        plan_df, total_profit, z_df, delta_list, revenue, purchase_cost_sum, transport_cost_sum, has_alt_plans = ZZT(
-            supply, demand, purchase_cost, sale_price, transport_costs, supplier_contracts, receiver_contracts)
+        problem = self.get_inputs()
+        if problem is not None:
+            self.submit_solve(problem)
+
+    def submit_solve(self, problem, then=None):
+        """
+        Rozwiązuje problem w wątku roboczym; then(problem, result) jest wywoływane po wyświetleniu wyniku.
+        """
+        def solve(job, problem):
+            return ZZT(*problem.zzt_args(), progress=job.progress)
+
+        def on_done(result, elapsed):
+            self.last_problem = problem
+            self.last_result = result
+            self.show_solution(result, elapsed)
+            if then is not None:
+                then(problem, result)
+
+        def on_progress(fraction, message, elapsed):
+            self.update_results(f"Solving... {message} ({elapsed:.1f} s)")
+
+        def on_error(error):
+            self.update_results("")
+            messagebox.showerror("Error", f"Failed to solve the problem:\n{error}")
+
+        self.update_results("Solving...")
+        self.solver.submit(solve, problem, on_done=on_done, on_error=on_error, on_progress=on_progress,
+                           on_cancel=lambda: self.update_results("Solving cancelled."))
+
+    def show_solution(self, result, elapsed):
+        plan_df, total_profit, z_df, delta_list, revenue, purchase_cost_sum, transport_cost_sum, has_alt_plans = result
 
         z_text = z_df.to_string()
         delta_text = "\n".join(delta_list)
@@ -264,115 +268,57 @@ class IntermediaryProblemApp:
             f"KZ: {purchase_cost_sum:.2f}\n"
             f"KT: {transport_cost_sum:.2f}\n"
             f"ZC: {total_profit:.2f}\n\n",
-            f"Czy istnieją alternatywne plany dostaw: {'Tak' if has_alt_plans else 'Nie'}"
+            f"Czy istnieją alternatywne plany dostaw: {'Tak' if has_alt_plans else 'Nie'}\n\n",
+            f"Czas obliczeń: {elapsed:.2f} s"
         )
         self.update_results("\n".join(output))
 
     def save_to_excel(self):
-        inputs = self.get_inputs()
-        if inputs is None:
+        problem = self.get_inputs()
+        if problem is None:
             return
-        supply, demand, purchase_cost, sale_price, transport_costs, supplier_contracts, receiver_contracts = inputs
-        plan_df, total_profit, z_df, delta_list, revenue, purchase_cost_sum, transport_cost_sum, has_alt_plans = ZZT(
-            supply, demand, purchase_cost, sale_price, transport_costs, supplier_contracts, receiver_contracts)
-
 
         file_path = asksaveasfilename(defaultextension=".xlsx", filetypes=[("Excel files", "*.xlsx")])
         if not file_path:
             return
 
-        with pd.ExcelWriter(file_path) as writer:
-            supply_df = pd.DataFrame({
-                "Supplier": [f"O{i+1}" for i in range(len(supply))],
-                "Supply": supply
-            })
-            supply_df.to_excel(writer, sheet_name="Supply", index=False)
-
-            demand_df = pd.DataFrame({
-                "Receiver": [f"D{j+1}" for j in range(len(demand))],
-                "Demand": demand
-            })
-            demand_df.to_excel(writer, sheet_name="Demand", index=False)
-
-            purchase_cost_df = pd.DataFrame({
-                "Supplier": [f"O{i+1}" for i in range(len(purchase_cost))],
-                "Purchase Cost": purchase_cost
-            })
-            purchase_cost_df.to_excel(writer, sheet_name="Purchase Costs", index=False)
-
-            sale_price_df = pd.DataFrame({
-                "Receiver": [f"D{j+1}" for j in range(len(sale_price))],
-                "Sale Price": sale_price
-            })
-            sale_price_df.to_excel(writer, sheet_name="Sale Prices", index=False)
-
-            transport_df = pd.DataFrame(transport_costs, columns=[f"O{j+1}" for j in range(len(demand))],
-                                        index=[f"D{i+1}" for i in range(len(supply))])
-            transport_df.to_excel(writer, sheet_name="Transport Costs")
-
-            contract_df = pd.DataFrame({"Contract": [self.contract_var.get()]})
-            contract_df.to_excel(writer, sheet_name="Contract", index=False)
-
-            plan_df.to_excel(writer, sheet_name="Plan")
-            z_df.to_excel(writer, sheet_name="Unit Profits (z)")
-            split_delta = [d.replace(" ", "").split("=") for d in delta_list]
-            delta_df = pd.DataFrame(split_delta, columns=["Δij", "Value"])
-            delta_df["Value"] = pd.to_numeric(delta_df["Value"], errors="coerce")
-
-            summary_data = {
-                "Revenue (PC)": [revenue],
-                "Purchase Cost (KZ)": [purchase_cost_sum],
-                "Transport Cost (KT)": [transport_cost_sum],
-                "Total Profit (ZC)": [total_profit],
-                "Alternative Plans": ["Yes" if has_alt_plans else "No"]
-            }
-            summary_df = pd.DataFrame(summary_data)
-            summary_df.to_excel(writer, sheet_name="Summary", index=False)
-
-        messagebox.showinfo("Success", f"Data saved successfully to {file_path}")
+        def write(problem, result):
+            write_problem(file_path, problem, result)
+            messagebox.showinfo("Success", f"Data saved successfully to {file_path}")
 
-    def load_from_excel(self):
-        from tkinter.filedialog import askopenfilename
-        from tkinter import messagebox
+        # Reuse the last solution when the inputs did not change since solving,
+        # otherwise solve in the background and write the file once the solution arrives
+        if problem == self.last_problem:
+            write(problem, self.last_result)
+        else:
+            self.submit_solve(problem, then=write)
+
+    def save_to_npz(self):
+        problem = self.get_inputs()
+        if problem is None:
+            return
 
-        file_path = askopenfilename(filetypes=[("Excel files", "*.xlsx")])
+        file_path = asksaveasfilename(defaultextension=".npz", filetypes=[("NumPy problem files", "*.npz")])
+        if not file_path:
+            return
+
+        save_problem_npz(file_path, problem)
+        messagebox.showinfo("Success", f"Problem saved successfully to {file_path}")
+
+    def load_from_excel(self):
+        file_path = askopenfilename(filetypes=[("Problem files", "*.xlsx *.npz"), ("Excel files", "*.xlsx"),
+                                               ("NumPy problem files", "*.npz")])
         if not file_path:
             return None
 
         try:
-            # Load each sheet
-            supply_df = pd.read_excel(file_path, sheet_name="Supply")
-            demand_df = pd.read_excel(file_path, sheet_name="Demand")
-            purchase_df = pd.read_excel(file_path, sheet_name="Purchase Costs")
-            sale_df = pd.read_excel(file_path, sheet_name="Sale Prices")
-            transport_df = pd.read_excel(file_path, sheet_name="Transport Costs", index_col=0)
-
-            contract = None
-            try:
-                contract_df = pd.read_excel(file_path, sheet_name="Contract")
-                if not contract_df.empty and "Contract" in contract_df.columns:
-                    contract = str(contract_df["Contract"].iloc[0])
-            except Exception as e:
-                print(f"Error loading contract sheet: {e}")
-
-            # Extract values
-            supply = supply_df["Supply"].tolist()
-            demand = demand_df["Demand"].tolist()
-            purchase_cost = purchase_df["Purchase Cost"].tolist()
-            sale_price = sale_df["Sale Price"].tolist()
-            transport_costs = transport_df.values.tolist()
-
-            # Currently not loaded from Excel; placeholder for consistency
-            supplier_contracts = None
-            receiver_contracts = None
-
-            supply, demand, purchase_cost, sale_price, transport_costs, supplier_contracts, receiver_contracts
-            self.update_input_tables(supply, demand, purchase_cost, sale_price, transport_costs, contract)
-
+            problem = load_problem(file_path)
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to load Excel file:\n{e}")
+            messagebox.showerror("Error", f"Failed to load file:\n{e}")
             return None
 
+        self.update_input_tables(problem.supply, problem.demand, problem.purchase_cost,
+                                 problem.sale_price, problem.transport_costs, problem.contract)
 
     def update_results(self, output):
         self.results_text.config(state='normal')
@@ -0,0 +1,268 @@
+import re
+import tkinter as tk
+from tkinter import ttk, messagebox
+import numpy as np
+
+
+class MatrixEditor(tk.Frame):
+    """
+    Edytor macierzy liczb przechowywanej w tablicy NumPy.
+
+    Rysowane są tylko komórki widoczne w oknie (płótno + własne przewijanie),
+    więc liczba widgetów nie zależy od rozmiaru macierzy. Kliknięcie komórki
+    otwiera jedno pole edycji, Ctrl+V wkleja blok (z Excela: tabulatory/nowe linie)
+    od zaznaczonej komórki. Funkcja on_change() jest wywoływana po każdej
+    zmianie wartości (edycja komórki, wklejenie, wstawienie bloku). Komórka,
+    w której wpisano coś innego niż liczbę, jest oznaczana na czerwono, a values()
+    zgłasza ValueError, dopóki nie zostanie poprawiona.
+    """
+
+    CELL_WIDTH = 64
+    CELL_HEIGHT = 24
+    HEADER_WIDTH = 48
+
+    def __init__(self, parent, data, row_label="O", col_label="D", show_row_headers=True, max_height=None,
+                 on_change=None, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.data = np.array(data, dtype=float, ndmin=2)
+        self.on_change = on_change
+        self.row_label = row_label
+        self.col_label = col_label
+        self.header_width = self.HEADER_WIDTH if show_row_headers else 0
+        self.first_row = 0
+        self.first_col = 0
+        self.selected = (0, 0)
+        self.editor = None
+        self.invalid = {}  # (row, col): text that is not a number
+
+        rows, cols = self.data.shape
+        height = (min(rows, 12) + 1) * self.CELL_HEIGHT
+        if max_height:
+            height = min(height, max_height)
+        self.canvas = tk.Canvas(self, bg="white", highlightthickness=0, height=height,
+                                width=self.header_width + min(cols, 8) * self.CELL_WIDTH)
+        self.vbar = ttk.Scrollbar(self, orient="vertical", command=lambda *a: self._onScroll(0, *a))
+        self.hbar = ttk.Scrollbar(self, orient="horizontal", command=lambda *a: self._onScroll(1, *a))
+        self.canvas.grid(row=0, column=0, sticky="nsew")
+        if rows > 1:
+            self.vbar.grid(row=0, column=1, sticky="ns")
+        self.hbar.grid(row=1, column=0, sticky="ew")
+        self.rowconfigure(0, weight=1)
+        self.columnconfigure(0, weight=1)
+
+        self.canvas.bind("<Configure>", lambda e: self.redraw())
+        self.canvas.bind("<Button-1>", self._onClick)
+        self.canvas.bind("<MouseWheel>", lambda e: self.scrollTo(self.first_row - int(e.delta / 120) * 3,
+                                                                 self.first_col))
+        self.canvas.bind("<Button-4>", lambda e: self.scrollTo(self.first_row - 3, self.first_col))
+        self.canvas.bind("<Button-5>", lambda e: self.scrollTo(self.first_row + 3, self.first_col))
+        self.canvas.bind("<Control-v>", lambda e: self.paste())
+        self.canvas.bind("<Key>", self._onKey)
+
+    def visibleShape(self):
+        rows = max(1, self.canvas.winfo_height() // self.CELL_HEIGHT - 1)
+        cols = max(1, (self.canvas.winfo_width() - self.header_width) // self.CELL_WIDTH)
+        return rows, cols
+
+    def scrollTo(self, first_row, first_col):
+        rows, cols = self.data.shape
+        visible_rows, visible_cols = self.visibleShape()
+        self.first_row = min(max(0, int(first_row)), max(0, rows - visible_rows))
+        self.first_col = min(max(0, int(first_col)), max(0, cols - visible_cols))
+        self.redraw()
+
+    def _onScroll(self, axis, action, value, unit=None):
+        first = [self.first_row, self.first_col]
+        size = self.data.shape[axis]
+        if action == "moveto":
+            first[axis] = float(value) * size
+        elif action == "scroll":
+            step = self.visibleShape()[axis] if unit == "pages" else 1
+            first[axis] += int(value) * step
+        self.scrollTo(*first)
+
+    def redraw(self):
+        """
+        Rysuje tylko widoczny fragment macierzy.
+        """
+        self._commitEdit()
+        canvas = self.canvas
+        canvas.delete("all")
+        rows, cols = self.data.shape
+        visible_rows, visible_cols = self.visibleShape()
+        last_row = min(rows, self.first_row + visible_rows)
+        last_col = min(cols, self.first_col + visible_cols)
+        w, h, x0 = self.CELL_WIDTH, self.CELL_HEIGHT, self.header_width
+
+        for j in range(self.first_col, last_col):
+            x = x0 + (j - self.first_col) * w
+            canvas.create_rectangle(x, 0, x + w, h, fill="#dde6ff", outline="#aaaaaa")
+            canvas.create_text(x + w / 2, h / 2, text=f"{self.col_label}{j+1}", font=("Arial", 9, "bold"))
+
+        for i in range(self.first_row, last_row):
+            y = (i - self.first_row + 1) * h
+            if x0:
+                canvas.create_rectangle(0, y, x0, y + h, fill="#dde6ff", outline="#aaaaaa")
+                canvas.create_text(x0 / 2, y + h / 2, text=f"{self.row_label}{i+1}", font=("Arial", 9, "bold"))
+            for j in range(self.first_col, last_col):
+                x = x0 + (j - self.first_col) * w
+                fill = "#ffe9a8" if (i, j) == self.selected else "white"
+                text = f"{self.data[i, j]:g}"
+                if (i, j) in self.invalid:
+                    fill, text = "#ffb3b3", self.invalid[i, j]
+                canvas.create_rectangle(x, y, x + w, y + h, fill=fill, outline="#cccccc")
+                canvas.create_text(x + w - 4, y + h / 2, text=text, anchor="e")
+
+        self.vbar.set(self.first_row / rows, last_row / rows)
+        self.hbar.set(self.first_col / cols, last_col / cols)
+
+    def _cellAt(self, x, y):
+        row = self.first_row + int(y // self.CELL_HEIGHT) - 1
+        col = self.first_col + int((x - self.header_width) // self.CELL_WIDTH)
+        if x < self.header_width or not (0 <= row < self.data.shape[0] and 0 <= col < self.data.shape[1]):
+            return None
+        return row, col
+
+    def _onClick(self, event):
+        self.canvas.focus_set()
+        cell = self._cellAt(event.x, event.y)
+        if cell is None:
+            return
+        self.selected = cell
+        self.redraw()
+        self.edit(*cell)
+
+    def _onKey(self, event):
+        moves = {"Up": (-1, 0), "Down": (1, 0), "Left": (0, -1), "Right": (0, 1)}
+        if event.keysym in moves:
+            d_row, d_col = moves[event.keysym]
+            self.select(self.selected[0] + d_row, self.selected[1] + d_col)
+        elif event.keysym == "Return":
+            self.edit(*self.selected)
+
+    def select(self, row, col):
+        rows, cols = self.data.shape
+        row, col = min(max(0, row), rows - 1), min(max(0, col), cols - 1)
+        self.selected = (row, col)
+        visible_rows, visible_cols = self.visibleShape()
+        first_row = min(self.first_row, row) if row < self.first_row + visible_rows else row - visible_rows + 1
+        first_col = min(self.first_col, col) if col < self.first_col + visible_cols else col - visible_cols + 1
+        self.scrollTo(first_row, first_col)
+
+    def edit(self, row, col):
+        """
+        Otwiera pole edycji nad komórką (jedyny widget Entry w edytorze).
+        """
+        x = self.header_width + (col - self.first_col) * self.CELL_WIDTH
+        y = (row - self.first_row + 1) * self.CELL_HEIGHT
+        entry = ttk.Entry(self.canvas, justify="right")
+        entry.insert(0, self.invalid.get((row, col), f"{self.data[row, col]:g}"))
+        entry.select_range(0, "end")
+        self.canvas.create_window(x, y, window=entry, anchor="nw", width=self.CELL_WIDTH, height=self.CELL_HEIGHT)
+        entry.focus_set()
+        self.editor = (entry, row, col)
+
+        def commit_and_move(d_row, d_col):
+            self._commitEdit()
+            self.select(row + d_row, col + d_col)
+            self.canvas.focus_set()
+            return "break"
+
+        entry.bind("<Return>", lambda e: commit_and_move(1, 0))
+        entry.bind("<Tab>", lambda e: commit_and_move(0, 1))
+        entry.bind("<Escape>", lambda e: self._cancelEdit())
+        entry.bind("<FocusOut>", lambda e: self._commitEdit())
+
+    def _commitEdit(self, report=True):
+        if self.editor is None:
+            return
+        entry, row, col = self.editor
+        self.editor = None
+        text = entry.get()
+        changed = False
+        try:
+            value = float(text)
+            changed = value != self.data[row, col] or (row, col) in self.invalid
+            self.data[row, col] = value
+            self.invalid.pop((row, col), None)
+        except ValueError:
+            changed = self.invalid.get((row, col)) != text
+            self.invalid[row, col] = text
+            if report:
+                messagebox.showerror("Input Error", self._invalidMessage(row, col))
+        entry.destroy()
+        self.redraw()
+        if changed:
+            self._changed()
+
+    def _invalidMessage(self, row, col):
+        return (f"Value in {self.row_label}{row+1}/{self.col_label}{col+1} "
+                f"must be a number, not '{self.invalid[row, col]}'")
+
+    def _changed(self):
+        if self.on_change is not None:
+            self.on_change()
+
+    def _cancelEdit(self):
+        if self.editor is not None:
+            self.editor[0].destroy()
+            self.editor = None
+        self.canvas.focus_set()
+
+    @staticmethod
+    def parseBlock(text):
+        """
+        Zamienia tekst (wiersze oddzielone nowymi liniami, komórki tabulatorami,
+        przecinkami, średnikami lub spacjami) na tablicę 2D.
+        """
+        rows = []
+        for line in text.strip().splitlines():
+            if not line.strip():
+                continue
+            if "\t" in line or ";" in line:
+                # Excel-style separators allow a decimal comma
+                cells = [cell.strip().replace(",", ".") for cell in re.split(r"[\t;]", line)]
+            else:
+                cells = re.split(r"[,\s]+", line.strip())
+            rows.append([float(cell) for cell in cells if cell])
+        width = max(len(row) for row in rows)
+        if any(len(row) != width for row in rows):
+            raise ValueError("All pasted rows must have the same number of cells.")
+        return np.array(rows, dtype=float)
+
+    def setBlock(self, block, row=0, col=0):
+        """
+        Wstawia blok wartości od komórki (row, col); nadmiar jest obcinany do rozmiaru macierzy.
+        """
+        block = np.array(block, dtype=float, ndmin=2)
+        rows = min(block.shape[0], self.data.shape[0] - row)
+        cols = min(block.shape[1], self.data.shape[1] - col)
+        self.data[row:row + rows, col:col + cols] = block[:rows, :cols]
+        self.invalid = {(i, j): text for (i, j), text in self.invalid.items()
+                        if not (row <= i < row + rows and col <= j < col + cols)}
+        self.redraw()
+        self._changed()
+
+    def paste(self):
+        try:
+            block = self.parseBlock(self.clipboard_get())
+        except (tk.TclError, ValueError) as e:
+            messagebox.showerror("Paste Error", f"Clipboard does not contain a block of numbers:\n{e}")
+            return
+        self.setBlock(block, *self.selected)
+
+    def importFile(self, file_path):
+        """
+        Wczytuje blok z pliku CSV/TXT od lewego górnego rogu macierzy.
+        """
+        with open(file_path) as file:
+            self.setBlock(self.parseBlock(file.read()))
+
+    def values(self):
+        """
+        Zwraca macierz; zgłasza ValueError, gdy któraś komórka nie zawiera liczby.
+        """
+        self._commitEdit(report=False)
+        if self.invalid:
+            raise ValueError(self._invalidMessage(*min(self.invalid)))
+        return self.data
@@ -0,0 +1,57 @@
+from pathlib import Path
+import numpy as np
+from Broker.workbook import BrokerProblem, read_problem, write_problem
+
+FORMAT_VERSION = 1
+
+
+def save_problem_npz(file_path, problem, compress=True):
+    """
+    Zapisuje problem jako tablice o stałych typach w pliku .npz (opcjonalnie skompresowanym).
+    """
+    save = np.savez_compressed if compress else np.savez
+    save(
+        file_path,
+        version=np.array(FORMAT_VERSION, dtype=np.int32),
+        supply=problem.supply,
+        demand=problem.demand,
+        purchase_cost=problem.purchase_cost,
+        sale_price=problem.sale_price,
+        transport_costs=problem.transport_costs,
+        contract=np.array(problem.contract),
+    )
+
+
+def load_problem_npz(file_path):
+    """
+    Wczytuje problem z pliku .npz bezpośrednio do tablic NumPy (bez pandas i bez pickle).
+    """
+    with np.load(file_path, allow_pickle=False) as data:
+        version = int(data["version"]) if "version" in data else FORMAT_VERSION
+        if version > FORMAT_VERSION:
+            raise ValueError(f"Unsupported problem file version: {version}")
+        return BrokerProblem(
+            data["supply"],
+            data["demand"],
+            data["purchase_cost"],
+            data["sale_price"],
+            data["transport_costs"],
+            str(data["contract"]) if "contract" in data else "None",
+        )
+
+
+def load_problem(file_path):
+    """
+    Wczytuje problem z pliku .npz lub .xlsx (rozpoznawane po rozszerzeniu).
+    """
+    if Path(file_path).suffix.lower() == ".npz":
+        return load_problem_npz(file_path)
+    return read_problem(file_path)
+
+
+def excel_to_npz(excel_path, npz_path, compress=True):
+    save_problem_npz(npz_path, read_problem(excel_path), compress)
+
+
+def npz_to_excel(npz_path, excel_path):
+    write_problem(excel_path, load_problem_npz(npz_path))
@@ -0,0 +1,143 @@
+import numpy as np
+import pandas as pd
+
+INPUT_SHEETS = ("Supply", "Demand", "Purchase Costs", "Sale Prices", "Transport Costs")
+
+
+class BrokerProblem:
+    """
+    Dane wejściowe zagadnienia pośrednika jako tablice NumPy.
+    contract - "None", "O<i>" lub "D<j>" (tak jak w menu umów w GUI).
+    """
+
+    def __init__(self, supply, demand, purchase_cost, sale_price, transport_costs, contract="None"):
+        self.supply = np.asarray(supply, dtype=float)
+        self.demand = np.asarray(demand, dtype=float)
+        self.purchase_cost = np.asarray(purchase_cost, dtype=float)
+        self.sale_price = np.asarray(sale_price, dtype=float)
+        self.transport_costs = np.asarray(transport_costs, dtype=float)
+        self.contract = contract if contract else "None"
+        self.validate()
+
+    def validate(self):
+        suppliers, receivers = len(self.supply), len(self.demand)
+        if suppliers < 1 or receivers < 1:
+            raise ValueError("Number of suppliers and receivers must be positive.")
+        if self.purchase_cost.shape != (suppliers,):
+            raise ValueError(f"Expected {suppliers} purchase costs, got {self.purchase_cost.size}.")
+        if self.sale_price.shape != (receivers,):
+            raise ValueError(f"Expected {receivers} sale prices, got {self.sale_price.size}.")
+        if self.transport_costs.shape != (suppliers, receivers):
+            raise ValueError(f"Transport costs must be a {suppliers}x{receivers} matrix, "
+                             f"got {'x'.join(map(str, self.transport_costs.shape))}.")
+
+    def contract_arrays(self):
+        """
+        Zwraca wektory umów (supplier_contracts, receiver_contracts) w postaci oczekiwanej przez ZZT.
+        """
+        supplier_contracts = np.zeros(len(self.supply), dtype=int)
+        receiver_contracts = np.zeros(len(self.demand), dtype=int)
+
+        if self.contract.startswith("D"):
+            supplier_index = int(self.contract.split("D")[1]) - 1
+            supplier_contracts[supplier_index] = 1
+        elif self.contract.startswith("O"):
+            receiver_index = int(self.contract.split("O")[1]) - 1
+            receiver_contracts[receiver_index] = 1
+
+        return supplier_contracts, receiver_contracts
+
+    def zzt_args(self):
+        """
+        Argumenty dla ZZT w kolejności jego parametrów.
+        """
+        supplier_contracts, receiver_contracts = self.contract_arrays()
+        return (self.supply, self.demand, self.purchase_cost, self.sale_price, self.transport_costs,
+                supplier_contracts, receiver_contracts)
+
+    def __eq__(self, other):
+        if not isinstance(other, BrokerProblem):
+            return NotImplemented
+        return (self.contract == other.contract
+                and np.array_equal(self.supply, other.supply)
+                and np.array_equal(self.demand, other.demand)
+                and np.array_equal(self.purchase_cost, other.purchase_cost)
+                and np.array_equal(self.sale_price, other.sale_price)
+                and np.array_equal(self.transport_costs, other.transport_costs))
+
+
+def read_problem(file_path):
+    """
+    Wczytuje problem z pliku Excel jednym otwarciem skoroszytu (wszystkie arkusze naraz).
+    """
+    sheets = pd.read_excel(file_path, sheet_name=None)
+
+    missing = [name for name in INPUT_SHEETS if name not in sheets]
+    if missing:
+        raise ValueError(f"Missing sheets: {', '.join(missing)}")
+
+    contract = "None"
+    contract_df = sheets.get("Contract")
+    if contract_df is not None and not contract_df.empty and "Contract" in contract_df.columns:
+        value = contract_df["Contract"].iloc[0]
+        # pandas reads the text "None" as a missing value
+        contract = "None" if pd.isna(value) else str(value)
+
+    transport_df = sheets["Transport Costs"].set_index(sheets["Transport Costs"].columns[0])
+
+    return BrokerProblem(
+        sheets["Supply"]["Supply"].to_numpy(dtype=float),
+        sheets["Demand"]["Demand"].to_numpy(dtype=float),
+        sheets["Purchase Costs"]["Purchase Cost"].to_numpy(dtype=float),
+        sheets["Sale Prices"]["Sale Price"].to_numpy(dtype=float),
+        transport_df.to_numpy(dtype=float),
+        contract,
+    )
+
+
+def write_problem(file_path, problem, result=None):
+    """
+    Zapisuje problem (i opcjonalnie wynik ZZT) do pliku Excel w jednym przebiegu.
+    """
+    supply, demand = problem.supply, problem.demand
+
+    with pd.ExcelWriter(file_path) as writer:
+        pd.DataFrame({
+            "Supplier": [f"O{i+1}" for i in range(len(supply))],
+            "Supply": supply
+        }).to_excel(writer, sheet_name="Supply", index=False)
+
+        pd.DataFrame({
+            "Receiver": [f"D{j+1}" for j in range(len(demand))],
+            "Demand": demand
+        }).to_excel(writer, sheet_name="Demand", index=False)
+
+        pd.DataFrame({
+            "Supplier": [f"O{i+1}" for i in range(len(supply))],
+            "Purchase Cost": problem.purchase_cost
+        }).to_excel(writer, sheet_name="Purchase Costs", index=False)
+
+        pd.DataFrame({
+            "Receiver": [f"D{j+1}" for j in range(len(demand))],
+            "Sale Price": problem.sale_price
+        }).to_excel(writer, sheet_name="Sale Prices", index=False)
+
+        pd.DataFrame(problem.transport_costs, columns=[f"O{j+1}" for j in range(len(demand))],
+                     index=[f"D{i+1}" for i in range(len(supply))]).to_excel(writer, sheet_name="Transport Costs")
+
+        pd.DataFrame({"Contract": [problem.contract]}).to_excel(writer, sheet_name="Contract", index=False)
+
+        if result is None:
+            return
+
+        plan_df, total_profit, z_df, delta_list, revenue, purchase_cost_sum, transport_cost_sum, has_alt_plans = result
+        plan_df.to_excel(writer, sheet_name="Plan")
+        z_df.to_excel(writer, sheet_name="Unit Profits (z)")
+
+        pd.DataFrame({
+            "Revenue (PC)": [revenue],
+            "Purchase Cost (KZ)": [purchase_cost_sum],
+            "Transport Cost (KT)": [transport_cost_sum],
+            "Total Profit (ZC)": [total_profit],
+            "Alternative Plans": ["Yes" if has_alt_plans else "No"]
+        }).to_excel(writer, sheet_name="Summary", index=False)
@@ -1,119 +1,307 @@
-from collections import deque
+import re
+from CPM.aoa import DUMMY_PREFIX, toArrowNetwork
+from common.profiling import profiled
+
+LINK_TYPES = ("FS", "SS", "FF", "SF")
+FINISH_TO_START = ("FS", 0)
+_LINK_PATTERN = re.compile(r"^(FS|SS|FF|SF)?\s*([+-]?\s*\d+(?:\.\d+)?)?$", re.IGNORECASE)
 
 class Activity:
-    def __init__(self, name, duration, predecessors=None):
+    def __init__(self, name, duration, predecessors=None, estimates=None, resources=None, links=None,
+                 calendar=None):
+        """
+        :param estimates: Optional PERT estimates (optimistic, most likely, pessimistic);
+                          when given, duration is replaced by the expected duration
+        :param resources: Optional resource demands {resource: units per time unit}
+        :param links: Optional {predecessor: (type, lag)} for links other than finish-to-start
+                      without lag; type is one of LINK_TYPES
+        :param calendar: Optional name of the working calendar (see CPM.calendars); the
+                         duration is then counted in working days of that calendar
+
+        Progress (see setProgress) is kept in actual_start, actual_finish and
+        percent_complete (0-100); None means not reported.
+        """
         self.name = name
         self.duration = duration
         self.predecessors = predecessors if predecessors else []
+        # The user's list when CPM.removeRedundantLinks gave the solver a reduced one
+        self.entered_predecessors = None
+        self.resources = resources if resources else {}
+        self.links = links if links else {}
+        self.calendar = calendar
+        self.actual_start = None
+        self.actual_finish = None
+        self.percent_complete = 0
+        self.estimates = None
+        self.variance = 0
+        if estimates is not None:
+            self.setEstimates(*estimates)
         self.ES = 0
         self.EF = 0
         self.LS = 0
         self.LF = 0
         self.reserve = 0
+        self.free_float = 0
+        self.interfering_float = 0
+        self.independent_float = 0
+        self.path_variance = 0
+
+    def setEstimates(self, optimistic, most_likely, pessimistic) -> None:
+        """
+        Sets PERT three-point estimates: expected duration (a + 4m + b) / 6
+        and variance ((b - a) / 6)^2.
+        """
+        if not optimistic <= most_likely <= pessimistic:
+            raise ValueError(f"Estimates for activity {self.name} must satisfy "
+                             f"optimistic <= most likely <= pessimistic")
+        self.estimates = (optimistic, most_likely, pessimistic)
+        self.duration = (optimistic + 4 * most_likely + pessimistic) / 6
+        self.variance = ((pessimistic - optimistic) / 6) ** 2
+
+    def durationText(self) -> str:
+        """
+        Duration as entered: a single number or 'a/m/b' for PERT estimates.
+        """
+        if self.estimates is not None:
+            return "/".join(f"{value:g}" for value in self.estimates)
+        return str(self.duration)
+
+    def setProgress(self, actual_start=None, actual_finish=None, percent_complete=None) -> None:
+        """
+        Records progress; arguments left as None keep their current value.
+        An activity reported as partly done without an actual start is taken
+        to have started at its current ES, and a finished one is 100% complete.
+        """
+        if percent_complete is not None:
+            if not 0 <= percent_complete <= 100:
+                raise ValueError(f"Percent complete of activity {self.name} must be between 0 and 100")
+            self.percent_complete = percent_complete
+        if actual_start is not None:
+            self.actual_start = actual_start
+        if actual_finish is not None:
+            self.actual_finish = actual_finish
+            self.percent_complete = 100
+        if self.actual_start is None and self.actual_finish is None and self.percent_complete > 0:
+            self.actual_start = self.ES
+        if (self.actual_start is not None and self.actual_finish is not None
+                and self.actual_finish < self.actual_start):
+            raise ValueError(f"Actual finish of activity {self.name} is before its actual start")
+
+    def isStarted(self) -> bool:
+        return self.actual_start is not None or self.actual_finish is not None
+
+    def remainingDuration(self):
+        """
+        Duration of the work not done yet.
+        """
+        if self.actual_finish is not None:
+            return 0
+        return self.duration * (100 - self.percent_complete) / 100
+
+    def link(self, pred):
+        """
+        Returns (type, lag) of the link from the predecessor.
+        """
+        return self.links.get(pred, FINISH_TO_START)
+
+    def enteredPredecessors(self) -> list:
+        """
+        Predecessors as entered, including links removed as redundant before solving.
+        """
+        return self.entered_predecessors if self.entered_predecessors is not None else self.predecessors
 
+    def predecessorTokens(self) -> list:
+        """
+        Predecessors as entered, e.g. ['A', 'B:SS+2'] (see parseLink).
+        """
+        return [formatLink(pred, *self.link(pred)) for pred in self.enteredPredecessors()]
 
+
+def formatLink(pred, kind="FS", lag=0) -> str:
+    if (kind, lag) == FINISH_TO_START:
+        return pred
+    lag_text = f"{lag:+g}" if lag else ""
+    return f"{pred}:{kind}{lag_text}"
+
+
+def parseLink(token):
+    """
+    Input: Predecessor token 'name[:TYPE][+/-lag]', e.g. 'A', 'A:SS', 'A:SS+2', 'A:FF-1', 'A:+3' (FS, lag 3).
+    Output: (name, (type, lag)).
+    """
+    token = token.strip()
+    name, separator, spec = token.partition(':')
+    if not separator:
+        return token, FINISH_TO_START
+    match = _LINK_PATTERN.match(spec.strip())
+    if not name or not match:
+        raise ValueError(f"Predecessor '{token}' must be written as 'name', 'name:TYPE' or 'name:TYPE+lag' "
+                         f"with TYPE one of {', '.join(LINK_TYPES)}")
+    kind = (match.group(1) or "FS").upper()
+    lag = parseNumber(match.group(2).replace(" ", "")) if match.group(2) else 0
+    return name.strip(), (kind, lag)
+
+
+def parseLinks(tokens):
+    """
+    Input: Predecessor tokens (see parseLink).
+    Output: (predecessor names, {predecessor: (type, lag)} for the links other than plain finish-to-start).
+    """
+    predecessors = []
+    links = {}
+    for token in tokens:
+        name, link = parseLink(token)
+        predecessors.append(name)
+        if link != FINISH_TO_START:
+            links[name] = link
+    return predecessors, links
+
+
+def parseNumber(text):
+    """
+    Parses a numeric string, keeping whole numbers as int.
+    """
+    number = float(text)
+    return int(number) if number.is_integer() else number
+
+
+def parseDuration(value, name=None):
+    """
+    Input: A duration (number or numeric string) or PERT estimates as 'a/m/b' or an (a, m, b) tuple.
+    Output: (duration, estimates); estimates is None for a single duration.
+
+    Raises ValueError for anything else, including estimates that do not satisfy
+    0 <= a <= m <= b; with `name` the message names the activity.
+    """
+    def invalid(message):
+        return ValueError(f"{message} in activity {name}" if name is not None else message)
+
+    entered = value
+    if isinstance(value, str):
+        parts = value.strip().split('/')
+        try:
+            numbers = [parseNumber(part) for part in parts]
+        except ValueError:
+            raise invalid(f"Duration must be a number or 'a/m/b' estimates (e.g., '2/4/9'), not '{value}'")
+        value = numbers[0] if len(numbers) == 1 else tuple(numbers)
+
+    if isinstance(value, (tuple, list)):
+        if len(value) != 3:
+            raise invalid(f"PERT estimates must have three values 'a/m/b', not '{entered}'")
+        optimistic, most_likely, pessimistic = value
+        if not 0 <= optimistic <= most_likely <= pessimistic:
+            raise invalid(f"PERT estimates must satisfy 0 <= optimistic <= most likely <= pessimistic, "
+                          f"not '{entered}'")
+        return (optimistic + 4 * most_likely + pessimistic) / 6, tuple(value)
+    if value < 0:
+        raise invalid(f"Duration must not be negative, not '{entered}'")
+    return value, None
+
+
+@profiled("cpm.parse")
 def parsePredecessorformat(predecessor_data):
     """
-    Input: Dictionary with activity names, durations, and predecessors.
+    Input: Dictionary with activity names, durations (or 'a/m/b' PERT estimates), predecessors
+           and optional resource demands and calendar name. Predecessors may carry a link type and lag,
+           e.g. 'A:SS+2'.
     Output: Dictionary of Activity objects.
     """
     activities = {}
     for name, info in predecessor_data.items():
-        activities[name] = Activity(name, info['duration'], info.get('predecessors', []))
+        duration, estimates = parseDuration(info['duration'], name)
+        predecessors, links = parseLinks(info.get('predecessors', []))
+        activities[name] = Activity(name, duration, predecessors, estimates, info.get('resources'), links,
+                                    info.get('calendar'))
     return activities
 
 
+@profiled("cpm.parse")
 def parseEventSequenceFormat(event_data):
     """
     Input: Dictionary with activity names, durations, and event sequences (e.g., '1-2').
+    Rows named with the DUMMY_PREFIX ('*1', '*2', ...) are dummy activities: they only pass
+    dependencies from their start event to their end event, and a dummy with a duration
+    adds it as a lag. An optional 'links' entry (tokens like 'A:SS+2', see parseLink)
+    adds typed links to other activities.
     Output: Dictionary of Activity objects with computed predecessors.
     """
 
-    event_starts = {}
     event_ends = {}
+    dummy_ends = {}
     activities_temp = {}
 
     for name, info in event_data.items():
         duration = info['duration']
         start_event, end_event = map(int, info['events'].split('-'))
 
-        activities_temp[name] = {'duration': duration, 'start': start_event, 'end': end_event}
+        if str(name).startswith(DUMMY_PREFIX):
+            dummy_ends.setdefault(end_event, []).append((start_event, parseDuration(duration, name)[0]))
+            continue
+        activities_temp[name] = {'duration': duration, 'start': start_event, 'end': end_event,
+                                 'links': info.get('links') or [], 'calendar': info.get('calendar')}
+        event_ends.setdefault(end_event, []).append(name)
 
-        if start_event not in event_starts:
-            event_starts[start_event] = []
-        if end_event not in event_ends:
-            event_ends[end_event] = []
-        event_starts[start_event].append(name)
-        event_ends[end_event].append(name)
+    arriving = {}
+
+    def arrivingAt(event):
+        """
+        {activity: lag} of the real activities ending at the event, directly or
+        through dummies (the largest total dummy duration is the lag).
+        """
+        stack = [event]
+        visiting = set()
+        while stack:
+            current = stack[-1]
+            if current in arriving:
+                stack.pop()
+            elif current not in visiting:
+                visiting.add(current)
+                for start, _ in dummy_ends.get(current, []):
+                    if start in visiting and start not in arriving:
+                        raise ValueError("Dummy activities form a cycle.")
+                    stack.append(start)
+            else:
+                stack.pop()
+                lags = dict.fromkeys(event_ends.get(current, []), 0)
+                for start, duration in dummy_ends.get(current, []):
+                    for name, lag in arriving[start].items():
+                        if lags.get(name, -1) < lag + duration:
+                            lags[name] = lag + duration
+                arriving[current] = lags
+        return arriving[event]
 
     activities = {}
     for name, info in activities_temp.items():
-        start_event = info['start']
-        predecessors = event_ends.get(start_event, [])
-        activities[name] = Activity(name, info['duration'], predecessors)
+        lags = arrivingAt(info['start'])
+        links = {pred: ("FS", lag) for pred, lag in lags.items() if lag}
+        tokens = info['links'].split(',') if isinstance(info['links'], str) else info['links']
+        typed_predecessors, typed_links = parseLinks(token for token in tokens if token.strip())
+        for pred in typed_predecessors:
+            links.pop(pred, None)
+        links.update(typed_links)
+        predecessors = list(dict.fromkeys(list(lags) + typed_predecessors))
+        duration, estimates = parseDuration(info['duration'], name)
+        activities[name] = Activity(name, duration, predecessors, estimates, links=links, calendar=info['calendar'])
 
     return activities
 
+@profiled("cpm.eventFormat")
 def reverseEventSequenceFormat(activities):
     """
     Input: Dictionary of Activity objects (with attributes: name, duration, predecessors)
-    Output: Dictionary in the event_data format
+    Output: Dictionary in the event_data format, dummy activities named '*1', '*2', ...
     """
-    
-    successors = {name: [] for name in activities}
     for name, activity in activities.items():
-        for pred in activity.predecessors:
-            if pred not in successors:
-                raise ValueError(f"Predecessor {pred} for activity {name} is not in activities")
-            successors[pred].append(name)
-    
-    
-    in_degree = {name: len(activity.predecessors) for name, activity in activities.items()}
-    queue = deque([name for name, degree in in_degree.items() if degree == 0])
-    topo_order = []
-    
-    while queue:
-        curr = queue.popleft()
-        topo_order.append(curr)
-        for succ in successors[curr]:
-            in_degree[succ] -= 1
-            if in_degree[succ] == 0:
-                queue.append(succ)
-    
-    if len(topo_order) != len(activities):
-        raise ValueError("Cycle detected or some activities are unreachable, invalid dependency graph.")
-    
-    
-    start_events = {}
-    end_events = {}
-    next_event = 2
-    
-    for name in topo_order:
-        activity = activities[name]
-        
-        if not activity.predecessors:
-            start_events[name] = 1
-        else:
-            common = None
-            for pred in activity.predecessors:
-                if pred not in end_events:
-                    raise ValueError(f"Predecessor {pred} for activity {name} has no assigned end event yet.")
-                if common is None:
-                    common = end_events[pred]
-                elif end_events[pred] != common:
-                    raise ValueError(f"Inconsistent end events among predecessors of activity {name}.")
-            start_events[name] = common
-        
-        
-        end_events[name] = next_event
-        next_event += 1
-
-    
+        if activity.links:
+            raise ValueError(f"Activity {name} has typed or lagged links, which the event sequence format "
+                             f"cannot show; use the predecessor format")
+    network = toArrowNetwork({name: activity.predecessors for name, activity in activities.items()})
+
     event_data = {}
-    for name, activity in activities.items():
+    for name, start, end in network.arcs():
         event_data[name] = {
-            'duration': activity.duration,
-            'events': f"{start_events[name]}-{end_events[name]}"
+            'duration': activities[name].durationText() if name in activities else 0,
+            'events': f"{start}-{end}"
         }
-    
+
     return event_data
@@ -0,0 +1,120 @@
+from collections import deque
+from CPM.graph import topologicalOrder, transitiveReduction
+from common.profiling import profiled
+from CPM.validation import validateNetwork
+
+DUMMY_PREFIX = "*"
+
+
+class ArrowNetwork:
+    """
+    Activity on Arrow (AOA) form of a network.
+
+    activities - {name: (start event, end event)}
+    dummies - [(start event, end event)] of the dummy activities
+    Events are numbered 1..event_count in topological order; 1 is the project
+    start and event_count the project end.
+    """
+
+    def __init__(self, activities, dummies, event_count):
+        self.activities = activities
+        self.dummies = dummies
+        self.event_count = event_count
+
+    def dummyName(self, index) -> str:
+        return f"{DUMMY_PREFIX}{index + 1}"
+
+    def arcs(self):
+        """
+        Yields (name, start, end) for all activities followed by the dummies.
+        """
+        for name, (start, end) in self.activities.items():
+            yield name, start, end
+        for index, (start, end) in enumerate(self.dummies):
+            yield self.dummyName(index), start, end
+
+
+@profiled("cpm.aoa")
+def toArrowNetwork(predecessors):
+    """
+    Converts a predecessor DAG {name: [predecessor names]} into an AOA network
+    with few dummy activities.
+
+    After a transitive reduction, activities with the same predecessor set
+    share one start event (found by hashing the set). An activity ends
+    directly at the start event of the smallest set containing it when that
+    set is contained in every other set containing it; otherwise it gets its
+    own end event. Each set is then connected to its start event through the
+    largest smaller sets it contains (one dummy per set) and dummies from the
+    own end events of the activities still missing.
+    """
+    order = topologicalOrder(predecessors)
+    if len(order) != len(predecessors):
+        validateNetwork(predecessors)
+    reduced, _ = transitiveReduction(predecessors, order)
+
+    has_successors = set()
+    start_sets = {}
+    for name in order:
+        start_sets[name] = frozenset(reduced[name])
+        has_successors.update(reduced[name])
+    end_set = frozenset(name for name in order if name not in has_successors)
+
+    # Distinct predecessor sets; the set of all final activities leads to the project end
+    sets = dict.fromkeys(start_sets.values())
+    sets[end_set] = None
+    # The sets below are compared by identity: each one is stored once, as its key in `sets`
+    containing = {name: [] for name in order}
+    for group in sets:
+        for name in group:
+            containing[name].append(group)
+
+    end_events = {}
+    used_arcs = set()
+    for name in order:
+        smallest = min(containing[name], key=len)
+        arc = (start_sets[name], smallest)
+        if arc not in used_arcs and all(group is smallest or smallest <= group for group in containing[name]):
+            end_events[name] = smallest
+            used_arcs.add(arc)
+        else:
+            end_events[name] = ("end", name)
+
+    dummies = []
+    for group in sets:
+        covered = {name for name in group if end_events[name] is group}
+        candidates = {}
+        for name in group:
+            for subset in containing[name]:
+                if len(subset) < len(group) and subset <= group:
+                    candidates[subset] = None
+        for subset in sorted(candidates, key=len, reverse=True):
+            if not subset <= covered:
+                dummies.append((subset, group))
+                covered.update(subset)
+        for name in group:
+            if name not in covered:
+                dummies.append((end_events[name], group))
+
+    # Number the events in topological order of the event graph
+    arcs = [(start_sets[name], end_events[name]) for name in order] + dummies
+    successors = {}
+    in_degree = {}
+    for start, end in arcs:
+        successors.setdefault(start, []).append(end)
+        successors.setdefault(end, [])
+        in_degree[end] = in_degree.get(end, 0) + 1
+        in_degree.setdefault(start, 0)
+    queue = deque(event for event, degree in in_degree.items() if degree == 0)
+    number = {}
+    while queue:
+        event = queue.popleft()
+        number[event] = len(number) + 1
+        for succ in successors[event]:
+            in_degree[succ] -= 1
+            if in_degree[succ] == 0:
+                queue.append(succ)
+
+    activities = {name: (number[start_sets[name]], number[end_events[name]]) for name in predecessors}
+    dummies = sorted((number[start], number[end]) for start, end in dummies)
+    return ArrowNetwork(activities, dummies, len(number))
@@ -0,0 +1,116 @@
+"""
+Working calendars for CPM schedules.
+
+Schedule times are days from the project start date. A WorkCalendar keeps the
+ascending offsets of its working days, so the working time before any moment
+and the moment a given amount of working time is reached are bisect / index
+lookups instead of day-by-day walks. The index grows on demand.
+"""
+import math
+from bisect import bisect_left
+from datetime import date, datetime, timedelta
+
+WEEKDAYS = (0, 1, 2, 3, 4)
+INITIAL_DAYS = 366
+
+
+class WorkCalendar:
+    def __init__(self, start, workdays=WEEKDAYS, holidays=(), name="Standard"):
+        """
+        :param start: Project start date (offset 0)
+        :param workdays: Working weekdays, 0 = Monday ... 6 = Sunday
+        :param holidays: Dates that are not worked
+        """
+        if not workdays:
+            raise ValueError(f"Calendar {name} has no working days")
+        self.name = name
+        self.start = start.date() if isinstance(start, datetime) else start
+        self.workdays = frozenset(workdays)
+        self.holidays = frozenset(day.date() if isinstance(day, datetime) else day for day in holidays)
+        self._days = []
+        self._covered = 0
+        self._extend(INITIAL_DAYS)
+
+    def _extend(self, until) -> None:
+        """
+        Indexes the working days among the offsets [covered, until).
+        """
+        if until <= self._covered:
+            return
+        until = max(until, 2 * self._covered)
+        day = self.start + timedelta(days=self._covered)
+        for offset in range(self._covered, until):
+            if day.weekday() in self.workdays and day not in self.holidays:
+                self._days.append(offset)
+            day += timedelta(days=1)
+        self._covered = until
+
+    def _dayAt(self, index) -> int:
+        while index >= len(self._days):
+            self._extend(2 * self._covered)
+        return self._days[index]
+
+    def workingTime(self, t) -> float:
+        """
+        Working time between the project start and the moment t (days from the start).
+        """
+        day = math.floor(t)
+        self._extend(day + 1)
+        index = bisect_left(self._days, day)
+        if index < len(self._days) and self._days[index] == day:
+            return index + (t - day)
+        return index
+
+    def calendarTime(self, w, finish=False) -> float:
+        """
+        Moment at which the working time w is reached. A finish that falls on a
+        day boundary is placed at the end of the previous working day rather than
+        at the start of the next one.
+        """
+        index = math.floor(w)
+        fraction = w - index
+        if index < 0:
+            return w  # before the project start
+        if finish and fraction == 0 and index > 0:
+            return self._dayAt(index - 1) + 1
+        return self._dayAt(index) + fraction
+
+    def earliest(self, start, duration):
+        """
+        Returns (start, finish) for work starting no earlier than `start`.
+        """
+        w = self.workingTime(start)
+        begin = self.calendarTime(w)
+        return begin, (self.calendarTime(w + duration, finish=True) if duration else begin)
+
+    def latest(self, finish, duration):
+        """
+        Returns (start, finish) for work finishing no later than `finish`.
+        """
+        w = self.workingTime(finish)
+        end = self.calendarTime(w, finish=True)
+        return (self.calendarTime(w - duration) if duration else end), end
+
+
+def toDatetime(start, t) -> datetime:
+    """
+    Converts a schedule time (days from the start date) to a datetime.
+    """
+    if not isinstance(start, datetime):
+        start = datetime.combine(start, datetime.min.time())
+    return start + timedelta(days=float(t))
+
+
+def toTime(start, moment) -> float:
+    """
+    Converts a date or datetime to a schedule time (days from the start date).
+    """
+    if not isinstance(start, datetime):
+        start = datetime.combine(start, datetime.min.time())
+    if not isinstance(moment, datetime):
+        moment = datetime.combine(moment, datetime.min.time())
+    return (moment - start) / timedelta(days=1)
+
+
+def parseDate(text) -> date:
+    return datetime.strptime(text.strip(), "%Y-%m-%d").date()
@@ -2,14 +2,208 @@ import matplotlib
 import matplotlib.pyplot as plt
 import networkx as nx
 import csv
-from CPM.activity import Activity
-matplotlib.use('TkAgg')
+import heapq
+import math
+import os
+from collections import deque
+from datetime import datetime, timedelta
+import numpy as np
+from CPM.activity import Activity, parseDuration, parseLinks, parseNumber
+from CPM.aoa import toArrowNetwork
+from CPM.calendars import toDatetime
+from CPM.gantt import GanttChart
+from CPM.graph import transitiveReduction
+from common.profiling import count, profiled, stage
+from CPM.validation import validateNetwork
+# An explicit MPLBACKEND wins (e.g. Agg for headless runs and tests)
+if 'MPLBACKEND' not in os.environ:
+    matplotlib.use('TkAgg')
+
+PROGRESS_STEP = 1000
+TIME_TOLERANCE = 1e-9
+
+
+def formatTime(value) -> str:
+    """
+    Formats a time for labels: whole numbers without decimals, PERT expectations with two.
+    """
+    value = round(float(value), 2) + 0.0  # + 0.0 drops the sign of -0.0
+    return f"{value:g}" if value.is_integer() else f"{value:.2f}"
+
+
+def normalCdf(x):
+    """
+    Vectorized standard normal CDF (Abramowitz-Stegun 7.1.26 erf approximation, |error| < 1.5e-7).
+    """
+    x = np.asarray(x, dtype=float)
+    z = np.abs(x) / math.sqrt(2)
+    t = 1 / (1 + 0.3275911 * z)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    erf = 1 - poly * np.exp(-z * z)
+    return 0.5 * (1 + np.sign(x) * erf)
+
+
+def _requiredStart(link, duration, start, finish):
+    """
+    Earliest start allowed by a link from a predecessor starting at `start` and
+    finishing at `finish`; `duration` is the duration of the successor.
+    """
+    kind, lag = link
+    if kind == "FS":
+        return finish + lag
+    if kind == "SS":
+        return start + lag
+    if kind == "FF":
+        return finish + lag - duration
+    return start + lag - duration
+
+
+def _allowedStart(link, duration, start, finish):
+    """
+    Latest start allowed by a link to a successor starting at `start` and
+    finishing at `finish`; `duration` is the duration of the predecessor.
+    """
+    kind, lag = link
+    if kind == "FS":
+        return start - lag - duration
+    if kind == "SS":
+        return start - lag
+    if kind == "FF":
+        return finish - lag - duration
+    return finish - lag
 
 
 class CPM:
     def __init__(self, activities=None):
         self.activities = activities if activities else {}
         self.critical_path = []
+        self.project_duration = 0
+        self.project_variance = 0
+        self._topo_index = None
+        self._successor_map = None
+        self.redundant_links = []
+        self._links = False
+        # Optional dates: start_date of time 0, a default WorkCalendar and named calendars
+        # used by activities with Activity.calendar set
+        self.start_date = None
+        self.calendar = None
+        self.calendars = {}
+        self._calendars = False
+        # Progress: remaining work is scheduled no earlier than status_time (see statusUpdate)
+        self.status_time = None
+        self._progress = False
+
+    def successors(self) -> dict:
+        """
+        Returns a dictionary {name: [names of activities that list it as a predecessor]}.
+        Unknown predecessor names are ignored.
+        """
+        successors = {name: [] for name in self.activities}
+        for name, act in self.activities.items():
+            for pred in act.predecessors:
+                if pred in successors:
+                    successors[pred].append(name)
+        return successors
+
+    def validate(self) -> None:
+        """
+        Raises NetworkError (a ValueError) listing all unknown predecessors and
+        all cycles, each with an example path.
+        """
+        validateNetwork({name: act.predecessors for name, act in self.activities.items()})
+
+    @profiled("cpm.reduce")
+    def removeRedundantLinks(self) -> list:
+        """
+        Removes predecessor links implied by longer paths (A->C when A->B->C exists).
+        The ES, EF, LS and LF times of the reduced network are the same. Only plain
+        finish-to-start links are removed, and only paths of finish-to-start links
+        with non-negative lags imply them.
+
+        The solver gets new, reduced predecessor lists; the lists as entered are kept
+        in Activity.entered_predecessors and used for display and saving.
+
+        Returns and stores in redundant_links the removed (predecessor, activity) pairs.
+        """
+        activities = self.activities
+        implying = {name: [pred for pred in act.predecessors if act.link(pred)[0] == "FS" and act.link(pred)[1] >= 0]
+                    for name, act in activities.items()}
+        _, redundant = transitiveReduction(implying)
+        redundant = [(pred, name) for pred, name in redundant if not activities[name].links.get(pred)]
+        removed = {}
+        for pred, name in redundant:
+            removed.setdefault(name, set()).add(pred)
+        for name, preds in removed.items():
+            act = activities[name]
+            if act.entered_predecessors is None:
+                act.entered_predecessors = act.predecessors
+            act.predecessors = [pred for pred in act.predecessors if pred not in preds]
+        self._topo_index = None
+        self._successor_map = None
+        self.redundant_links = redundant
+        count("cpm.redundantLinks", len(redundant))
+        return redundant
+
+    def hasLinks(self) -> bool:
+        """
+        True when some link is not finish-to-start without lag.
+        """
+        return any(act.links for act in self.activities.values())
+
+    def usesCalendars(self) -> bool:
+        return self.calendar is not None or any(act.calendar for act in self.activities.values())
+
+    def hasProgress(self) -> bool:
+        """
+        True when a status time is set or some activity has started.
+        """
+        return self.status_time is not None or any(act.isStarted() for act in self.activities.values())
+
+    def isPlain(self) -> bool:
+        """
+        True for finish-to-start links without lag and continuous time (no working
+        calendars and no progress).
+        """
+        return not self.hasLinks() and not self.usesCalendars() and not self.hasProgress()
+
+    def checkPlain(self, feature) -> None:
+        """
+        Raises ValueError unless isPlain() (used by the analyses that add up
+        durations along finish-to-start paths).
+        """
+        if not self.isPlain():
+            raise ValueError(f"{feature} supports only finish-to-start links without lag, "
+                             f"no working calendars and no progress.")
+
+    def calendarOf(self, act):
+        """
+        Returns the WorkCalendar of the activity (None for continuous time).
+        """
+        if not act.calendar:
+            return self.calendar
+        if act.calendar not in self.calendars:
+            raise ValueError(f"Unknown calendar '{act.calendar}' of activity {act.name}")
+        return self.calendars[act.calendar]
+
+    def checkCalendars(self) -> None:
+        """
+        Raises ValueError unless every calendar in use starts on start_date
+        (offset 0 of a WorkCalendar is the day its working-day index starts from).
+        """
+        if self.start_date is None:
+            raise ValueError("Working calendars need the project start date (CPM.start_date).")
+        start = self.start_date.date() if isinstance(self.start_date, datetime) else self.start_date
+        used = {self.calendarOf(act) for act in self.activities.values()}
+        for calendar in used - {None}:
+            if calendar.start != start:
+                raise ValueError(f"Calendar {calendar.name} starts on {calendar.start}, "
+                                 f"but the project starts on {start}")
+
+    def date(self, t):
+        """
+        Converts a schedule time to a datetime (None without a start date).
+        """
+        return toDatetime(self.start_date, t) if self.start_date is not None else None
 
     def topologicalSort(self) -> list:
         """
@@ -17,59 +211,302 @@ class CPM:
         'activities' is a dictionary {name: Activity}.
         """
 
-        in_degree = {name: 0 for name in self.activities}
-        for act in self.activities.values():
-            for _ in act.predecessors:
-                in_degree[act.name] += 1
+        in_degree = {name: len(act.predecessors) for name, act in self.activities.items()}
+        successors = self.successors()
 
-        queue = [n for n in in_degree if in_degree[n] == 0]
+        queue = deque(n for n in in_degree if in_degree[n] == 0)
         topo_order = []
 
         while queue:
-            current = queue.pop(0)
+            current = queue.popleft()
             topo_order.append(current)
 
-            for name, act in self.activities.items():
-                if current in act.predecessors:
-                    in_degree[name] -= 1
-                    if in_degree[name] == 0:
-                        queue.append(name)
+            for name in successors[current]:
+                in_degree[name] -= 1
+                if in_degree[name] == 0:
+                    queue.append(name)
         return topo_order
 
-    def calculate(self) -> dict:
+    def calculate(self, progress=None) -> dict:
         """
         Calculates ES, EF, LS, LF times and time reserve for each activity.
         Returns the same 'activities' dictionary with updated values.
-        """
 
-        order = self.topologicalSort()
+        The forward pass also accumulates PERT variances along the path that
+        determines each ES (ties broken by the larger variance), giving the
+        project duration and variance used by deadlineProbability().
 
-        for name in order:
-            act = self.activities[name]
+        :param progress: Optional callable progress(fraction, message), called between stages
+                         and every PROGRESS_STEP activities; it may raise to abort the calculation
+        """
 
-            if not act.predecessors:
-                act.ES = 0
-            else:
-                act.ES = max(self.activities[p].EF for p in act.predecessors)
-            act.EF = act.ES + act.duration
+        if progress:
+            progress(0.0, "Sorting activities")
+        count("cpm.activities", len(self.activities))
+        self._links = self.hasLinks()
+        self._calendars = self.usesCalendars()
+        self._progress = self.hasProgress()
+        if self._calendars:
+            self.checkCalendars()
+        with stage("cpm.topologicalSort"):
+            order = self.topologicalSort()
+        if len(order) != len(self.activities):
+            self.validate()
+
+        with stage("cpm.forward"):
+            for i, name in enumerate(order):
+                if progress and i % PROGRESS_STEP == 0:
+                    progress(0.1 + 0.45 * i / len(order), "Forward pass")
+                self._forward(self.activities[name])
+
+            last = max(self.activities.values(), key=lambda a: (a.EF, a.path_variance))
+            max_EF = last.EF
+            self.project_duration = last.EF
+            self.project_variance = last.path_variance
+
+        with stage("cpm.backward"):
+            successor_map = self.successors()
+            for i, name in enumerate(reversed(order)):
+                if progress and i % PROGRESS_STEP == 0:
+                    progress(0.55 + 0.45 * i / len(order), "Backward pass")
+                self._backward(self.activities[name], successor_map[name], max_EF)
+            self._floats(successor_map)
+
+        # Kept for recalculate() while the network structure stays the same
+        self._topo_index = {name: i for i, name in enumerate(order)}
+        self._successor_map = successor_map
+
+        with stage("cpm.criticalPath"):
+            self.critical_path = self.criticalPath()
+        return self.activities
 
-        max_EF = max(a.EF for a in self.activities.values())
+    def _span(self, act):
+        """
+        Time from the (actual) start to the (forecast) finish of a started
+        activity; the duration for all others.
+        """
+        return act.EF - act.ES if self._progress and act.isStarted() else act.duration
+
+    def _forward(self, act) -> None:
+        if self._progress and act.isStarted():
+            self._forwardStarted(act)
+            return
+        if not act.predecessors:
+            act.ES = 0
+            act.path_variance = act.variance
+        elif not act.links:
+            driver = max((self.activities[p] for p in act.predecessors),
+                         key=lambda p: (p.EF, p.path_variance))
+            act.ES = driver.EF
+            act.path_variance = driver.path_variance + act.variance
+        else:
+            start, variance = max((_requiredStart(act.link(p), act.duration, pred.ES, pred.EF), pred.path_variance)
+                                  for p, pred in ((p, self.activities[p]) for p in act.predecessors))
+            act.ES = max(0, start)
+            act.path_variance = variance + act.variance
+        if self._progress and self.status_time is not None:
+            act.ES = max(act.ES, self.status_time)
+        calendar = self.calendarOf(act) if self._calendars else None
+        if calendar:
+            act.ES, act.EF = calendar.earliest(act.ES, act.duration)
+        else:
+            act.EF = act.ES + act.duration
 
-        for name in reversed(order):
-            act = self.activities[name]
-            successors = [s for s in self.activities.values() if name in s.predecessors]
+    def _forwardStarted(self, act) -> None:
+        """
+        Forward pass of a started activity: it keeps its actual start and finish;
+        unfinished work resumes where the reported progress would have been reached
+        as planned, but not before the status time.
+        """
+        if act.actual_finish is not None:
+            act.EF = act.actual_finish
+            act.ES = act.actual_start if act.actual_start is not None else act.actual_finish - act.duration
+            act.path_variance = 0
+            return
+        act.ES = act.actual_start
+        act.path_variance = act.variance
+        remaining = act.remainingDuration()
+        calendar = self.calendarOf(act) if self._calendars else None
+        if calendar:
+            resume = calendar.earliest(act.ES, act.duration - remaining)[1]
+        else:
+            resume = act.ES + act.duration - remaining
+        if self.status_time is not None:
+            resume = max(resume, self.status_time)
+        act.EF = calendar.earliest(resume, remaining)[1] if calendar else resume + remaining
+
+    def _backward(self, act, successors, max_EF) -> None:
+        duration = self._span(act)
+        if not successors:
+            act.LF = max_EF
+        elif not self._links:
+            act.LF = min(self.activities[s].LS for s in successors)
+        else:
+            latest = min(_allowedStart(succ.link(act.name), duration, succ.LS, succ.LF)
+                         for succ in (self.activities[s] for s in successors))
+            act.LF = min(max_EF, latest + duration)
+        calendar = self.calendarOf(act) if self._calendars else None
+        if self._progress and act.isStarted():
+            act.LS = act.LF - duration
+        elif calendar:
+            act.LS, act.LF = calendar.latest(act.LF, act.duration)
+        else:
+            act.LS = act.LF - act.duration
 
-            if not successors:
-                act.LF = max_EF
-            else:
-                act.LF = min(s.LS for s in successors)
+    def _floats(self, successor_map) -> None:
+        """
+        Sets the total float (reserve) LS - ES and, from the earliest start of the
+        successors and the latest finish of the predecessors, the free float
+        (delay that keeps all successors at ES), the interfering float
+        (total - free) and the independent float (delay possible even when the
+        predecessors finish late and the successors start early).
+        """
+        activities = self.activities
+        if self._links or self._calendars or self._progress:
+            self._constrainedFloats(successor_map)
+            return
+        for name, act in activities.items():
+            act.reserve = act.LS - act.ES
+            next_ES = min((activities[s].ES for s in successor_map[name]), default=self.project_duration)
+            previous_LF = max((activities[p].LF for p in act.predecessors), default=0)
+            act.free_float = next_ES - act.EF
+            act.interfering_float = act.reserve - act.free_float
+            act.independent_float = max(0, next_ES - previous_LF - act.duration)
 
-            act.LS = act.LF - act.duration
+    def _constrainedFloats(self, successor_map) -> None:
+        """
+        _floats() for typed and lagged links, working calendars and progress: the
+        successors limit the start of an activity through _allowedStart, the
+        predecessors through _requiredStart, and both limits are moved onto
+        working time and after the status time.
+        """
+        activities = self.activities
+        end = self.project_duration
+        for name, act in activities.items():
             act.reserve = act.LS - act.ES
+            duration = self._span(act)
+            latest_start = end - duration
+            for s in successor_map[name]:
+                succ = activities[s]
+                latest_start = min(latest_start, _allowedStart(succ.link(name), duration, succ.ES, succ.EF))
+            earliest_start = 0
+            for p in act.predecessors:
+                pred = activities[p]
+                earliest_start = max(earliest_start, _requiredStart(act.link(p), duration, pred.LS, pred.LF))
+            if self._progress and act.isStarted():
+                earliest_start = act.ES
+            elif self._progress and self.status_time is not None:
+                earliest_start = max(earliest_start, self.status_time)
+            calendar = self.calendarOf(act) if self._calendars else None
+            if calendar and not (self._progress and act.isStarted()):
+                latest_start = calendar.latest(latest_start + act.duration, act.duration)[0]
+                earliest_start = calendar.earliest(earliest_start, act.duration)[0]
+            act.free_float = latest_start - act.ES
+            act.interfering_float = act.reserve - act.free_float
+            act.independent_float = max(0, latest_start - earliest_start)
+
+    @profiled("cpm.recalculate")
+    def recalculate(self, changed) -> dict:
+        """
+        Updates the results of calculate() after the durations of the `changed`
+        activities were modified (the predecessors must stay the same).
 
+        Early times are propagated only to the successors whose times really
+        change and late times only to the predecessors; all other activities
+        just follow the shift of the project end.
+        """
+        # Shifting late times by whole calendar days would break working-day alignment
+        if self._topo_index is None or len(self._topo_index) != len(self.activities) or self._calendars:
+            return self.calculate()
+        changed = set(changed)
+        index = self._topo_index
+        activities = self.activities
+
+        queue = [(index[name], name) for name in changed]
+        heapq.heapify(queue)
+        queued = set(changed)
+        while queue:
+            _, name = heapq.heappop(queue)
+            act = activities[name]
+            old_EF = act.EF
+            self._forward(act)
+            if act.EF != old_EF or name in changed:
+                for succ in self._successor_map[name]:
+                    if succ not in queued:
+                        queued.add(succ)
+                        heapq.heappush(queue, (index[succ], succ))
+
+        last = max(activities.values(), key=lambda a: (a.EF, a.path_variance))
+        shift = last.EF - self.project_duration
+        self.project_duration = last.EF
+        self.project_variance = last.path_variance
+        if shift:
+            for act in activities.values():
+                act.LF += shift
+                act.LS += shift
+
+        queue = [(-index[name], name) for name in changed]
+        heapq.heapify(queue)
+        queued = set(changed)
+        while queue:
+            _, name = heapq.heappop(queue)
+            act = activities[name]
+            old_LS = act.LS
+            self._backward(act, self._successor_map[name], last.EF)
+            if act.LS != old_LS or name in changed:
+                for pred in act.predecessors:
+                    if pred not in queued:
+                        queued.add(pred)
+                        heapq.heappush(queue, (-index[pred], pred))
+
+        self._floats(self._successor_map)
         self.critical_path = self.criticalPath()
-        return self.activities
+        return activities
+
+    @profiled("cpm.status")
+    def statusUpdate(self, updates, status_time=None) -> dict:
+        """
+        Records progress and re-forecasts the remaining work through recalculate(),
+        so only the activities downstream (and, for late times, upstream) of the
+        updates are recomputed.
+
+        :param updates: {name: {"actual_start": t, "actual_finish": t, "percent_complete": p}};
+                        fields that are left out keep their value (see Activity.setProgress)
+        :param status_time: Optional new status time; work not done yet is scheduled after it
+        Returns the same 'activities' dictionary with updated values.
+        """
+        activities = self.activities
+        unknown = [name for name in updates if name not in activities]
+        if unknown:
+            raise ValueError(f"Progress reported for unknown activities: {', '.join(unknown)}")
+        changed = set()
+        for name, fields in updates.items():
+            activities[name].setProgress(**fields)
+            changed.add(name)
+
+        if status_time is not None and status_time != self.status_time:
+            # Unfinished work and not started activities held back by the old status time move with it
+            limit = status_time if self.status_time is None else max(status_time, self.status_time)
+            self.status_time = status_time
+            changed.update(name for name, act in activities.items()
+                           if act.actual_finish is None and (act.isStarted() or act.ES <= limit))
+        count("cpm.status.updates", len(updates))
+
+        self._progress = True
+        return self.recalculate(changed)
+
+    def deadlineProbability(self, deadlines):
+        """
+        Probability of finishing by each deadline under the PERT normal approximation
+        of the critical path. Accepts a scalar or an array of deadlines and needs
+        only the values stored by calculate(), so any number of queries is cheap.
+        """
+        deadlines = np.asarray(deadlines, dtype=float)
+        if self.project_variance <= 0:
+            return (deadlines >= self.project_duration - TIME_TOLERANCE).astype(float)
+        return normalCdf((deadlines - self.project_duration) / math.sqrt(self.project_variance))
     
+    @profiled("cpm.save_csv")
     def save_to_csv(self, filename):
         """
         Saves a dictionary of Activity objects to a CSV file.
@@ -81,80 +518,164 @@ class CPM:
             writer = csv.writer(file, delimiter='\t')
             
             # Write header
-            writer.writerow(["Name", "Duration", "Predecessors", "ES", "EF", "LS", "LF", "Reserve"])
+            writer.writerow(["Name", "Duration", "Predecessors", "ES", "EF", "LS", "LF", "Reserve",
+                             "Free float", "Interfering float", "Independent float",
+                             "Calendar", "ES date", "EF date", "LS date", "LF date",
+                             "Actual start", "Actual finish", "Percent complete"])
             
             # Write activity data
             for activity in self.activities.values():
+                times = (activity.ES, activity.EF, activity.LS, activity.LF)
+                if self.start_date is not None:
+                    dates = [self.date(t).isoformat(sep=" ", timespec="minutes") for t in times]
+                else:
+                    dates = [""] * len(times)
+                progress = [activity.actual_start, activity.actual_finish, activity.percent_complete]
                 writer.writerow([
                     activity.name,
-                    activity.duration,
-                    ','.join(activity.predecessors),  # Convert list to comma-separated string
+                    activity.durationText(),
+                    ','.join(activity.predecessorTokens()),  # e.g. 'A,B:SS+2'
                     activity.ES,
                     activity.EF,
                     activity.LS,
                     activity.LF,
-                    activity.reserve
-                ])
-
+                    activity.reserve,
+                    activity.free_float,
+                    activity.interfering_float,
+                    activity.independent_float,
+                    activity.calendar or ""
+                ] + dates + ["" if value is None else value for value in progress])
+
+    @profiled("cpm.read_csv")
     def read_from_csv(self, filename):
         """
         Reads activities from a CSV file and returns a dictionary of Activity objects.
+
+        The start date is recovered from the date columns; the file keeps only the
+        calendar names of the activities, so the WorkCalendar definitions
+        (CPM.calendar, CPM.calendars) have to be set again before recalculating.
         
         :param filename: Name of the input CSV file
         :return: Dictionary of Activity objects (key: activity name, value: Activity object)
         """
         activities = {}
+        start_date = None
         with open(filename, mode='r', newline='') as file:
             reader = csv.reader(file, delimiter='\t')
             next(reader)  # Skip header
             for row in reader:
-                name, duration, predecessors, ES, EF, LS, LF, reserve = row
+                # Files saved before the float columns were added have 8 columns
+                name, duration, predecessors, ES, EF, LS, LF, reserve = row[:8]
+                duration, estimates = parseDuration(duration, name)
+                predecessors, links = parseLinks(predecessors.split(',') if predecessors else [])
                 activities[name] = Activity(
                     name,
-                    int(duration),
-                    predecessors.split(',') if predecessors else []
+                    duration,
+                    predecessors,
+                    estimates,
+                    links=links
                 )
-                activities[name].ES = int(ES)
-                activities[name].EF = int(EF)
-                activities[name].LS = int(LS)
-                activities[name].LF = int(LF)
-                activities[name].reserve = int(reserve)
+                activities[name].ES = parseNumber(ES)
+                activities[name].EF = parseNumber(EF)
+                activities[name].LS = parseNumber(LS)
+                activities[name].LF = parseNumber(LF)
+                activities[name].reserve = parseNumber(reserve)
+                if len(row) >= 11:
+                    activity = activities[name]
+                    activity.free_float, activity.interfering_float, activity.independent_float = map(
+                        parseNumber, row[8:11])
+                if len(row) >= 12:
+                    activities[name].calendar = row[11] or None
+                if len(row) >= 13 and row[12] and start_date is None:
+                    start = datetime.fromisoformat(row[12]) - timedelta(days=float(activities[name].ES))
+                    # Dates are saved to the minute
+                    start_date = start.replace(second=0, microsecond=0) + timedelta(minutes=round(start.second / 60))
+                if len(row) >= 19:
+                    actual_start, actual_finish, percent = (parseNumber(value) if value else None
+                                                            for value in row[16:19])
+                    activities[name].setProgress(actual_start, actual_finish, percent)
         self.activities = activities
+        if start_date is not None:
+            self.start_date = start_date
 
     def criticalPath(self):
-        return [n for n, a in self.activities.items() if a.reserve == 0]
+        # Progress out of sequence can leave negative reserves; those activities are critical too
+        return [n for n, a in self.activities.items() if a.reserve <= TIME_TOLERANCE]
 
     def print(self) -> None:
         print("CPM Results:")
         for name, act in self.activities.items():
             print(f"  Activity {name}: "
-                  f"ES={act.ES}, EF={act.EF}, "
-                  f"LS={act.LS}, LF={act.LF}, "
-                  f"Reserve={act.reserve}"
+                  f"ES={formatTime(act.ES)}, EF={formatTime(act.EF)}, "
+                  f"LS={formatTime(act.LS)}, LF={formatTime(act.LF)}, "
+                  f"Reserve={formatTime(act.reserve)}"
                   )
 
-    def printCriticalPath(self) -> None:
-        print("Critical Path:", " -> ".join(self.critical_path))
+    def printCriticalPath(self, limit=10) -> None:
+        """
+        Prints up to `limit` critical paths, one line per parallel critical branch.
+        """
+        if not self.isPlain():
+            print("Critical activities:", ", ".join(self.critical_path))
+            return
+        from CPM.paths import countCriticalPaths, criticalPaths
+        total = countCriticalPaths(self)
+        for i, path in enumerate(criticalPaths(self, limit), 1):
+            print(f"Critical Path {i}/{total}:", " -> ".join(path))
+
+    def aonLabel(self, name) -> str:
+        """
+        Returns the text drawn inside an AON node (START, END or an activity).
+        """
+        if name == "START":
+            return f"{0:>2}       {0:>2}\n{0:>2}  {0:>2}  {0:>2}"
+        if name == "END":
+            max_ef = max(a.EF for a in self.activities.values())
+            return f"{max_ef:>2}       {max_ef:>2}\n{max_ef:>2}  {0:>2}  {max_ef:>2}"
+        act = self.activities[name]
+        ES, duration, EF, LS, reserve, LF = map(formatTime, (act.ES, act.duration, act.EF,
+                                                            act.LS, act.reserve, act.LF))
+        return f"{ES:>2}  {duration:>2}  {EF:>2}\n{LS:>2}  {reserve:>2}  {LF:>2}"
+
+    def aonCriticalEdges(self) -> list:
+        """
+        Returns the AON edges (including START/END edges) drawn as critical.
+        """
+        critical_edges = [(self.critical_path[i], self.critical_path[i + 1])
+                          for i in range(len(self.critical_path) - 1)]
+        critical_edges.extend([("START", name) for name in self.critical_path
+                               if not self.activities[name].predecessors])
+        critical_edges.extend([(name, "END") for name in self.critical_path
+                               if not [s for s in self.activities.values() if name in s.predecessors]])
+        return critical_edges
 
     def drawAON(self) -> None:
         """
         Draws an Activity on Node (AON) network diagram.
         """
+        self.buildAON()
+        self._showMaximized()
+
+    @profiled("cpm.draw.AON")
+    def buildAON(self):
+        """
+        Builds the Activity on Node (AON) diagram on a new figure.
+        Returns (fig, ax, artists) where artists maps node boxes, inside labels
+        and edge arrows by node name / edge so they can be updated later.
+        """
         G = nx.DiGraph()
 
-        max_ef = max(a.EF for a in self.activities.values())
-        G.add_node("START", label_inside=f"{0:>2}       {0:>2}\n{0:>2}  {0:>2}  {0:>2}", label_above="START")
-        G.add_node("END", label_inside=f"{max_ef:>2}       {max_ef:>2}\n{max_ef:>2}  {0:>2}  {max_ef:>2}",
-                   label_above="END")
+        G.add_node("START", label_inside=self.aonLabel("START"), label_above="START")
+        G.add_node("END", label_inside=self.aonLabel("END"), label_above="END")
 
         for name, act in self.activities.items():
-            label_inside = f"{act.ES:>2}  {act.duration:>2}  {act.EF:>2}\n{act.LS:>2}  {act.reserve:>2}  {act.LF:>2}"
-            G.add_node(name, label_inside=label_inside, label_above=name)
+            G.add_node(name, label_inside=self.aonLabel(name), label_above=name)
 
+        # Links as entered, so links removed as redundant before solving are still drawn
         for name, act in self.activities.items():
             if not act.predecessors:
                 G.add_edge("START", name)
-            for pred in act.predecessors:
+            for pred in act.enteredPredecessors():
                 G.add_edge(pred, name)
             successors = [s for s in self.activities.values() if name in s.predecessors]
             if not successors:
@@ -202,28 +723,27 @@ class CPM:
         critical_nodes = set(self.critical_path)
         regular_nodes = set(self.activities.keys()) - critical_nodes
         start_end_nodes = {"START", "END"}
+        artists = {'boxes': {}, 'inside': {}, 'edges': {}}
 
         for node in start_end_nodes:
             x, y = pos[node]
-            ax.add_patch(plt.Rectangle((x - node_width / 2, y - node_height / 2), node_width, node_height,
-                                       color='lightgreen', ec='black', zorder=2))
+            artists['boxes'][node] = ax.add_patch(
+                plt.Rectangle((x - node_width / 2, y - node_height / 2), node_width, node_height,
+                              color='lightgreen', ec='black', zorder=2))
 
         for node in regular_nodes:
             x, y = pos[node]
-            ax.add_patch(plt.Rectangle((x - node_width / 2, y - node_height / 2), node_width, node_height,
-                                       color='lightblue', ec='black', zorder=2))
+            artists['boxes'][node] = ax.add_patch(
+                plt.Rectangle((x - node_width / 2, y - node_height / 2), node_width, node_height,
+                              color='lightblue', ec='black', zorder=2))
 
         for node in critical_nodes:
             x, y = pos[node]
-            ax.add_patch(plt.Rectangle((x - node_width / 2, y - node_height / 2), node_width, node_height,
-                                       color='salmon', ec='black', zorder=2))
+            artists['boxes'][node] = ax.add_patch(
+                plt.Rectangle((x - node_width / 2, y - node_height / 2), node_width, node_height,
+                              color='salmon', ec='black', zorder=2))
 
-        critical_edges = [(self.critical_path[i], self.critical_path[i + 1])
-                          for i in range(len(self.critical_path) - 1)]
-        critical_edges.extend([("START", name) for name in self.critical_path
-                               if not self.activities[name].predecessors])
-        critical_edges.extend([(name, "END") for name in self.critical_path
-                               if not [s for s in self.activities.values() if name in s.predecessors]])
+        critical_edges = self.aonCriticalEdges()
 
         regular_edges = [edge for edge in G.edges() if edge not in critical_edges]
 
@@ -252,27 +772,35 @@ class CPM:
         dynamic_margin = base_margin * scale_factor
         dynamic_margin = max(dynamic_margin, 20.0)
 
+        def keep_edges(edgelist, patches):
+            for edge, patch in zip(edgelist, patches):
+                artists['edges'][edge] = patch
+
         for edge in regular_non_horizontal:
             rad = get_dynamic_rad(edge)
             adjusted_margin = dynamic_margin * (1 + rad)
-            nx.draw_networkx_edges(G, pos, edgelist=[edge], edge_color='gray',
-                                   arrows=True, arrowstyle='->', arrowsize=25, width=2,
-                                   connectionstyle=f"arc3,rad={rad}", min_target_margin=adjusted_margin)
+            keep_edges([edge], nx.draw_networkx_edges(
+                G, pos, edgelist=[edge], edge_color='gray', ax=ax,
+                arrows=True, arrowstyle='->', arrowsize=25, width=2,
+                connectionstyle=f"arc3,rad={rad}", min_target_margin=adjusted_margin))
 
         for edge in critical_non_horizontal:
             rad = get_dynamic_rad(edge)
             adjusted_margin = dynamic_margin * (1 + rad)
-            nx.draw_networkx_edges(G, pos, edgelist=[edge], edge_color='red',
-                                   arrows=True, arrowstyle='->', arrowsize=25, width=2.5,
-                                   connectionstyle=f"arc3,rad={rad}", min_target_margin=adjusted_margin)
+            keep_edges([edge], nx.draw_networkx_edges(
+                G, pos, edgelist=[edge], edge_color='red', ax=ax,
+                arrows=True, arrowstyle='->', arrowsize=25, width=2.5,
+                connectionstyle=f"arc3,rad={rad}", min_target_margin=adjusted_margin))
 
-        nx.draw_networkx_edges(G, pos, edgelist=regular_horizontal, edge_color='gray',
-                               arrows=True, arrowstyle='->', arrowsize=25, width=2,
-                               connectionstyle="arc3,rad=0.0", min_target_margin=dynamic_margin)
+        keep_edges(regular_horizontal, nx.draw_networkx_edges(
+            G, pos, edgelist=regular_horizontal, edge_color='gray', ax=ax,
+            arrows=True, arrowstyle='->', arrowsize=25, width=2,
+            connectionstyle="arc3,rad=0.0", min_target_margin=dynamic_margin))
 
-        nx.draw_networkx_edges(G, pos, edgelist=critical_horizontal, edge_color='red',
-                               arrows=True, arrowstyle='->', arrowsize=25, width=2.5,
-                               connectionstyle="arc3,rad=0.0", min_target_margin=dynamic_margin)
+        keep_edges(critical_horizontal, nx.draw_networkx_edges(
+            G, pos, edgelist=critical_horizontal, edge_color='red', ax=ax,
+            arrows=True, arrowstyle='->', arrowsize=25, width=2.5,
+            connectionstyle="arc3,rad=0.0", min_target_margin=dynamic_margin))
 
         labels_above = nx.get_node_attributes(G, 'label_above')
         labels_inside = nx.get_node_attributes(G, 'label_inside')
@@ -284,6 +812,7 @@ class CPM:
             text_obj = ax.text(x, y, labels_inside[node],
                                ha='center', va='center', fontsize=base_font_size,
                                wrap=True, bbox=dict(facecolor='none', edgecolor='none', pad=0))
+            artists['inside'][node] = text_obj
 
             renderer = fig.canvas.get_renderer()
             bbox = text_obj.get_window_extent(renderer=renderer)
@@ -319,6 +848,9 @@ class CPM:
         ax.set_ylim(min(y - node_height for x, y in pos.values()) - 3,
                     max(y + node_height for x, y in pos.values()) + 3)
 
+        return fig, ax, artists
+
+    def _showMaximized(self, tight=False, block=True) -> None:
         manager = plt.get_current_fig_manager()
         try:
             manager.window.showMaximized()
@@ -332,129 +864,62 @@ class CPM:
                     print("Could not maximize window: backend not supported.")
         manager.window.resizable(False, False)
 
-        plt.show()
+        if tight:
+            plt.tight_layout()
+        plt.show(block=block)
 
-    def drawAOA(self) -> None:
+    @staticmethod
+    def _aoaEventLabels(G, topo_order) -> None:
         """
-        Draws an Activity on Arrow (AOA) network.
+        Computes the earliest/latest time and slack of every event from the
+        durations stored on the edges of G and stores the node labels in G.
         """
-        G = nx.DiGraph()
-
-        event_counter = 0
-        event_times = {}
-        activity_to_edges = {}
-
-        G.add_node(event_counter)
-        event_times[event_counter] = 0
-        start_event = event_counter
-        event_counter += 1
+        event_earliest = {event: 0 for event in G.nodes()}
+        for event in topo_order:
+            for _, succ, data in G.out_edges(event, data=True):
+                event_earliest[succ] = max(event_earliest[succ], event_earliest[event] + data['duration'])
 
-        events = {frozenset(): start_event}
-        activity_to_start_event = {}
-        activity_to_end_event = {}
-
-        topo_order = self.topologicalSort()
-
-        successor_to_activities = {}
-        for name in topo_order:
-            successors = frozenset([s for s in self.activities.keys() if name in self.activities[s].predecessors])
-            if successors not in successor_to_activities:
-                successor_to_activities[successors] = []
-            successor_to_activities[successors].append(name)
-
-        activity_to_end_node = {}
-
-        for name in topo_order:
-            act = self.activities[name]
-            predecessors = frozenset(act.predecessors)
-
-            if not predecessors:
-                start_event = 0
-            else:
-                predecessor_ends = frozenset([p for p in predecessors])
-                if predecessor_ends not in events:
-                    start_time = max(self.activities[pred].EF for pred in predecessors)
-                    events[predecessor_ends] = event_counter
-                    event_times[event_counter] = start_time
-                    G.add_node(event_counter)
-                    for pred in predecessors:
-                        pred_end = activity_to_end_node[pred]
-                        if not G.has_edge(pred_end, event_counter):
-                            G.add_edge(pred_end, event_counter, label="", duration=0, reserve=0)
-                    event_counter += 1
-                start_event = events[predecessor_ends]
-            activity_to_start_event[name] = start_event
-
-            successors = frozenset([s for s in self.activities.keys() if name in self.activities[s].predecessors])
-
-            ending_activities = frozenset(successor_to_activities.get(successors, [name]))
-            if ending_activities not in events:
-                end_time = max(self.activities[n].EF for n in ending_activities)
-                events[ending_activities] = event_counter
-                event_times[event_counter] = end_time
-                G.add_node(event_counter)
-                event_counter += 1
-            end_event = events[ending_activities]
-            activity_to_end_event[name] = end_event
-            activity_to_end_node[name] = end_event
-
-            G.add_edge(start_event, end_event, label=name, duration=act.duration, reserve=act.reserve)
-            activity_to_edges[name] = (start_event, end_event)
-
-        end_activities = frozenset([name for name, act in self.activities.items() if
-                                    not any(name in s.predecessors for s in self.activities.values())])
-        if end_activities not in events:
-            end_time = max(self.activities[name].EF for name in end_activities)
-            events[end_activities] = event_counter
-            event_times[event_counter] = end_time
-            G.add_node(event_counter)
-            end_event = event_counter
-            event_counter += 1
-        else:
-            end_event = events[end_activities]
-
-        for name in end_activities:
-            last_event = activity_to_end_event[name]
-            if last_event != end_event and not G.has_edge(last_event, end_event):
-                G.add_edge(last_event, end_event, label="", duration=0, reserve=0)
-
-        event_earliest = {}
+        max_time = max(event_earliest.values())
         event_latest = {}
-        event_slack = {}
-
-        for event, time in event_times.items():
-            event_earliest[event] = time
-            event_latest[event] = float('inf')
-            event_slack[event] = 0
-
-        event_earliest[0] = 0
-        max_time = max(event_times.values())
-        event_latest[end_event] = max_time
-
-        topo_order = list(nx.topological_sort(G))
         for event in reversed(topo_order):
-            successors = list(G.successors(event))
-            if not successors:
-                event_latest[event] = max_time
-            else:
-                min_successor_time = float('inf')
-                for succ in successors:
-                    for edge in G.edges(data=True):
-                        if edge[0] == event and edge[1] == succ:
-                            duration = edge[2]['duration']
-                            successor_earliest = event_earliest[succ]
-                            min_successor_time = min(min_successor_time, successor_earliest - duration)
-                event_latest[event] = min_successor_time if min_successor_time != float('inf') else max_time
-
-            event_slack[event] = event_latest[event] - event_earliest[event]
+            successors = G.out_edges(event, data=True)
+            event_latest[event] = min((event_latest[succ] - data['duration'] for _, succ, data in successors),
+                                      default=max_time)
 
         for event in G.nodes():
-            j = event
             t0_j = event_earliest[event]
             t1_j = event_latest[event]
-            L_j = event_slack[event]
-            label = f"{j}\n{t0_j:>2}       {t1_j:>2}\n{L_j:>2}"
-            G.nodes[event]['label'] = label
+            L_j = t1_j - t0_j
+            t0_j, t1_j, L_j = map(formatTime, (t0_j, t1_j, L_j))
+            G.nodes[event]['label'] = f"{event}\n{t0_j:>2}       {t1_j:>2}\n{L_j:>2}"
+
+    def drawAOA(self) -> None:
+        """
+        Draws an Activity on Arrow (AOA) network.
+        """
+        self.buildAOA()
+        self._showMaximized()
+
+    @profiled("cpm.draw.AOA")
+    def buildAOA(self):
+        """
+        Builds the Activity on Arrow (AOA) diagram on a new figure.
+        Returns (fig, ax, artists) where artists holds the event graph, the
+        event and activity labels and the arrows of every activity.
+        """
+        network = toArrowNetwork({name: act.predecessors for name, act in self.activities.items()})
+        G = nx.DiGraph()
+        G.add_nodes_from(range(1, network.event_count + 1))
+        for start, end in network.dummies:
+            G.add_edge(start, end, label="", duration=0, reserve=0)
+        activity_to_edges = {}
+        for name, (start, end) in network.activities.items():
+            act = self.activities[name]
+            G.add_edge(start, end, label=name, duration=act.duration, reserve=act.reserve)
+            activity_to_edges[name] = (start, end)
+
+        topo_order = list(nx.topological_sort(G))
+        self._aoaEventLabels(G, topo_order)
 
         levels = {}
         for node in topo_order:
@@ -492,8 +957,8 @@ class CPM:
             critical_nodes.add(start_event)
             critical_nodes.add(end_event)
 
-        start_node = 0
-        end_node = end_event
+        start_node = 1
+        end_node = network.event_count
 
         node_colors = []
         for node in G.nodes():
@@ -506,7 +971,9 @@ class CPM:
             else:
                 node_colors.append('lightblue')
 
-        nx.draw_networkx_nodes(G, pos, node_size=node_size, node_color=node_colors, node_shape='o', ax=ax)
+        nodes = nx.draw_networkx_nodes(G, pos, node_size=node_size, node_color=node_colors, node_shape='o', ax=ax)
+        artists = {'graph': G, 'topo_order': topo_order, 'activity_edges': activity_to_edges,
+                   'nodes': nodes, 'node_colors': node_colors, 'events': {}, 'labels': {}, 'edges': {}}
 
         edges_by_target = {}
         for edge in G.edges(data=True):
@@ -540,7 +1007,7 @@ class CPM:
                 else:
                     rad = 0.0 if abs(y1 - y2) < 1e-5 else 0.3
 
-                nx.draw_networkx_edges(
+                artists['edges'][activity_name] = nx.draw_networkx_edges(
                     G, pos, edgelist=[(start, end)], edge_color=edge_color,
                     width=edge_width, arrows=True, arrowstyle='->', arrowsize=20,
                     connectionstyle=f"arc3,rad={rad}", ax=ax,
@@ -552,8 +1019,8 @@ class CPM:
                 mid_y = y1 + t * (y2 - y1)
                 offset_y = 0.5 * (idx - (num_edges - 1) / 2)
                 mid_y += offset_y
-                label = f"{activity_name}\nDur: {data['duration']}"
-                ax.text(
+                label = f"{activity_name}\nDur: {formatTime(data['duration'])}"
+                artists['labels'][activity_name] = ax.text(
                     mid_x, mid_y, label, fontsize=9, ha='center', va='center', fontweight='bold',
                     bbox=dict(facecolor='white', edgecolor='none', alpha=0.7)
                 )
@@ -561,8 +1028,8 @@ class CPM:
         labels = nx.get_node_attributes(G, 'label')
         for node, label in labels.items():
             x, y = pos[node]
-            ax.text(x, y, label, ha='center', va='center', fontsize=9,
-                    bbox=dict(facecolor='none', edgecolor='none', pad=0))
+            artists['events'][node] = ax.text(x, y, label, ha='center', va='center', fontsize=9,
+                                              bbox=dict(facecolor='none', edgecolor='none', pad=0))
 
         legend_x = 0.03
         legend_y = 0.98
@@ -582,66 +1049,15 @@ class CPM:
         ax.set_xlim(min(x for x, y in pos.values()) - 2, max(x for x, y in pos.values()) + 2)
         ax.set_ylim(min(y for x, y in pos.values()) - 2, max(y for x, y in pos.values()) + 2)
 
-        manager = plt.get_current_fig_manager()
-        try:
-            manager.window.showMaximized()
-        except AttributeError:
-            try:
-                manager.window.state('zoomed')
-            except AttributeError:
-                try:
-                    manager.frame.Maximize(True)
-                except AttributeError:
-                    print("Could not maximize window: backend not supported.")
-        manager.window.resizable(False, False)
-
-        plt.show()
+        return fig, ax, artists
 
-    def drawGantt(self) -> None:
+    def drawGantt(self, rows=None, time_window=None) -> None:
         """
         Draws a Gantt chart.
-        """
-
-        fig, ax = plt.subplots(figsize=(10, len(self.activities) * 0.5))
-        y_pos = range(len(self.activities))
 
-
-        activity_names = list(self.activities.keys())
-        critical_set = set(self.critical_path)
-
-        for i, name in enumerate(activity_names):
-            act = self.activities[name]
-            color = 'red' if name in critical_set else 'blue'
-            ax.barh(i, act.duration, left=act.ES, height=0.6, color=color, edgecolor='black')
-            ax.text(act.ES + act.duration / 2, i, f"{name} ({act.duration})",
-                    ha='center', va='center', color='white', fontsize=10, fontweight='bold')
-
-        ax.set_yticks(y_pos)
-        ax.set_yticklabels(activity_names)
-        ax.set_xlabel('Time')
-        ax.set_title('Gantt chart')
-        ax.invert_yaxis()
-        ax.grid(True, axis='x', linestyle='--', alpha=0.7)
-
-        from matplotlib.patches import Patch
-        legend_elements = [
-            # Patch(facecolor='blue', edgecolor='black', label='Usual activity'),   
-            Patch(facecolor='red', edgecolor='black', label='Critical path')
-        ]
-        ax.legend(handles=legend_elements, loc='upper right')
-
-        manager = plt.get_current_fig_manager()
-        try:
-            manager.window.showMaximized()
-        except AttributeError:
-            try:
-                manager.window.state('zoomed')
-            except AttributeError:
-                try:
-                    manager.frame.Maximize(True)
-                except AttributeError:
-                    print("Could not maximize window: backend not supported.")
-        manager.window.resizable(False, False)
-
-        plt.tight_layout()
-        plt.show()
+        :param rows: Optional (first, last) range of rows to show; defaults to the first page
+        :param time_window: Optional (start, end) time range to show; defaults to the whole project
+        """
+        chart = GanttChart(self)
+        chart.show(rows, time_window)
+        self._showMaximized(tight=True)
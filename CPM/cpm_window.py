@@ -3,10 +3,17 @@ import tkinter.font as tkFont
 from CPM.gui_paths import relative_to_fonts, relative_to_assets_2, load_custom_font
 from tkinter import ttk, messagebox
 from PIL import Image, ImageTk
-from CPM.cpm import CPM
+from CPM.cpm import CPM, formatTime
 from CPM.table import create_results_table
+from CPM.diagram_view import DiagramView
+from CPM.paths import criticalPaths
+from common.worker import BackgroundSolver
 from tkinter import filedialog
-from CPM.activity import Activity, parseEventSequenceFormat, parsePredecessorformat, reverseEventSequenceFormat
+from CPM.activity import Activity, parseDuration, parseEventSequenceFormat, parsePredecessorformat, reverseEventSequenceFormat
+from itertools import islice
+
+RESULTS_POPUP_LIMIT = 30
+RESULTS_POPUP_PATHS = 5
 
 
 def main_window(window):
@@ -55,8 +62,19 @@ def create_cpm_gui(cpm_window):
     canvas.create_text(92.0, 107.0, anchor="nw",
                        text="Choose the table and enter data into the fields below the table:", fill="#FFFFFF",
                        font=custom_font_4)
+    status_text = canvas.create_text(92.0, 810.0, anchor="nw", text="", fill="#FFFFFF", font=custom_font_4)
+
+    # CPM calculations run on a worker thread so large networks do not block the window
+    solver = BackgroundSolver(cpm_window)
     
 
+    def check_duration(id_val, duration):
+        """
+        Accepts a number or PERT estimates 'optimistic/most likely/pessimistic',
+        with the same checks and messages as loading a CSV file.
+        """
+        parseDuration(duration, id_val)
+
     def load_data_from_table1():
         activities = {}
         if not table1.get_children():
@@ -67,8 +85,7 @@ def create_cpm_gui(cpm_window):
             id_val, duration, events = values
             if not all([id_val, duration, events]):
                 raise ValueError(f"Empty field detected in activity {id_val}")
-            if not duration.isdigit():
-                raise ValueError(f"Duration must be a number in activity {id_val}")
+            check_duration(id_val, duration)
             event_parts = events.split('-')
             if len(event_parts) != 2:
                 raise ValueError(
@@ -77,7 +94,7 @@ def create_cpm_gui(cpm_window):
                 raise ValueError(
                     f"Events for activity {id_val} must contain numbers in 'start-end' format (e.g., '1-2'), not '{events}'")
             activities[id_val] = {
-                'duration': int(duration),
+                'duration': duration,
                 'events': events
             }
         return activities
@@ -92,11 +109,10 @@ def create_cpm_gui(cpm_window):
             id_val, duration, predecessors = values
             if not all([id_val, duration, predecessors]):
                 raise ValueError(f"Empty field detected in activity {id_val}")
-            if not duration.isdigit():
-                raise ValueError(f"Duration must be a number in activity {id_val}")
+            check_duration(id_val, duration)
             pred_list = predecessors.split(',') if predecessors != '-' else []
             activities[id_val] = {
-                'duration': int(duration),
+                'duration': duration,
                 'predecessors': pred_list
             }
 
@@ -104,66 +120,121 @@ def create_cpm_gui(cpm_window):
     
 
     def create_cpm_from_tables():
+        """
+        Reads the active table on the Tk thread and returns an unsolved CPM (or None).
+        """
         if active_table == "table1":
-                loaded_data = load_data_from_table1()
-                if len(loaded_data) == 0:
-                    return False
-                activities = parseEventSequenceFormat(loaded_data)
+            loaded_data = load_data_from_table1()
+            if len(loaded_data) == 0:
+                return None
+            activities = parseEventSequenceFormat(loaded_data)
         else:  # table2
             loaded_data = load_data_from_table2()
             if len(loaded_data) == 0:
-                return False  
+                return None
             activities = parsePredecessorformat(loaded_data)
 
-        cpm = CPM(activities)
-        cpm.calculate()
-        cpm.critical_path = cpm.criticalPath()
-
-        global results
-        results = cpm
-
+        return CPM(activities)
+
+    def solve_cpm(job, cpm):
+        cpm.removeRedundantLinks()
+        cpm.calculate(progress=job.progress)
+        return cpm
+
+    def show_results_popup():
+        lines = ["CPM Results:"]
+        for name, act in islice(results.activities.items(), RESULTS_POPUP_LIMIT):
+            ES, EF, LS, LF, reserve = map(formatTime, (act.ES, act.EF, act.LS, act.LF, act.reserve))
+            lines.append(f"Activity {name}: ES={ES}, EF={EF}, LS={LS}, LF={LF}, Reserve={reserve}")
+        hidden = len(results.activities) - RESULTS_POPUP_LIMIT
+        if hidden > 0:
+            lines.append(f"... and {hidden} more activities (open the results table to browse them)")
+        # Paths need plain finish-to-start links; otherwise list the critical activities
+        paths = criticalPaths(results, RESULTS_POPUP_PATHS + 1) if results.isPlain() else [results.critical_path]
+        lines.append("\nCritical Path:" if len(paths) == 1 else "\nCritical Paths:")
+        for critical_path in paths[:RESULTS_POPUP_PATHS]:
+            if len(critical_path) > RESULTS_POPUP_LIMIT:
+                critical_path = critical_path[:RESULTS_POPUP_LIMIT] + ["..."]
+            lines.append(" -> ".join(critical_path))
+        if len(paths) > RESULTS_POPUP_PATHS:
+            lines.append("...")
+        if results.redundant_links:
+            links = [f"{pred} -> {name}" for pred, name in results.redundant_links[:RESULTS_POPUP_LIMIT]]
+            if len(results.redundant_links) > RESULTS_POPUP_LIMIT:
+                links.append("...")
+            lines.append(f"Redundant links ignored ({len(results.redundant_links)}): " + ", ".join(links))
+        if results.project_variance > 0:
+            sigma = results.project_variance ** 0.5
+            lines.append(f"Expected duration: {results.project_duration:.2f} (σ = {sigma:.2f}), "
+                         f"90% deadline: {results.project_duration + 1.2816 * sigma:.2f}")
+        messagebox.showinfo("CPM Results", "\n".join(lines))
+
+    def set_status(text):
+        canvas.itemconfig(status_text, text=text)
+
+    def on_progress(fraction, message, elapsed):
+        percent = f" {fraction * 100:.0f}%" if fraction is not None else ""
+        set_status(f"{message}...{percent} ({elapsed:.1f} s)")
+
+    def on_error(error):
+        set_status("")
+        if isinstance(error, ValueError):
+            messagebox.showerror("Error", str(error))
+        else:
+            messagebox.showerror("Error", f"An unexpected error occurred: {str(error)}")
 
-    def calculate_cpm():
+    def calculate_cpm(then=None, popup=True):
+        """
+        Solves the entered network on a worker thread; then(results) is called
+        on the Tk thread once the calculation has finished.
+        """
         nonlocal active_table
         if not active_table:
             messagebox.showwarning("Warning", "Please enter data into one of the tables first!")
             return False
-        
-        try:
-            create_cpm_from_tables()
-
-            global results
-
-            result_text = "CPM Results:\n"
-            for name, act in results.activities.items():
-                result_text += (f"Activity {name}: ES={act.ES}, EF={act.EF}, "
-                                f"LS={act.LS}, LF={act.LF}, Reserve={act.reserve}\n")
-            result_text += "\nCritical Path: " + " -> ".join(results.critical_path)
-            messagebox.showinfo("CPM Results", result_text)
-            return True
 
+        try:
+            cpm = create_cpm_from_tables()
         except ValueError as e:
             messagebox.showerror("Error", str(e))
             return False
-        except Exception as e:
-            messagebox.showerror("Error", f"An unexpected error occurred: {str(e)}")
+        if cpm is None:
             return False
 
+        def on_done(solved, elapsed):
+            global results
+            results = solved
+            set_status(f"Solved {len(solved.activities)} activities in {elapsed:.2f} s")
+            if popup:
+                show_results_popup()
+            if then:
+                then(results)
+
+        set_status("Calculating...")
+        solver.submit(solve_cpm, cpm, on_done=on_done, on_error=on_error, on_progress=on_progress,
+                      on_cancel=lambda: set_status("Calculation cancelled"))
+        return True
+
+    # Diagram windows stay open between calculations and are only updated
+    diagram_views = {kind: DiagramView(kind) for kind in DiagramView.KINDS}
+
     def draw_aon():
-        if calculate_cpm() and 'results' in globals():
-            results.drawAON()
+        calculate_cpm(diagram_views["AON"].show)
 
     def draw_aoa():
-        if calculate_cpm() and 'results' in globals():
-            results.drawAOA()
+        def show(solved):
+            if not solved.isPlain():
+                messagebox.showerror("Error", "The AOA diagram supports only finish-to-start links without lag "
+                                              "and no working calendars.")
+            else:
+                diagram_views["AOA"].show(solved)
+        calculate_cpm(show)
 
     def draw_gantt():
-        if calculate_cpm() and 'results' in globals():
-            results.drawGantt()
+        calculate_cpm(diagram_views["GANTT"].show)
 
     def draw_table():
-        if calculate_cpm() and 'results' in globals():
-            create_results_table(cpm_window, results)
+        calculate_cpm(lambda solved: create_results_table(cpm_window, solved))
 
     def add_to_table1():
         nonlocal active_table
@@ -175,6 +246,7 @@ def create_cpm_gui(cpm_window):
         events_data = entry_events1.get()
         if id_data and duration_data and events_data:
             table1.insert("", "end", values=(id_data, duration_data, events_data))
+            solver.invalidate()
             entry_id1.delete(0, "end")
             entry_duration1.delete(0, "end")
             entry_events1.delete(0, "end")
@@ -194,6 +266,7 @@ def create_cpm_gui(cpm_window):
         predecessors_data = entry_predecessors2.get()
         if id_data and duration_data and predecessors_data:
             table2.insert("", "end", values=(id_data, duration_data, predecessors_data))
+            solver.invalidate()
             entry_id2.delete(0, "end")
             entry_duration2.delete(0, "end")
             entry_predecessors2.delete(0, "end")
@@ -207,6 +280,7 @@ def create_cpm_gui(cpm_window):
         selected_item = table1.selection()
         if selected_item:
             table1.delete(selected_item)
+            solver.invalidate()
             if not table1.get_children():
                 nonlocal active_table
                 active_table = None
@@ -219,6 +293,7 @@ def create_cpm_gui(cpm_window):
         selected_item = table2.selection()
         if selected_item:
             table2.delete(selected_item)
+            solver.invalidate()
             if not table2.get_children():
                 nonlocal active_table
                 active_table = None
@@ -233,11 +308,7 @@ def create_cpm_gui(cpm_window):
             filetypes=[("Csv files", "*.csv"), ("All files", "*.*")]
         )
         if file_path:
-            create_cpm_from_tables()
-
-            global results
-
-            results.save_to_csv(file_path)
+            calculate_cpm(lambda solved: solved.save_to_csv(file_path), popup=False)
 
     def ask_load_as_predecessor():
         dialog = Toplevel()
@@ -277,6 +348,7 @@ def create_cpm_gui(cpm_window):
         # clear tables
         nonlocal active_table
         active_table = ""
+        solver.invalidate()
         for c in table1.get_children():
             table1.delete(c)
         for c in table2.get_children():
@@ -293,7 +365,8 @@ def create_cpm_gui(cpm_window):
 
         results.read_from_csv(file_path)
 
-        use_predecessor = ask_load_as_predecessor()
+        # Typed and lagged links can only be shown in the predecessor table
+        use_predecessor = results.hasLinks() or ask_load_as_predecessor()
 
         clear_tables()
 
@@ -303,8 +376,8 @@ def create_cpm_gui(cpm_window):
             # load into table2
             active_table = "table2"
             for activity in results.activities.values():
-                pred = ",".join(activity.predecessors) if len(activity.predecessors) > 0 else "-"
-                table2.insert("", "end", values=(activity.name, activity.duration, pred))
+                pred = ",".join(activity.predecessorTokens()) or "-"
+                table2.insert("", "end", values=(activity.name, activity.durationText(), pred))
         else:
             active_table = "table1"
             data = reverseEventSequenceFormat(results.activities)
@@ -412,5 +485,9 @@ def create_cpm_gui(cpm_window):
     button_remove2 = Button(cpm_window, image=trash_icon, command=remove_from_table2, borderwidth=0)
     button_remove2.place(x=798, y=729, width=38, height=38)
 
+    button_cancel = Button(cpm_window, text="Cancel", command=solver.cancel, font=custom_font_4)
+    button_cancel.place(x=700, y=805, width=100, height=40)
+    cpm_window.bind("<Escape>", lambda event: solver.cancel())
+
     cpm_window.resizable(False, False)
     cpm_window.mainloop()
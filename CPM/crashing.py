@@ -0,0 +1,212 @@
+import networkx as nx
+from CPM.activity import Activity
+from CPM.cpm import CPM, TIME_TOLERANCE, formatTime
+
+
+class TimeCostCurve:
+    """
+    points - [(project duration, extra cost)] from the normal durations to the shortest duration reached
+    steps - [names] of the activities shortened in every step
+    uncrashed - [names] of the crashed activities lengthened back in every step
+    durations - {name: duration} at the last point
+    """
+
+    def __init__(self, points, steps, durations, uncrashed=None):
+        self.points = points
+        self.steps = steps
+        self.durations = durations
+        self.uncrashed = uncrashed if uncrashed is not None else [[] for _ in steps]
+
+    def costFor(self, duration):
+        """
+        Returns the lowest cost among the curve points with a project duration of at most
+        `duration` (None when the project cannot be shortened that much).
+        """
+        feasible = [cost for length, cost in self.points if length <= duration + TIME_TOLERANCE]
+        return min(feasible) if feasible else None
+
+    def print(self) -> None:
+        print("Time-cost curve:")
+        for (length, cost), step, uncrashed in zip(self.points, [None] + self.steps, [None] + self.uncrashed):
+            crashed = f"  (crashed {', '.join(step)}" if step else ""
+            if uncrashed:
+                crashed += f"; lengthened {', '.join(uncrashed)}"
+            print(f"  Duration {formatTime(length)}: cost {cost:.2f}{crashed}{')' if step else ''}")
+
+
+def _costSlopes(cpm, crash):
+    """
+    Returns {name: (crash duration, cost per time unit)} for the crashable activities.
+    """
+    slopes = {}
+    for name, (crash_duration, normal_cost, crash_cost) in crash.items():
+        if name not in cpm.activities:
+            raise ValueError(f"Crash data given for unknown activity {name}")
+        normal_duration = cpm.activities[name].duration
+        if not 0 <= crash_duration <= normal_duration:
+            raise ValueError(f"Crash duration of activity {name} must be between 0 and its duration")
+        if crash_cost < normal_cost:
+            raise ValueError(f"Crash cost of activity {name} must not be lower than its normal cost")
+        if crash_duration < normal_duration:
+            slopes[name] = (crash_duration, (crash_cost - normal_cost) / (normal_duration - crash_duration))
+    return slopes
+
+
+def _maximumFlowWithBounds(arcs, source, sink):
+    """
+    Residual network {(u, v): capacity} of a maximum source-sink flow over
+    arcs [(u, v, lower, upper)] (upper None = infinite), or None when no flow
+    meets the lower bounds.
+
+    A feasible flow is found first as a circulation (Hoffman): lower bounds become
+    node supplies routed from a super source to a super sink.
+    """
+    G = nx.DiGraph()
+    excess = {}
+    for u, v, lower, upper in arcs:
+        if upper is None:
+            G.add_edge(u, v)
+        else:
+            G.add_edge(u, v, capacity=upper - lower)
+        excess[v] = excess.get(v, 0) + lower
+        excess[u] = excess.get(u, 0) - lower
+    G.add_edge(sink, source)
+    required = 0
+    for node, amount in excess.items():
+        if amount > TIME_TOLERANCE:
+            G.add_edge("super source", node, capacity=amount)
+            required += amount
+        elif amount < -TIME_TOLERANCE:
+            G.add_edge(node, "super sink", capacity=-amount)
+    if required:
+        value, flow = nx.maximum_flow(G, "super source", "super sink")
+        if value < required - TIME_TOLERANCE * max(1, required):
+            return None
+    else:
+        flow = {u: {v: 0 for v in G[u]} for u in G}
+
+    residual = {}
+
+    def add(u, v, capacity):
+        if capacity is None or residual.get((u, v), 0) is None:
+            residual[u, v] = None
+        elif capacity > TIME_TOLERANCE:
+            residual[u, v] = residual.get((u, v), 0) + capacity
+
+    for u, v, lower, upper in arcs:
+        used = flow[u][v]
+        add(u, v, None if upper is None else upper - lower - used)
+        add(v, u, used)
+    return residual
+
+
+def _minimumCut(cpm, slopes, normal):
+    """
+    Finds the cheapest way to shorten every critical path by one time unit
+    (Phillips-Dessouky): a minimum cut of the critical subnetwork, where every
+    activity is split into an in/out node. An activity crossed forwards is
+    shortened at its cost slope (infinite when it is at its crash duration); an
+    activity crossed backwards is lengthened back towards its normal duration,
+    which saves its slope. The saving is a lower bound on the activity's flow.
+
+    Returns (names to shorten, names to lengthen), or None when every cut is infinite.
+    """
+    activities = cpm.activities
+    end = cpm.project_duration
+    critical = set(cpm.critical_path)
+
+    arcs = []
+    for name in critical:
+        act = activities[name]
+        crash_duration, slope = slopes.get(name, (act.duration, 0))
+        shorten = slope if act.duration - crash_duration > TIME_TOLERANCE else None
+        lengthen = slope if normal[name] - act.duration > TIME_TOLERANCE else 0
+        arcs.append(((name, "in"), (name, "out"), lengthen, shorten))
+        if abs(act.ES) <= TIME_TOLERANCE:
+            arcs.append(("source", (name, "in"), 0, None))
+        if abs(act.EF - end) <= TIME_TOLERANCE:
+            arcs.append(((name, "out"), "sink", 0, None))
+        for pred in dict.fromkeys(act.predecessors):
+            if pred in critical and abs(activities[pred].EF - act.ES) <= TIME_TOLERANCE:
+                arcs.append(((pred, "out"), (name, "in"), 0, None))
+
+    residual = _maximumFlowWithBounds(arcs, "source", "sink")
+    if residual is None:
+        raise ValueError("Crashing reached a schedule that is not cost-optimal")
+    G = nx.DiGraph()
+    for (u, v), capacity in residual.items():
+        if capacity is None:
+            G.add_edge(u, v)
+        else:
+            G.add_edge(u, v, capacity=capacity)
+    G.add_nodes_from(["source", "sink"])
+    try:
+        _, (reachable, _) = nx.minimum_cut(G, "source", "sink")
+    except nx.NetworkXUnbounded:
+        return None
+    shorten = sorted(name for name in critical if (name, "in") in reachable and (name, "out") not in reachable)
+    lengthen = sorted(name for name in critical if (name, "out") in reachable and (name, "in") not in reachable)
+    return shorten, lengthen
+
+
+def crashProject(cpm, crash, target=None):
+    """
+    Computes the project time-cost curve by repeatedly applying a minimum-cost
+    cut of the critical subnetwork (Phillips-Dessouky). With linear cost slopes
+    every point of the curve is the cheapest schedule for its duration.
+
+    Each step shortens the forward activities of the cut and lengthens back its
+    backward activities by the largest amount that keeps the set of critical
+    activities valid (up to their crash and normal durations and the smallest
+    positive float of an activity or link), then updates the schedule with CPM.recalculate() instead
+    of a full calculation.
+
+    :param cpm: CPM instance with the normal durations (it is not modified)
+    :param crash: {name: (crash duration, normal cost, crash cost)}; other activities cannot be crashed
+    :param target: Optional project duration at which to stop
+    :return: TimeCostCurve with (duration, extra cost) points, crashed and lengthened activities
+             per step and the activity durations at the shortest duration reached
+    """
+    cpm.checkPlain("Project crashing")
+    network = CPM({name: Activity(name, act.duration, list(act.predecessors))
+                   for name, act in cpm.activities.items()})
+    network.calculate()
+    slopes = _costSlopes(network, crash)
+    normal = {name: act.duration for name, act in network.activities.items()}
+    activities = network.activities
+
+    cost = 0.0
+    points = [(network.project_duration, cost)]
+    steps = []
+    uncrashed = []
+    while target is None or network.project_duration > target + TIME_TOLERANCE:
+        cut = _minimumCut(network, slopes, normal)
+        if cut is None:
+            break
+        shorten, lengthen = cut
+
+        step = min([activities[name].duration - slopes[name][0] for name in shorten]
+                   + [normal[name] - activities[name].duration for name in lengthen])
+        # Floats of the activities and of the links: a link between two critical activities may have slack
+        reserves = [act.reserve for act in activities.values()]
+        reserves += [act.LS - activities[pred].EF for act in activities.values() for pred in act.predecessors]
+        reserves = [reserve for reserve in reserves if reserve > TIME_TOLERANCE]
+        if reserves:
+            # A lengthened activity may also lie on a path that is not critical
+            step = min(step, min(reserves) / 2 if lengthen else min(reserves))
+        if target is not None:
+            step = min(step, network.project_duration - target)
+
+        for name in shorten:
+            activities[name].duration -= step
+        for name in lengthen:
+            activities[name].duration += step
+        network.recalculate(shorten + lengthen)
+
+        cost += step * (sum(slopes[name][1] for name in shorten) - sum(slopes[name][1] for name in lengthen))
+        points.append((network.project_duration, cost))
+        steps.append(shorten)
+        uncrashed.append(lengthen)
+
+    durations = {name: act.duration for name, act in activities.items()}
+    return TimeCostCurve(points, steps, durations, uncrashed)
@@ -0,0 +1,161 @@
+"""
+Delay-impact queries over a solved CPM network: if some activities slip,
+when does the project finish and which activities become critical?
+
+A slip only moves the early times of the slipped activities and their
+descendants, and the late times of their ancestors. Every other activity
+keeps its early times, and its late times move by the change of the project
+duration, so its reserve cannot shrink. A batch of scenarios is therefore
+evaluated over the union of these cones only, with one numpy vector (one
+entry per scenario) per activity instead of a full calculate() per scenario.
+"""
+from collections import deque
+import numpy as np
+from CPM.cpm import TIME_TOLERANCE, formatTime
+from CPM.monte_carlo import compileNetwork
+from common.profiling import count, profiled
+
+
+class DelayImpact:
+    """
+    Results of a batch of delay scenarios.
+
+    scenarios - the {name: slip} scenarios in the order they were given
+    project_durations - array with the new project duration of every scenario
+    newly_critical - [[names]] per scenario, critical activities that were not critical before
+    """
+
+    def __init__(self, scenarios, project_durations, newly_critical, original_duration):
+        self.scenarios = scenarios
+        self.project_durations = project_durations
+        self.newly_critical = newly_critical
+        self.original_duration = original_duration
+
+    def projectDelays(self):
+        """
+        Returns the increase of the project duration in every scenario.
+        """
+        return self.project_durations - self.original_duration
+
+    def print(self) -> None:
+        print(f"Delay impact ({len(self.scenarios)} scenarios, project duration {formatTime(self.original_duration)}):")
+        for scenario, duration, names in zip(self.scenarios, self.project_durations, self.newly_critical):
+            slips = ", ".join(f"{name} +{formatTime(slip)}" for name, slip in scenario.items())
+            print(f"  {slips}: duration {formatTime(duration)}"
+                  f" (+{formatTime(duration - self.original_duration)})")
+            if names:
+                print(f"    Newly critical: {', '.join(names)}")
+
+
+class DelayAnalysis:
+    """
+    Answers batches of delay scenarios over a solved CPM network.
+
+    The network is compiled once (topological index arrays with the ES/EF/LF
+    times of the last calculate()), so the CPM must be calculated before and
+    not changed afterwards.
+    """
+
+    def __init__(self, cpm):
+        self.names, self.predecessors, self.successors = compileNetwork(cpm, "Delay analysis")
+        self.index = {name: i for i, name in enumerate(self.names)}
+        activities = [cpm.activities[name] for name in self.names]
+        self.duration = np.array([act.duration for act in activities], dtype=float)
+        self.EF = np.array([act.EF for act in activities], dtype=float)
+        self.LF = np.array([act.LF for act in activities], dtype=float)
+        self.critical = np.array([abs(act.reserve) <= TIME_TOLERANCE for act in activities], dtype=bool)
+        self.project_duration = cpm.project_duration
+
+    def _slips(self, scenarios):
+        """
+        Returns ({activity index: array of its slip in every scenario}, slipped indices).
+        """
+        slips = {}
+        for k, scenario in enumerate(scenarios):
+            for name, slip in scenario.items():
+                if name not in self.index:
+                    raise ValueError(f"Delay given for unknown activity {name}")
+                if slip < 0:
+                    raise ValueError(f"Delay of activity {name} must not be negative")
+                i = self.index[name]
+                if i not in slips:
+                    slips[i] = np.zeros(len(scenarios))
+                slips[i][k] += slip
+        return slips
+
+    @staticmethod
+    def _cone(start, links):
+        """
+        Returns the sorted indices reachable from `start` through `links` (including `start`).
+        """
+        seen = set(start)
+        queue = deque(start)
+        while queue:
+            for j in links[queue.popleft()]:
+                if j not in seen:
+                    seen.add(j)
+                    queue.append(j)
+        return sorted(seen)
+
+    @profiled("cpm.delays")
+    def query(self, scenarios) -> DelayImpact:
+        """
+        Evaluates a batch of scenarios.
+
+        :param scenarios: [{name: slip}], each slip added to the duration of the activity
+        :return: DelayImpact with the new project duration and the newly critical activities per scenario
+        """
+        scenarios = list(scenarios)
+        size = len(scenarios)
+        slips = self._slips(scenarios)
+        if not slips:
+            return DelayImpact(scenarios, np.full(size, float(self.project_duration)),
+                               [[] for _ in scenarios], self.project_duration)
+
+        descendants = self._cone(slips, self.successors)
+        ancestors = self._cone(slips, self.predecessors)
+        count("cpm.delays.cone", len(descendants) + len(ancestors))
+
+        def duration(j):
+            return self.duration[j] + slips[j] if j in slips else self.duration[j]
+
+        # Forward pass over the descendants; other activities keep their EF
+        finish = {}
+        for j in descendants:
+            preds = self.predecessors[j]
+            start = np.zeros(size)
+            for p in preds:
+                np.maximum(start, finish.get(p, self.EF[p]), out=start)
+            finish[j] = start + duration(j)
+        project_durations = np.full(size, float(self.project_duration))
+        for j in descendants:
+            if not self.successors[j]:
+                np.maximum(project_durations, finish[j], out=project_durations)
+        shift = project_durations - self.project_duration
+
+        # Backward pass over the ancestors; other activities keep LF shifted by the change of the end
+        latest = {}
+        for j in reversed(ancestors):
+            lf = project_durations.copy()
+            for s in self.successors[j]:
+                np.minimum(lf, latest.get(s, self.LF[s] + shift) - duration(s), out=lf)
+            latest[j] = lf
+
+        # Only activities in a cone can lose reserve, and only those not critical before are reported
+        candidates = sorted(set(descendants).union(ancestors))
+        candidates = [j for j in candidates if not self.critical[j]]
+        newly_critical = [[] for _ in scenarios]
+        tolerance = TIME_TOLERANCE * (1 + project_durations)
+        for j in candidates:
+            reserve = latest.get(j, self.LF[j] + shift) - finish.get(j, self.EF[j])
+            for k in np.flatnonzero(np.abs(reserve) <= tolerance):
+                newly_critical[k].append(self.names[j])
+        return DelayImpact(scenarios, project_durations, newly_critical, self.project_duration)
+
+
+def delayImpact(cpm, scenarios) -> DelayImpact:
+    """
+    Evaluates delay scenarios [{name: slip}] over a solved CPM network
+    (see DelayAnalysis to answer several batches with one compiled network).
+    """
+    return DelayAnalysis(cpm).query(scenarios)
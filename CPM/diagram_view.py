@@ -0,0 +1,216 @@
+import matplotlib.pyplot as plt
+from CPM.cpm import formatTime
+from CPM.gantt import GanttChart
+
+
+class BlitManager:
+    """
+    Keeps a cached background of the figure and redraws only the animated
+    artists on top of it.
+
+    While a pan/zoom drag is in progress the animated artists are skipped,
+    so every intermediate frame only draws the static part of the diagram.
+    """
+
+    def __init__(self, canvas, animated=()):
+        self.canvas = canvas
+        self.background = None
+        self.suspended = False
+        self._artists = []
+        for artist in animated:
+            self.add(artist)
+        canvas.mpl_connect("draw_event", self._onDraw)
+        canvas.mpl_connect("button_press_event", self._onPress)
+        canvas.mpl_connect("button_release_event", self._onRelease)
+
+    def add(self, artist):
+        artist.set_animated(True)
+        self._artists.append(artist)
+
+    def _onDraw(self, event):
+        # savefig draws the animated artists itself and may use another canvas; nothing to cache
+        if event.canvas.is_saving():
+            return
+        self.background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        self._drawAnimated()
+
+    def _onPress(self, event):
+        toolbar = self.canvas.toolbar
+        if toolbar is not None and toolbar.mode:
+            self.suspended = True
+
+    def _onRelease(self, event):
+        if self.suspended:
+            self.suspended = False
+            self.canvas.draw_idle()
+
+    def _drawAnimated(self):
+        if self.suspended:
+            return
+        figure = self.canvas.figure
+        for artist in self._artists:
+            figure.draw_artist(artist)
+
+    def update(self):
+        """
+        Restores the cached background and blits the animated artists.
+        """
+        if self.background is None:
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self.background)
+        self._drawAnimated()
+        self.canvas.blit(self.canvas.figure.bbox)
+        self.canvas.flush_events()
+
+
+class DiagramView:
+    """
+    A persistent AON, AOA or Gantt window.
+
+    The first show() builds the figure; later calls with the same network
+    structure only touch the labels, bar extents and critical-path colors
+    that changed since the previous calculation. Text changes are blitted,
+    color changes trigger one regular redraw.
+    """
+
+    KINDS = ("AON", "AOA", "GANTT")
+
+    def __init__(self, kind):
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown diagram kind: {kind}")
+        self.kind = kind
+        self.fig = None
+        self.ax = None
+        self.artists = None
+        self.blit = None
+        self.gantt = None
+        self.structure = None
+        self.snapshot = {}
+        self.critical = set()
+
+    def isOpen(self) -> bool:
+        return self.fig is not None and plt.fignum_exists(self.fig.number)
+
+    @staticmethod
+    def _structure(cpm):
+        return tuple((name, tuple(act.enteredPredecessors())) for name, act in cpm.activities.items())
+
+    @staticmethod
+    def _snapshot(cpm):
+        return {name: (act.ES, act.EF, act.LS, act.LF, act.reserve, act.duration)
+                for name, act in cpm.activities.items()}
+
+    def show(self, cpm) -> None:
+        """
+        Shows the diagram for a calculated CPM, reusing the open window when
+        the activities and their predecessors did not change.
+        """
+        structure = self._structure(cpm)
+        if self.isOpen() and structure == self.structure:
+            self.update(cpm)
+        else:
+            if self.isOpen():
+                plt.close(self.fig)
+            self._build(cpm)
+            cpm._showMaximized(tight=self.kind == "GANTT", block=False)
+
+        self.structure = structure
+        self.snapshot = self._snapshot(cpm)
+        self.critical = set(cpm.critical_path)
+
+    def _build(self, cpm):
+        if self.kind == "AON":
+            self.fig, self.ax, self.artists = cpm.buildAON()
+            animated = self.artists['inside'].values()
+        elif self.kind == "AOA":
+            self.fig, self.ax, self.artists = cpm.buildAOA()
+            animated = list(self.artists['events'].values()) + list(self.artists['labels'].values())
+        else:
+            self.gantt = GanttChart(cpm)
+            self.fig, self.ax = self.gantt.show()
+            animated = ()
+        self.blit = BlitManager(self.fig.canvas, animated)
+
+    def update(self, cpm) -> None:
+        """
+        Applies a recalculation to the open window.
+        """
+        snapshot = self._snapshot(cpm)
+        changed = [name for name, values in snapshot.items() if self.snapshot.get(name) != values]
+        critical = set(cpm.critical_path)
+        flipped = critical ^ self.critical
+
+        if self.kind == "GANTT":
+            if self.gantt.update(cpm):
+                self.fig.canvas.draw_idle()
+            return
+
+        if self.kind == "AON":
+            recolor = self._updateAON(cpm, changed, flipped, critical)
+        else:
+            recolor = self._updateAOA(cpm, changed, flipped, critical)
+
+        if recolor:
+            self.fig.canvas.draw_idle()
+        elif changed:
+            self.blit.update()
+
+    def _updateAON(self, cpm, changed, flipped, critical) -> bool:
+        inside = self.artists['inside']
+        for name in changed:
+            inside[name].set_text(cpm.aonLabel(name))
+        if changed:
+            inside["END"].set_text(cpm.aonLabel("END"))
+
+        if not flipped:
+            return False
+
+        for name in flipped:
+            color = 'salmon' if name in critical else 'lightblue'
+            self.artists['boxes'][name].set_facecolor(color)
+
+        critical_edges = set(cpm.aonCriticalEdges())
+        for edge, patch in self.artists['edges'].items():
+            is_critical = edge in critical_edges
+            patch.set_color('red' if is_critical else 'gray')
+            patch.set_linewidth(2.5 if is_critical else 2)
+        return True
+
+    def _updateAOA(self, cpm, changed, flipped, critical) -> bool:
+        G = self.artists['graph']
+        activity_edges = self.artists['activity_edges']
+        for name in changed:
+            act = cpm.activities[name]
+            start, end = activity_edges[name]
+            G.edges[start, end]['duration'] = act.duration
+            G.edges[start, end]['reserve'] = act.reserve
+            label = self.artists['labels'].get(name)
+            if label is not None:
+                label.set_text(f"{name}\nDur: {formatTime(act.duration)}")
+
+        if changed:
+            cpm._aoaEventLabels(G, self.artists['topo_order'])
+            for event, text in self.artists['events'].items():
+                label = G.nodes[event]['label']
+                if text.get_text() != label:
+                    text.set_text(label)
+
+        if not flipped:
+            return False
+
+        for name in flipped:
+            is_critical = name in critical
+            for patch in self.artists['edges'].get(name, []):
+                patch.set_color('red' if is_critical else 'black')
+                patch.set_linewidth(2.5 if is_critical else 1.5)
+
+        critical_nodes = set()
+        for name in critical:
+            critical_nodes.update(activity_edges[name])
+        colors = self.artists['node_colors']
+        for i, node in enumerate(G.nodes()):
+            if colors[i] in ('salmon', 'lightblue'):
+                colors[i] = 'salmon' if node in critical_nodes else 'lightblue'
+        self.artists['nodes'].set_facecolor(colors)
+        return True
@@ -0,0 +1,273 @@
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib.collections import PolyCollection
+from matplotlib.patches import Patch
+from matplotlib.ticker import FuncFormatter
+from CPM.calendars import toDatetime
+from common.profiling import profiled
+
+BAR_HEIGHT = 0.6
+PAGE_SIZE = 40                # rows shown per page in the windowed view
+LABEL_MIN_WIDTH_PX = 45       # bars narrower than this get no text label
+LABEL_MIN_ROW_PX = 12         # rows lower than this get no text label / tick
+MAX_BAR_ROWS = 5000           # above this many rows in view, draw the density image
+DENSITY_BINS = (400, 800)     # (rows, time) resolution of the overview image
+
+CRITICAL_COLOR = 'red'
+REGULAR_COLOR = 'blue'
+
+
+class GanttChart:
+    """
+    Gantt chart renderer for large schedules.
+
+    All bars of the visible window are drawn as a single PolyCollection,
+    labels are only added where the bar is wide enough on screen, and
+    views with too many rows are rendered as an aggregated density image.
+    """
+
+    def __init__(self, cpm):
+        self.ax = None
+        self._artists = []
+        self._bars = None
+        self._labels = {}
+        self._rows = np.arange(0)
+        self._load(cpm)
+
+    def _load(self, cpm):
+        self.names = list(cpm.activities.keys())
+        self.start_date = cpm.start_date
+        critical_set = set(cpm.critical_path)
+
+        count = len(self.names)
+        self.start = np.empty(count, dtype=float)
+        self.duration = np.empty(count, dtype=float)
+        self.critical = np.empty(count, dtype=bool)
+        self.finish = np.empty(count, dtype=float)
+        for i, name in enumerate(self.names):
+            act = cpm.activities[name]
+            self.start[i] = act.ES
+            self.duration[i] = act.duration
+            self.critical[i] = name in critical_set
+            # EF differs from ES + duration when a working calendar skips days off
+            self.finish[i] = act.EF
+
+        self.project_end = float(self.finish.max()) if count else 0.0
+
+    def rowCount(self):
+        return len(self.names)
+
+    def _window(self, rows, time_window):
+        first, last = rows if rows else (0, self.rowCount())
+        first = max(0, int(first))
+        last = min(self.rowCount(), int(last))
+        t0, t1 = time_window if time_window else (0.0, self.project_end)
+        return first, last, float(t0), float(t1)
+
+    def _clearArtists(self):
+        for artist in self._artists:
+            artist.remove()
+        self._artists = []
+        self._bars = None
+        self._labels = {}
+        self._rows = np.arange(0)
+
+    def _barVerts(self, rows):
+        x0 = self.start[rows]
+        x1 = self.finish[rows]
+        y0 = rows - BAR_HEIGHT / 2
+        y1 = rows + BAR_HEIGHT / 2
+        return np.stack([
+            np.column_stack([x0, y0]),
+            np.column_stack([x0, y1]),
+            np.column_stack([x1, y1]),
+            np.column_stack([x1, y0]),
+        ], axis=1)
+
+    def _barColors(self, rows):
+        return np.where(self.critical[rows], CRITICAL_COLOR, REGULAR_COLOR)
+
+    def update(self, cpm):
+        """
+        Reloads the schedule from a recalculated CPM with the same activities and
+        moves only the bars and labels whose extents or critical flag changed.
+        Returns True if anything on screen changed.
+        """
+        if list(cpm.activities.keys()) != self.names:
+            raise ValueError("Activities changed; the chart has to be drawn again.")
+        old_start, old_duration, old_finish, old_critical = self.start, self.duration, self.finish, self.critical
+        self._load(cpm)
+
+        changed = ((self.start != old_start) | (self.duration != old_duration)
+                   | (self.finish != old_finish) | (self.critical != old_critical))
+        if self._bars is None or not changed[self._rows].any():
+            return False
+
+        self._bars.set_verts(self._barVerts(self._rows))
+        self._bars.set_facecolor(self._barColors(self._rows))
+        for i in self._rows[changed[self._rows]]:
+            text = self._labels.get(i)
+            if text is not None:
+                text.set_position(((self.start[i] + self.finish[i]) / 2, i))
+                text.set_text(f"{self.names[i]} ({self.duration[i]:g})")
+        return True
+
+    @profiled("cpm.draw.gantt")
+    def draw(self, ax, rows=None, time_window=None):
+        """
+        Draws rows [first, last) clipped to the (t0, t1) time window.
+        Returns the artists that were added to the axes.
+        """
+        self.ax = ax
+        self._clearArtists()
+        first, last, t0, t1 = self._window(rows, time_window)
+
+        if last - first > MAX_BAR_ROWS:
+            self.drawDensity(ax, (first, last), (t0, t1))
+        else:
+            self._drawBars(ax, first, last, t0, t1)
+
+        ax.set_xlim(t0, t1)
+        ax.set_ylim(last - 0.5, first - 0.5)
+        self._timeAxis(ax)
+        return self._artists
+
+    def _timeAxis(self, ax):
+        """
+        Labels the time axis with dates when the project has a start date.
+        """
+        if self.start_date is not None:
+            ax.xaxis.set_major_formatter(FuncFormatter(
+                lambda t, _: toDatetime(self.start_date, t).strftime("%Y-%m-%d")))
+
+    def _drawBars(self, ax, first, last, t0, t1):
+        rows = np.arange(first, last)
+        visible = (self.finish[first:last] >= t0) & (self.start[first:last] <= t1)
+        rows = rows[visible]
+
+        bars = PolyCollection(self._barVerts(rows), facecolors=self._barColors(rows),
+                              edgecolors='black', linewidths=0.5)
+        ax.add_collection(bars)
+        self._artists.append(bars)
+        self._bars = bars
+        self._rows = rows
+
+        # Pixel size of one time unit and one row in the current axes
+        bbox = ax.get_window_extent()
+        px_per_time = bbox.width / max(t1 - t0, 1e-9)
+        px_per_row = bbox.height / max(last - first, 1)
+
+        if px_per_row >= LABEL_MIN_ROW_PX:
+            ax.set_yticks(range(first, last))
+            ax.set_yticklabels(self.names[first:last])
+            labelled = rows[(self.finish[rows] - self.start[rows]) * px_per_time >= LABEL_MIN_WIDTH_PX]
+            for i in labelled:
+                text = ax.text((self.start[i] + self.finish[i]) / 2, i,
+                               f"{self.names[i]} ({self.duration[i]:g})",
+                               ha='center', va='center', color='white', fontsize=10, fontweight='bold',
+                               clip_on=True)
+                self._artists.append(text)
+                self._labels[i] = text
+        else:
+            ax.set_yticks([])
+
+    def drawDensity(self, ax, rows=None, time_window=None, bins=DENSITY_BINS):
+        """
+        Draws an overview image: each pixel holds the number of activities
+        running in that (row range, time range) cell.
+        """
+        self.ax = ax
+        self._clearArtists()
+        first, last, t0, t1 = self._window(rows, time_window)
+        row_bins = max(1, min(bins[0], last - first))
+        time_bins = max(1, bins[1])
+
+        idx = np.arange(first, last)
+        row_bin = ((idx - first) * row_bins) // max(last - first, 1)
+        scale = time_bins / max(t1 - t0, 1e-9)
+        start_bin = np.clip(np.floor((self.start[idx] - t0) * scale), 0, time_bins).astype(int)
+        end_bin = np.clip(np.ceil((self.finish[idx] - t0) * scale), 0, time_bins).astype(int)
+
+        # Difference array: +1 where an activity starts, -1 where it ends
+        delta = np.zeros((row_bins, time_bins + 1), dtype=np.int64)
+        np.add.at(delta, (row_bin, start_bin), 1)
+        np.add.at(delta, (row_bin, end_bin), -1)
+        density = np.cumsum(delta, axis=1)[:, :time_bins]
+
+        image = ax.imshow(density, aspect='auto', interpolation='nearest', cmap='Blues',
+                          extent=(t0, t1, last - 0.5, first - 0.5))
+        self._artists.append(image)
+        self._timeAxis(ax)
+        ax.set_yticks([])
+        ax.set_xlim(t0, t1)
+        ax.set_ylim(last - 0.5, first - 0.5)
+        return self._artists
+
+    def show(self, rows=None, time_window=None):
+        """
+        Opens an interactive window.
+        PageUp/PageDown move between pages, Home/End jump to the first/last page,
+        'o' toggles the density overview; pan/zoom re-renders only the visible rows.
+        """
+        fig, ax = plt.subplots(figsize=(12, 8))
+        state = {'first': rows[0] if rows else 0, 'time': time_window, 'overview': False, 'limits': None}
+        page = (rows[1] - rows[0]) if rows else PAGE_SIZE
+
+        def render(view_rows, view_time):
+            self.draw(ax, view_rows, view_time)
+            state['limits'] = (ax.get_xlim(), ax.get_ylim())
+            fig.canvas.draw_idle()
+
+        def render_page():
+            first = min(max(0, state['first']), max(0, self.rowCount() - page))
+            state['first'] = first
+            render((first, first + page), state['time'])
+
+        def on_key(event):
+            if event.key == 'pagedown':
+                state['first'] += page
+            elif event.key == 'pageup':
+                state['first'] -= page
+            elif event.key == 'home':
+                state['first'] = 0
+            elif event.key == 'end':
+                state['first'] = self.rowCount()
+            elif event.key == 'o':
+                state['overview'] = not state['overview']
+                if state['overview']:
+                    self.drawDensity(ax, None, state['time'])
+                    fig.canvas.draw_idle()
+                    return
+            else:
+                return
+            state['overview'] = False
+            render_page()
+
+        def on_release(event):
+            # Pan/zoom finished: re-cull the bars to the new view limits
+            if event.inaxes is not ax or state['overview']:
+                return
+            # A plain click leaves the limits as they were drawn
+            if (ax.get_xlim(), ax.get_ylim()) == state['limits']:
+                return
+            y_low, y_high = sorted(ax.get_ylim())
+            state['time'] = ax.get_xlim()
+            render((int(np.floor(y_low + 0.5)), int(np.ceil(y_high + 0.5))), ax.get_xlim())
+
+        fig.canvas.mpl_connect('key_press_event', on_key)
+        fig.canvas.mpl_connect('button_release_event', on_release)
+
+        if self.rowCount() > MAX_BAR_ROWS and not rows:
+            state['overview'] = True
+            self.drawDensity(ax, None, time_window)
+        else:
+            render((state['first'], state['first'] + page), time_window)
+
+        ax.set_xlabel('Date' if self.start_date is not None else 'Time')
+        ax.set_title('Gantt chart (PageUp/PageDown: pages, o: overview)')
+        ax.grid(True, axis='x', linestyle='--', alpha=0.7)
+        legend_elements = [
+            Patch(facecolor=CRITICAL_COLOR, edgecolor='black', label='Critical path')
+        ]
+        ax.legend(handles=legend_elements, loc='upper right')
+        return fig, ax
@@ -0,0 +1,101 @@
+import random
+from CPM.activity import Activity
+
+
+def _activities(durations, predecessors):
+    return {f"a{i}": Activity(f"a{i}", durations[i], [f"a{p}" for p in predecessors[i]])
+            for i in range(len(durations))}
+
+
+def randomDag(count, seed=None, window=50, max_predecessors=3, max_duration=9):
+    """
+    Generates a random network of `count` activities named a0, a1, ...
+    Each activity takes up to `max_predecessors` predecessors among the
+    `window` activities generated just before it, so the network is a DAG
+    whose depth grows with its size.
+
+    :return: Dictionary of Activity objects
+    """
+    rng = random.Random(seed)
+    durations, predecessors = [], []
+    for i in range(count):
+        candidates = range(max(0, i - window), i)
+        predecessors.append(rng.sample(candidates, min(i, rng.randint(0, max_predecessors))))
+        durations.append(rng.randint(1, max_duration))
+    return _activities(durations, predecessors)
+
+
+def layeredNetwork(count, seed=None, layers=None, max_predecessors=3, max_duration=9):
+    """
+    Generates a network whose activities are split into `layers` layers
+    (default about sqrt(count)); every activity outside the first layer has
+    1..max_predecessors predecessors in the previous layer.
+    """
+    rng = random.Random(seed)
+    layers = max(1, min(count, layers or int(count ** 0.5)))
+    bounds = [count * k // layers for k in range(layers + 1)]
+    durations, predecessors = [], []
+    for k in range(layers):
+        previous = range(bounds[k - 1], bounds[k]) if k else range(0)
+        for _ in range(bounds[k], bounds[k + 1]):
+            predecessors.append(rng.sample(previous, min(len(previous), rng.randint(1, max_predecessors))))
+            durations.append(rng.randint(1, max_duration))
+    return _activities(durations, predecessors)
+
+
+def seriesParallelNetwork(count, seed=None, parallel=0.5, max_duration=9):
+    """
+    Generates a series-parallel network by repeatedly expanding a random
+    activity either in series (a new activity placed between it and its
+    successors) or in parallel (a new activity with the same predecessors
+    and successors).
+    """
+    rng = random.Random(seed)
+    durations = [rng.randint(1, max_duration) for _ in range(count)]
+    predecessors = [[] for _ in range(count)]
+    successors = [[] for _ in range(count)]
+    for new in range(1, count):
+        old = rng.randrange(new)
+        if rng.random() < parallel:
+            predecessors[new] = list(predecessors[old])
+            for pred in predecessors[old]:
+                successors[pred].append(new)
+            successors[new] = list(successors[old])
+            for succ in successors[old]:
+                predecessors[succ].append(new)
+        else:
+            predecessors[new] = [old]
+            successors[new] = successors[old]
+            successors[old] = [new]
+            for succ in successors[new]:
+                preds = predecessors[succ]
+                preds[preds.index(old)] = new
+    return _activities(durations, predecessors)
+
+
+NETWORKS = {
+    "layered": layeredNetwork,
+    "random": randomDag,
+    "series-parallel": seriesParallelNetwork,
+}
+
+
+def generateNetwork(kind, count, seed=None, **options):
+    """
+    Generates a network of the given kind (one of NETWORKS).
+    """
+    if kind not in NETWORKS:
+        raise ValueError(f"Unknown network kind '{kind}', expected one of {', '.join(NETWORKS)}")
+    return NETWORKS[kind](count, seed=seed, **options)
+
+
+def assignResources(activities, capacities, seed=None, max_demand=3, usage=0.6):
+    """
+    Gives every activity a random demand (1..max_demand, at most the capacity)
+    for each resource in `capacities` with probability `usage`.
+    """
+    rng = random.Random(seed)
+    for act in activities.values():
+        act.resources = {resource: rng.randint(1, min(max_demand, capacity))
+                         for resource, capacity in capacities.items() if rng.random() < usage}
+    return activities
@@ -0,0 +1,78 @@
+from collections import deque
+from CPM.validation import validateNetwork
+
+
+def topologicalOrder(predecessors):
+    """
+    Kahn's algorithm over {name: [predecessor names]}.
+    Returns the names in topological order; cyclic parts and activities after
+    unknown predecessors are left out.
+    """
+    successors = {name: [] for name in predecessors}
+    in_degree = {}
+    for name, preds in predecessors.items():
+        in_degree[name] = len(preds)
+        for pred in preds:
+            if pred in successors:
+                successors[pred].append(name)
+
+    queue = deque(name for name, degree in in_degree.items() if degree == 0)
+    order = []
+    while queue:
+        current = queue.popleft()
+        order.append(current)
+        for name in successors[current]:
+            in_degree[name] -= 1
+            if in_degree[name] == 0:
+                queue.append(name)
+    return order
+
+
+def transitiveReduction(predecessors, order=None):
+    """
+    Removes every predecessor link implied by a longer path (A->C when A->B->C exists).
+
+    Ancestor sets are integer bitsets indexed by topological position. A node's
+    bitset is freed once its last successor has been processed, so memory
+    follows the width of the network rather than its size.
+
+    :param predecessors: {name: [predecessor names]} of a DAG
+    :param order: Optional topological order of the names
+    :return: ({name: [kept predecessors]}, [(predecessor, name) redundant links])
+    """
+    if order is None:
+        order = topologicalOrder(predecessors)
+    if len(order) != len(predecessors):
+        validateNetwork(predecessors)
+    position = {name: i for i, name in enumerate(order)}
+
+    remaining = dict.fromkeys(order, 0)
+    for preds in predecessors.values():
+        for pred in set(preds):
+            remaining[pred] += 1
+
+    ancestors = {}
+    reduced = {}
+    redundant = []
+    for name in order:
+        preds = sorted(set(predecessors[name]), key=position.__getitem__, reverse=True)
+        covered = 0
+        kept = []
+        # A predecessor is redundant when it is an ancestor of a later predecessor
+        for pred in preds:
+            if covered >> position[pred] & 1:
+                redundant.append((pred, name))
+            else:
+                kept.append(pred)
+                covered |= ancestors[pred]
+        for pred in kept:
+            covered |= 1 << position[pred]
+        for pred in preds:
+            remaining[pred] -= 1
+            if remaining[pred] == 0:
+                del ancestors[pred]
+        if remaining[name]:
+            ancestors[name] = covered
+        kept = set(kept)
+        reduced[name] = [pred for pred in dict.fromkeys(predecessors[name]) if pred in kept]
+    return reduced, redundant
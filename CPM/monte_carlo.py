@@ -0,0 +1,191 @@
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+DISTRIBUTIONS = ("fixed", "triangular", "pert", "lognormal")
+CRITICAL_TOLERANCE = 1e-6
+
+
+def compileNetwork(cpm, feature="Monte Carlo analysis"):
+    """
+    Converts a CPM network into index arrays in topological order.
+    Returns (names, predecessor index lists, successor index lists).
+    """
+    cpm.checkPlain(feature)
+    order = cpm.topologicalSort()
+    if len(order) != len(cpm.activities):
+        cpm.validate()
+    index = {name: i for i, name in enumerate(order)}
+    predecessors = [[index[p] for p in cpm.activities[name].predecessors] for name in order]
+    successors = [[] for _ in order]
+    for i, preds in enumerate(predecessors):
+        for p in preds:
+            successors[p].append(i)
+    return order, predecessors, successors
+
+
+def _durationTable(cpm, order, distributions):
+    """
+    Groups activities by distribution kind: {kind: (indices, params array)}.
+    Activities without a distribution use their PERT estimates or keep their deterministic duration.
+    """
+    groups = {kind: ([], []) for kind in DISTRIBUTIONS}
+    for i, name in enumerate(order):
+        spec = distributions.get(name)
+        if spec is None:
+            act = cpm.activities[name]
+            spec = ("pert", *act.estimates) if act.estimates else ("fixed", act.duration)
+        kind, *params = spec
+        if kind not in DISTRIBUTIONS:
+            raise ValueError(f"Unknown distribution '{kind}' for activity {name}")
+        if kind == "pert" and len(params) == 3:
+            params.append(4.0)
+        groups[kind][0].append(i)
+        groups[kind][1].append(params)
+    return {kind: (np.array(idx, dtype=np.int64), np.array(params, dtype=float))
+            for kind, (idx, params) in groups.items() if idx}
+
+
+def _sampleDurations(rng, table, activities, samples):
+    """
+    Returns an (activities, samples) float32 matrix of sampled durations.
+    """
+    durations = np.empty((activities, samples), dtype=np.float32)
+    for kind, (idx, params) in table.items():
+        shape = (len(idx), samples)
+        params = params.astype(np.float32)
+        if kind == "fixed":
+            durations[idx] = params[:, :1]
+        elif kind == "triangular":
+            # Inverse CDF of the triangular distribution
+            a, m, b = (params[:, k:k + 1] for k in range(3))
+            width = b - a
+            c = np.divide(m - a, width, out=np.zeros_like(width), where=width > 0)
+            u = rng.random(shape, dtype=np.float32)
+            low = u < c
+            x = np.where(low, u, 1 - u)
+            x *= np.where(low, width * (m - a), width * (b - m))
+            np.sqrt(x, out=x)
+            durations[idx] = np.where(low, a + x, b - x)
+        elif kind == "pert":
+            # Beta(alpha, beta) sampled as X / (X + Y) with X, Y gamma distributed
+            a, m, b, lam = (params[:, k:k + 1] for k in range(4))
+            width = b - a
+            safe = np.where(width > 0, width, 1.0)
+            x = rng.standard_gamma(np.broadcast_to(1 + lam * (m - a) / safe, shape), dtype=np.float32)
+            y = rng.standard_gamma(np.broadcast_to(1 + lam * (b - m) / safe, shape), dtype=np.float32)
+            y += x
+            x /= y
+            x *= width
+            x += a
+            durations[idx] = x
+        else:  # lognormal given by the mean and standard deviation of the duration
+            mean, std = params[:, :1], params[:, 1:2]
+            sigma2 = np.log1p((std / mean) ** 2)
+            durations[idx] = rng.lognormal(np.log(mean) - sigma2 / 2, np.sqrt(sigma2), shape)
+    return durations
+
+
+def _simulate(predecessors, successors, table, samples, seed, chunk_size):
+    """
+    Runs `samples` forward/backward passes in chunks.
+    Returns (completion times, number of samples in which each activity was critical).
+    """
+    rng = np.random.default_rng(seed)
+    count = len(predecessors)
+    completion = np.empty(samples, dtype=np.float32)
+    critical = np.zeros(count, dtype=np.int64)
+
+    for start in range(0, samples, chunk_size):
+        size = min(chunk_size, samples - start)
+        # One row per activity keeps every per-activity vector contiguous
+        durations = _sampleDurations(rng, table, count, size)
+        finish = np.empty_like(durations)
+        for j in range(count):
+            preds = predecessors[j]
+            if not preds:
+                finish[j] = durations[j]
+            else:
+                es = finish[preds[0]].copy()
+                for p in preds[1:]:
+                    np.maximum(es, finish[p], out=es)
+                np.add(es, durations[j], out=finish[j])
+
+        project_end = finish.max(axis=0)
+        completion[start:start + size] = project_end
+
+        latest = np.empty_like(durations)
+        for j in range(count - 1, -1, -1):
+            succs = successors[j]
+            if not succs:
+                latest[j] = project_end
+            else:
+                lf = latest[succs[0]] - durations[succs[0]]
+                for s in succs[1:]:
+                    np.minimum(lf, latest[s] - durations[s], out=lf)
+                latest[j] = lf
+            critical[j] += np.count_nonzero(latest[j] - finish[j] <= CRITICAL_TOLERANCE * (1 + project_end))
+
+    return completion, critical
+
+
+class MonteCarloResult:
+    def __init__(self, names, completion, critical_counts):
+        self.names = names
+        self.completion = np.sort(completion)
+        self.samples = len(completion)
+        self.criticality = {name: critical_counts[i] / self.samples for i, name in enumerate(names)}
+
+    def quantiles(self, q=(0.1, 0.5, 0.8, 0.9, 0.95)):
+        """
+        Returns {q: completion time} for the requested quantiles.
+        """
+        values = np.quantile(self.completion, q)
+        return dict(zip(q, values.tolist()))
+
+    def probability(self, deadlines):
+        """
+        Probability of finishing by each deadline (scalar or array of deadlines).
+        """
+        deadlines = np.asarray(deadlines, dtype=float)
+        return np.searchsorted(self.completion, deadlines, side="right") / self.samples
+
+    def mostCritical(self, count=10):
+        return sorted(self.criticality.items(), key=lambda item: item[1], reverse=True)[:count]
+
+    def print(self) -> None:
+        print(f"Monte Carlo results ({self.samples} samples):")
+        for q, value in self.quantiles().items():
+            print(f"  P{int(q * 100)}: {value:.2f}")
+        print("Criticality index:")
+        for name, index in self.mostCritical():
+            print(f"  {name}: {index:.3f}")
+
+
+def runMonteCarlo(cpm, distributions, samples=100000, seed=None, chunk_size=2000, workers=1):
+    """
+    Schedule risk analysis of a CPM network.
+
+    :param distributions: {name: ("triangular", a, m, b) | ("pert", a, m, b[, lambda])
+                           | ("lognormal", mean, std) | ("fixed", d)}; activities that are
+                           not listed use their PERT estimates or keep their deterministic duration
+    :param samples: Number of simulated projects
+    :param seed: Seed for reproducible results
+    :param chunk_size: Samples evaluated at once (bounds memory to about 3 * activities * chunk_size floats)
+    :param workers: Number of processes to split the samples across
+    :return: MonteCarloResult with completion-time quantiles and criticality indexes
+    """
+    order, predecessors, successors = compileNetwork(cpm)
+    table = _durationTable(cpm, order, distributions)
+
+    seeds = np.random.SeedSequence(seed).spawn(max(1, workers))
+    if workers <= 1:
+        completion, critical = _simulate(predecessors, successors, table, samples, seeds[0], chunk_size)
+        return MonteCarloResult(order, completion, critical)
+
+    shares = [samples // workers + (1 if k < samples % workers else 0) for k in range(workers)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        parts = list(pool.map(_simulate, [predecessors] * workers, [successors] * workers, [table] * workers,
+                              shares, seeds, [chunk_size] * workers))
+    completion = np.concatenate([part[0] for part in parts])
+    critical = sum(part[1] for part in parts)
+    return MonteCarloResult(order, completion, critical)
@@ -0,0 +1,118 @@
+"""
+Path analysis of a calculated CPM network: critical paths, the k longest
+paths and the near-critical paths within a float threshold.
+
+A path runs from an activity without predecessors to an activity without
+successors. The backward pass already gives, for every activity, the longest
+remaining time after it (project duration - LF), so a partial path has an
+exact bound on the length of its best completion. Paths are therefore
+produced best-first from a priority queue in order of decreasing length,
+and the queue is trimmed to the number of paths still needed, so the work
+depends on the number of paths requested, not on the number of paths in
+the network (which can be exponential).
+"""
+import heapq
+from CPM.cpm import TIME_TOLERANCE, formatTime
+from common.profiling import count, profiled
+
+
+def _pathsByLength(cpm, minimum=None, limit=None):
+    """
+    Yields (length, [names]) for the paths of the calculated network in order of
+    decreasing length, down to `minimum` and at most `limit` paths.
+    """
+    cpm.checkPlain("Path analysis")
+    if limit is not None and limit <= 0:
+        return
+    activities = cpm.activities
+    successors = cpm.successors()
+    end = cpm.project_duration
+
+    # Entries: (-bound, tie, length, name, (name, previous link)); paths are linked lists
+    queue = []
+    tie = 0
+    for name, act in activities.items():
+        if not act.predecessors:
+            bound = act.duration + end - act.LF
+            if minimum is None or bound >= minimum - TIME_TOLERANCE:
+                queue.append((-bound, tie, act.duration, name, (name, None)))
+                tie += 1
+    heapq.heapify(queue)
+
+    found = 0
+    expanded = 0
+    while queue:
+        _, _, length, name, link = heapq.heappop(queue)
+        if not successors[name]:
+            path = []
+            while link:
+                path.append(link[0])
+                link = link[1]
+            yield length, path[::-1]
+            found += 1
+            if limit is not None and found == limit:
+                break
+            continue
+        expanded += 1
+        for succ in dict.fromkeys(successors[name]):
+            act = activities[succ]
+            succ_length = length + act.duration
+            bound = succ_length + end - act.LF
+            if minimum is None or bound >= minimum - TIME_TOLERANCE:
+                heapq.heappush(queue, (-bound, tie, succ_length, succ, (succ, link)))
+                tie += 1
+        # Every entry completes to a different path, so only the best `needed` entries can matter
+        if limit is not None:
+            needed = limit - found
+            if len(queue) > 2 * needed:
+                queue = heapq.nsmallest(needed, queue)
+    count("cpm.paths.expanded", expanded)
+
+
+@profiled("cpm.paths")
+def longestPaths(cpm, k) -> list:
+    """
+    Returns the k longest paths as [(length, [names])], longest first.
+    """
+    return list(_pathsByLength(cpm, limit=k))
+
+
+@profiled("cpm.paths")
+def nearCriticalPaths(cpm, threshold, limit=None) -> list:
+    """
+    Returns the paths at most `threshold` shorter than the project as [(length, [names])],
+    longest first; `limit` caps the number of paths returned.
+    """
+    return list(_pathsByLength(cpm, cpm.project_duration - threshold, limit))
+
+
+def criticalPaths(cpm, limit=None) -> list:
+    """
+    Returns the critical paths as lists of names (one per parallel critical branch).
+    """
+    return [path for _, path in nearCriticalPaths(cpm, 0, limit)]
+
+
+def countCriticalPaths(cpm) -> int:
+    """
+    Counts the critical paths by dynamic programming over the topological order.
+    """
+    cpm.checkPlain("Path analysis")
+    activities = cpm.activities
+    critical = set(cpm.critical_path)
+    ways = {}
+    for name in cpm.topologicalSort():
+        if name not in critical:
+            continue
+        act = activities[name]
+        ways[name] = 1 if not act.predecessors else sum(
+            ways.get(pred, 0) for pred in dict.fromkeys(act.predecessors)
+            if abs(activities[pred].EF - act.ES) <= TIME_TOLERANCE)
+    successors = cpm.successors()
+    return sum(ways[name] for name in critical
+               if not successors[name] and abs(activities[name].EF - cpm.project_duration) <= TIME_TOLERANCE)
+
+
+def printPaths(paths) -> None:
+    for length, path in paths:
+        print(f"{formatTime(length):>8}: " + " -> ".join(path))
@@ -0,0 +1,293 @@
+"""
+Programs of sub-projects linked by milestones, scheduled without flattening
+them into one network.
+
+Each sub-project is solved once into a boundary summary: for every input
+(an activity that waits for another sub-project) and for the sub-project
+start, the longest time to the finish of every output (an activity another
+sub-project waits for, and the end of the sub-project). The program is then
+scheduled over the boundary points only, combining the summaries with the
+links between sub-projects.
+
+Summaries are cached by a hash of the sub-project's content and boundary,
+taken at every schedule() (cheap next to solving), so after a change only the
+changed sub-project is solved again, together with the program level. The
+cache keeps the most recently used summaries only.
+"""
+import hashlib
+import math
+from collections import OrderedDict
+import numpy as np
+from CPM.activity import Activity
+from CPM.cpm import CPM, TIME_TOLERANCE, formatTime
+from CPM.graph import topologicalOrder
+from CPM.monte_carlo import compileNetwork
+from common.profiling import count, profiled, stage
+from CPM.validation import validateNetwork
+
+CACHE_SIZE = 256
+
+
+class SubNetworkSummary:
+    """
+    Boundary-to-boundary longest paths of a sub-project.
+
+    inputs - names of the activities held back by links from other sub-projects
+    outputs - names of the activities other sub-projects wait for; the last
+              column of the matrix is the end of the sub-project
+    matrix - (len(inputs) + 1, len(outputs) + 1) array: the longest time from the
+             start of each input (last row: from the sub-project start) to the
+             finish of each output, -inf where no path exists
+    after - (len(outputs), len(outputs) + 1) array: the longest time from the finish
+            of each output to the finish of each output, used for the late times
+    """
+
+    def __init__(self, inputs, outputs, matrix, after):
+        self.inputs = inputs
+        self.outputs = outputs
+        self.matrix = matrix
+        self.after = after
+
+    @property
+    def duration(self):
+        """
+        Duration of the sub-project on its own (no waiting for other sub-projects).
+        """
+        return float(self.matrix[-1, -1])
+
+
+def contentKey(activities) -> str:
+    """
+    Content hash of a sub-project: durations and links of its activities.
+    """
+    content = [(name, act.duration, act.predecessors, act.links, act.calendar) for name, act in activities.items()]
+    return hashlib.sha256(repr(content).encode()).hexdigest()
+
+
+@profiled("cpm.program.summarize")
+def summarize(activities, inputs, outputs) -> SubNetworkSummary:
+    """
+    Solves a sub-project {name: Activity} into its boundary summary with one forward
+    pass that carries a vector per activity: one entry per input, one per output
+    and one for the sub-project start.
+    """
+    names, predecessors, _ = compileNetwork(CPM(activities), "Program scheduling")
+    index = {name: i for i, name in enumerate(names)}
+    inputs = sorted(inputs, key=index.__getitem__)
+    outputs = sorted(outputs, key=index.__getitem__)
+    sources = inputs + outputs
+    rows = {}
+    for k, name in enumerate(sources):
+        rows.setdefault(index[name], []).append(k)
+
+    finish = np.empty((len(names), len(sources) + 1))
+    end = np.full(len(sources) + 1, -math.inf)
+    end[-1] = 0
+    for j, name in enumerate(names):
+        start = np.full(len(sources) + 1, -math.inf)
+        start[-1] = 0  # every activity may start with the sub-project
+        for p in predecessors[j]:
+            np.maximum(start, finish[p], out=start)
+        for k in rows.get(j, ()):
+            start[k] = max(start[k], 0)
+        np.add(start, activities[name].duration, out=finish[j])
+        np.maximum(end, finish[j], out=end)
+
+    paths = np.column_stack([finish[index[name]] for name in outputs] + [end])
+    matrix = np.vstack([paths[:len(inputs)], paths[-1:]])
+    durations = np.array([activities[name].duration for name in outputs], dtype=float)
+    after = paths[len(inputs):-1] - durations[:, None]
+    return SubNetworkSummary(inputs, outputs, matrix, after)
+
+
+class ProgramSchedule:
+    """
+    Results of Program.schedule().
+
+    duration - finish of the whole program
+    ready - {(sub-project, input): earliest start allowed by the links}
+    finish - {(sub-project, output): earliest finish}
+    end - {sub-project: earliest finish of the whole sub-project}
+    reserve - {(sub-project, output): total float of the output activity}
+    link_float - {((sub-project, activity), (sub-project, activity)): delay of the source
+                 finish the link absorbs without delaying the program}
+    """
+
+    def __init__(self, duration, ready, finish, end, reserve, link_float):
+        self.duration = duration
+        self.ready = ready
+        self.finish = finish
+        self.end = end
+        self.reserve = reserve
+        self.link_float = link_float
+        self.critical_links = [link for link, slack in link_float.items() if slack <= TIME_TOLERANCE]
+
+    def print(self) -> None:
+        print(f"Program duration: {formatTime(self.duration)}")
+        for name, end in self.end.items():
+            print(f"  Sub-project {name}: finishes at {formatTime(end)}")
+        if self.critical_links:
+            print("Critical links: " + ", ".join(f"{a}.{b} -> {c}.{d}" for (a, b), (c, d) in self.critical_links))
+
+
+class Program:
+    """
+    Sub-projects {name: {activity name: Activity}} linked finish-to-start between
+    activities of different sub-projects.
+
+    :param cache: Optional {(content hash, inputs, outputs): SubNetworkSummary}, may be shared between programs
+    :param cache_size: Number of summaries the cache keeps (at least those of the current sub-projects)
+    """
+
+    def __init__(self, cache=None, cache_size=CACHE_SIZE):
+        self.subprojects = {}
+        self.links = []
+        self.cache = cache if cache is not None else OrderedDict()
+        self.cache_size = cache_size
+
+    def addSubProject(self, name, activities) -> None:
+        """
+        Adds or replaces a sub-project; its links are kept.
+        """
+        self.subprojects[name] = activities
+
+    def link(self, source, source_activity, target, target_activity) -> None:
+        """
+        Makes `target_activity` of sub-project `target` wait for the finish of
+        `source_activity` of sub-project `source`.
+        """
+        for sub, activity in ((source, source_activity), (target, target_activity)):
+            if sub not in self.subprojects:
+                raise ValueError(f"Sub-project {sub} is not in the program")
+            if activity not in self.subprojects[sub]:
+                raise ValueError(f"Activity {activity} is not in sub-project {sub}")
+        self.links.append(((source, source_activity), (target, target_activity)))
+
+    def _boundaries(self):
+        """
+        Returns {sub-project: (inputs, outputs)} named by the links.
+        """
+        boundaries = {name: (set(), set()) for name in self.subprojects}
+        for (source, source_activity), (target, target_activity) in self.links:
+            boundaries[source][1].add(source_activity)
+            boundaries[target][0].add(target_activity)
+        return boundaries
+
+    def summaries(self) -> dict:
+        """
+        Returns {sub-project: SubNetworkSummary}, solving only the sub-projects
+        whose content or boundary is not in the cache.
+        """
+        summaries = {}
+        solved = 0
+        for name, (inputs, outputs) in self._boundaries().items():
+            key = (contentKey(self.subprojects[name]), tuple(sorted(inputs)), tuple(sorted(outputs)))
+            # Re-inserting moves the summary to the end: the cache is ordered from least recently used
+            summary = self.cache.pop(key, None)
+            if summary is None:
+                summary = summarize(self.subprojects[name], inputs, outputs)
+                solved += 1
+            self.cache[key] = summary
+            summaries[name] = summary
+        while len(self.cache) > max(self.cache_size, len(summaries)):
+            del self.cache[next(iter(self.cache))]
+        count("cpm.program.solved", solved)
+        return summaries
+
+    @profiled("cpm.program")
+    def schedule(self) -> ProgramSchedule:
+        """
+        Schedules the program over the boundary points of the sub-projects.
+        """
+        summaries = self.summaries()
+
+        with stage("cpm.program.combine"):
+            # Boundary points are named for the error messages of validateNetwork
+            def start_point(sub, activity):
+                return f"{sub}.{activity} (start)"
+
+            def finish_point(sub, activity):
+                return f"{sub}.{activity} (finish)" if activity is not None else f"{sub} (end)"
+
+            predecessors = {}
+            inputs = {}   # start point: (sub-project, matrix row)
+            outputs = {}  # finish point: (sub-project, matrix column)
+            for sub, summary in summaries.items():
+                for k, activity in enumerate(summary.inputs):
+                    point = start_point(sub, activity)
+                    predecessors[point] = []
+                    inputs[point] = (sub, k)
+                for c, activity in enumerate(summary.outputs + [None]):
+                    point = finish_point(sub, activity)
+                    reachable = np.flatnonzero(summary.matrix[:-1, c] > -math.inf)
+                    predecessors[point] = [start_point(sub, summary.inputs[k]) for k in reachable]
+                    # Outputs before this one only order the backward pass
+                    earlier = np.flatnonzero(summary.after[:, c] > -math.inf)
+                    predecessors[point] += [finish_point(sub, summary.outputs[k]) for k in earlier if k != c]
+                    outputs[point] = (sub, c)
+            for source, target in self.links:
+                predecessors[start_point(*target)].append(finish_point(*source))
+
+            order = topologicalOrder(predecessors)
+            if len(order) != len(predecessors):
+                validateNetwork(predecessors)
+            successors = {point: [] for point in predecessors}
+            for point, preds in predecessors.items():
+                for pred in preds:
+                    successors[pred].append(point)
+
+            # Forward: an output finishes after the longest path from the start or from any input
+            time = {}
+            for point in order:
+                if point in outputs:
+                    sub, c = outputs[point]
+                    matrix = summaries[sub].matrix
+                    time[point] = float(max([matrix[-1, c]] + [time[p] + matrix[inputs[p][1], c]
+                                                               for p in predecessors[point] if p in inputs]))
+                else:
+                    time[point] = max((time[p] for p in predecessors[point]), default=0)
+            duration = max((time[finish_point(sub, None)] for sub in summaries), default=0)
+
+            # Backward: latest finish of the outputs and latest ready time of the inputs
+            latest = {}
+            for point in reversed(order):
+                if point in outputs:
+                    sub, c = outputs[point]
+                    after = summaries[sub].after
+                    latest[point] = min((latest[s] - after[c, outputs[s][1]] if s in outputs else latest[s]
+                                         for s in successors[point]), default=duration)
+                else:
+                    sub, k = inputs[point]
+                    matrix = summaries[sub].matrix
+                    latest[point] = min((latest[s] - matrix[k, outputs[s][1]] for s in successors[point]),
+                                        default=duration)
+
+        ready = {}
+        finish = {}
+        reserve = {}
+        end = {}
+        for sub, summary in summaries.items():
+            for activity in summary.inputs:
+                ready[(sub, activity)] = time[start_point(sub, activity)]
+            for activity in summary.outputs:
+                point = finish_point(sub, activity)
+                finish[(sub, activity)] = time[point]
+                reserve[(sub, activity)] = latest[point] - time[point]
+            end[sub] = time[finish_point(sub, None)]
+        link_float = {(source, target): latest[start_point(*target)] - finish[source]
+                      for source, target in self.links}
+        return ProgramSchedule(duration, ready, finish, end, reserve, link_float)
+
+    def flatten(self) -> dict:
+        """
+        Returns the program as one {"sub-project.activity": Activity} network (for checks
+        against a single CPM).
+        """
+        activities = {}
+        for sub, subproject in self.subprojects.items():
+            for name, act in subproject.items():
+                activities[f"{sub}.{name}"] = Activity(f"{sub}.{name}", act.duration,
+                                                       [f"{sub}.{pred}" for pred in act.predecessors])
+        for (source, source_activity), (target, target_activity) in self.links:
+            activities[f"{target}.{target_activity}"].predecessors.append(f"{source}.{source_activity}")
+        return activities
@@ -0,0 +1,105 @@
+"""
+Progress feed: a text file to which progress from the field is appended,
+one tab-separated update per line
+
+    name    actual start    actual finish    percent complete
+
+Empty or missing fields keep their current value. Times are schedule times
+(days from the start) or, when the project has a start date, ISO dates such
+as 2026-10-19 or 2026-10-19 12:00. A line "@status<TAB>time" moves the status
+time and lines starting with '#' are comments.
+
+ProgressFeed follows the file: each poll() reads only the lines appended
+since the previous poll and applies all of them as one CPM.statusUpdate(),
+so a burst of updates costs a single incremental re-forecast.
+"""
+import os
+from datetime import datetime
+from CPM.activity import parseNumber
+from CPM.calendars import toTime
+from common.profiling import count, profiled
+
+STATUS_KEYWORD = "@status"
+PROGRESS_FIELDS = ("actual_start", "actual_finish", "percent_complete")
+
+
+def parseTime(text, start_date=None):
+    """
+    Parses a time field: a number of days, or an ISO date when the project has a start date.
+    Returns None for an empty field.
+    """
+    text = text.strip()
+    if not text:
+        return None
+    try:
+        return parseNumber(text)
+    except ValueError:
+        if start_date is None:
+            raise ValueError(f"Time '{text}' must be a number when the project has no start date") from None
+        return toTime(start_date, datetime.fromisoformat(text))
+
+
+def parseProgressLines(lines, start_date=None):
+    """
+    Input: Lines of a progress feed (see the module description).
+    Output: ({name: {field: value}} with the latest value of every field, status time or None).
+    """
+    updates = {}
+    status_time = None
+    for number, line in enumerate(lines, 1):
+        line = line.rstrip("\r\n")
+        if not line.strip() or line.startswith("#"):
+            continue
+        fields = line.split("\t")
+        try:
+            if fields[0].strip() == STATUS_KEYWORD:
+                if len(fields) < 2 or parseTime(fields[1], start_date) is None:
+                    raise ValueError("Status line must give the status time")
+                status_time = parseTime(fields[1], start_date)
+                continue
+            name = fields[0].strip()
+            values = [parseTime(fields[1], start_date) if len(fields) > 1 else None,
+                      parseTime(fields[2], start_date) if len(fields) > 2 else None,
+                      parseNumber(fields[3]) if len(fields) > 3 and fields[3].strip() else None]
+        except ValueError as error:
+            raise ValueError(f"Line {number} of the progress feed: {error}") from None
+        update = updates.setdefault(name, {})
+        for field, value in zip(PROGRESS_FIELDS, values):
+            if value is not None:
+                update[field] = value
+    return updates, status_time
+
+
+class ProgressFeed:
+    """
+    Follows a progress feed file and applies the new lines to a calculated CPM.
+    """
+
+    def __init__(self, cpm, filename):
+        self.cpm = cpm
+        self.filename = filename
+        self.offset = 0
+
+    @profiled("cpm.progressFeed")
+    def poll(self) -> int:
+        """
+        Applies the complete lines appended since the previous poll.
+        Returns the number of activities updated.
+        """
+        # A file shorter than what was already read has been truncated or replaced
+        if os.path.getsize(self.filename) < self.offset:
+            self.offset = 0
+        with open(self.filename, mode='rb') as file:
+            file.seek(self.offset)
+            data = file.read()
+        # A line still being written is left for the next poll
+        end = data.rfind(b"\n") + 1
+        if not end:
+            return 0
+        # Lines are consumed even when they are rejected, so one bad line cannot stall the feed
+        self.offset += end
+        updates, status_time = parseProgressLines(data[:end].decode("utf-8").splitlines(), self.cpm.start_date)
+        if updates or status_time is not None:
+            self.cpm.statusUpdate(updates, status_time)
+        count("cpm.progressFeed.lines", data.count(b"\n", 0, end))
+        return len(updates)
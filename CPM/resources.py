@@ -0,0 +1,189 @@
+import heapq
+import math
+
+PRIORITY_RULES = {
+    "LS": lambda act: (act.LS, act.ES),
+    "LF": lambda act: (act.LF, act.ES),
+    "reserve": lambda act: (act.reserve, act.ES),
+    "ES": lambda act: (act.ES, act.LS),
+}
+
+
+class ResourceProfile:
+    """
+    Usage of one resource over discrete time slots, stored in a segment tree
+    with range add and range min/max. Booking an activity takes O(log horizon)
+    steps; the earliest feasible start is found in one left-to-right scan that
+    skips whole blocks of slots which are entirely free or entirely overloaded.
+    """
+
+    def __init__(self, capacity, horizon):
+        self.capacity = capacity
+        self.size = 1
+        while self.size < max(1, horizon):
+            self.size *= 2
+        # peak/lowest[node] = max/min usage in the node's range, excluding the additions of its ancestors
+        self.peak = [0] * (2 * self.size)
+        self.lowest = [0] * (2 * self.size)
+        self.added = [0] * (2 * self.size)
+
+    def add(self, start, end, amount) -> None:
+        """
+        Adds `amount` of usage to the slots [start, end).
+        """
+        self._add(1, 0, self.size, start, end, amount)
+
+    def _add(self, node, low, high, start, end, amount):
+        if end <= low or high <= start:
+            return
+        if start <= low and high <= end:
+            self.peak[node] += amount
+            self.lowest[node] += amount
+            self.added[node] += amount
+            return
+        mid = (low + high) // 2
+        left, right = 2 * node, 2 * node + 1
+        self._add(left, low, mid, start, end, amount)
+        self._add(right, mid, high, start, end, amount)
+        self.peak[node] = max(self.peak[left], self.peak[right]) + self.added[node]
+        self.lowest[node] = min(self.lowest[left], self.lowest[right]) + self.added[node]
+
+    def maxUsage(self, start, end):
+        """
+        Returns the highest usage in the slots [start, end).
+        """
+        return self._max(1, 0, self.size, start, end)
+
+    def _max(self, node, low, high, start, end):
+        if end <= low or high <= start:
+            return 0
+        if start <= low and high <= end:
+            return self.peak[node]
+        mid = (low + high) // 2
+        return max(self._max(2 * node, low, mid, start, end),
+                   self._max(2 * node + 1, mid, high, start, end)) + self.added[node]
+
+    def earliestStart(self, start, duration, demand) -> int:
+        """
+        Returns the first slot >= start from which `demand` fits for `duration` slots.
+        """
+        limit = self.capacity - demand
+        peak, lowest, added = self.peak, self.lowest, self.added
+        run_start = None
+        # (node, low, high, usage added by the node's ancestors), visited left to right
+        stack = [(1, 0, self.size, 0)]
+        while stack:
+            node, low, high, offset = stack.pop()
+            if high <= start:
+                continue
+            if low >= start:
+                if peak[node] + offset <= limit:
+                    if run_start is None:
+                        run_start = low
+                    if high - run_start >= duration:
+                        return run_start
+                    continue
+                if lowest[node] + offset > limit:
+                    run_start = None
+                    continue
+            mid = (low + high) // 2
+            offset += added[node]
+            stack.append((2 * node + 1, mid, high, offset))
+            stack.append((2 * node, low, mid, offset))
+        return self.size if run_start is None else run_start
+
+    def usage(self, end=None):
+        """
+        Returns the usage of every slot in [0, end) as a list.
+        """
+        end = self.size if end is None else end
+        return [self.maxUsage(t, t + 1) for t in range(end)]
+
+
+class ResourceSchedule:
+    def __init__(self, start, finish, profiles):
+        self.start = start
+        self.finish = finish
+        self.profiles = profiles
+        self.makespan = max(finish.values(), default=0)
+
+    def delays(self, cpm) -> dict:
+        """
+        Returns {name: start - ES} for activities delayed by the resource limits.
+        """
+        return {name: self.start[name] - act.ES for name, act in cpm.activities.items()
+                if self.start[name] > act.ES}
+
+    def print(self) -> None:
+        print(f"Resource-constrained schedule (makespan {self.makespan}):")
+        for name, start in self.start.items():
+            print(f"  Activity {name}: start={start}, finish={self.finish[name]}")
+
+
+def scheduleResources(cpm, capacities, rule="LS"):
+    """
+    Serial schedule-generation scheme: activities become eligible once all of
+    their predecessors are scheduled, the eligible activity with the best
+    priority (taken from ES/LS/LF/reserve of CPM.calculate) is placed at the
+    earliest time its predecessors and every resource profile allow.
+
+    :param cpm: CPM instance; calculate() is run first so the priorities use current times
+    :param capacities: {resource: units available in every time slot}
+    :param rule: Priority rule, one of PRIORITY_RULES ("LS", "LF", "reserve", "ES")
+    :return: ResourceSchedule; fractional durations occupy whole slots (rounded up)
+    """
+    if rule not in PRIORITY_RULES:
+        raise ValueError(f"Unknown priority rule '{rule}', expected one of {', '.join(PRIORITY_RULES)}")
+    cpm.checkPlain("Resource scheduling")
+    activities = cpm.activities
+    # Durations or links may have changed since the last calculation
+    cpm.calculate()
+
+    slots = {name: math.ceil(act.duration) for name, act in activities.items()}
+    for name, act in activities.items():
+        for resource, demand in act.resources.items():
+            if resource not in capacities:
+                raise ValueError(f"Activity {name} uses resource '{resource}' without a capacity")
+            if demand > capacities[resource]:
+                raise ValueError(f"Activity {name} needs {demand} of '{resource}', "
+                                 f"only {capacities[resource]} available")
+
+    horizon = sum(slots.values()) + 1
+    profiles = {resource: ResourceProfile(capacity, horizon) for resource, capacity in capacities.items()}
+
+    priority = PRIORITY_RULES[rule]
+    successors = cpm.successors()
+    waiting = {name: len(act.predecessors) for name, act in activities.items()}
+    order = {name: i for i, name in enumerate(activities)}
+    eligible = [(priority(act), order[name], name) for name, act in activities.items() if not act.predecessors]
+    heapq.heapify(eligible)
+
+    start, finish = {}, {}
+    while eligible:
+        _, _, name = heapq.heappop(eligible)
+        act = activities[name]
+        duration = slots[name]
+        t = max((finish[p] for p in act.predecessors), default=0)
+
+        demands = [(profiles[r], d) for r, d in act.resources.items() if d > 0]
+        if duration > 0 and demands:
+            moved = True
+            while moved:
+                moved = False
+                for profile, demand in demands:
+                    t_fit = profile.earliestStart(t, duration, demand)
+                    if t_fit != t:
+                        t, moved = t_fit, True
+            for profile, demand in demands:
+                profile.add(t, t + duration, demand)
+
+        start[name] = t
+        finish[name] = t + duration
+        for succ in successors[name]:
+            waiting[succ] -= 1
+            if waiting[succ] == 0:
+                heapq.heappush(eligible, (priority(activities[succ]), order[succ], succ))
+
+    if len(start) != len(activities):
+        cpm.validate()
+    return ResourceSchedule(start, finish, profiles)
@@ -1,7 +1,10 @@
-from tkinter import Toplevel, ttk, Label, Button
+from tkinter import Toplevel, ttk, Label, Button, Entry, Frame
 from tkinter import messagebox
 from openpyxl import Workbook
 from tkinter.filedialog import asksaveasfilename
+from CPM.cpm import formatTime
+
+CRITICAL_LABEL_ITEMS = 5      # critical activities named at each end of the summary label
 
 
 def align_window(window):
@@ -14,6 +17,52 @@ def align_window(window):
     window.geometry(f"{window_width}x{window_height}+{int(x_coordinate)}+{int(y_coordinate)}")
 
 
+def export_results(file_path, results, include_gantt=False, include_float=False):
+    """
+    Writes CPM results to an .xlsx file with openpyxl's write-only mode.
+    Rows are generated and flushed one at a time, so memory use does not grow
+    with the size of the network.
+
+    :param include_gantt: Also add a "Gantt" sheet with start/finish of every bar
+    :param include_float: Also add a "Float" sheet with the float of every activity
+
+    With a project start date the ES/EF/LS/LF dates are added as datetimes.
+    """
+    workbook = Workbook(write_only=True)
+    critical = set(results.critical_path)
+    activities = results.activities
+    dated = results.start_date is not None
+
+    sheet = workbook.create_sheet("CPM Results")
+    sheet.append(["Activity", "ES", "EF", "LS", "LF", "Reserve", "Free Float", "Interfering Float",
+                  "Independent Float"] + (["ES Date", "EF Date", "LS Date", "LF Date"] if dated else []))
+    for name, activity in activities.items():
+        times = [activity.ES, activity.EF, activity.LS, activity.LF]
+        sheet.append([name, *times, activity.reserve, activity.free_float, activity.interfering_float,
+                      activity.independent_float] + ([results.date(t) for t in times] if dated else []))
+    # One critical activity per row: a joined path would exceed Excel's cell limit on large networks
+    sheet.append([])
+    sheet.append(["Critical Path"])
+    for name in results.critical_path:
+        sheet.append([name])
+
+    if include_gantt:
+        sheet = workbook.create_sheet("Gantt")
+        sheet.append(["Activity", "Start", "Finish", "Duration", "Critical"])
+        for name, activity in activities.items():
+            start, finish = (results.date(activity.ES), results.date(activity.EF)) if dated else (activity.ES, activity.EF)
+            sheet.append([name, start, finish, activity.duration, name in critical])
+
+    if include_float:
+        sheet = workbook.create_sheet("Float")
+        sheet.append(["Activity", "Total Float", "Free Float", "Interfering Float", "Independent Float", "Critical"])
+        for name, activity in activities.items():
+            sheet.append([name, activity.reserve, activity.free_float, activity.interfering_float,
+                          activity.independent_float, name in critical])
+
+    workbook.save(file_path)
+
+
 def save_to_excel(table_window, results):
     if not results or not results.activities:
         messagebox.showerror("Error", "No results available to save!")
@@ -27,21 +76,10 @@ def save_to_excel(table_window, results):
     if not file_path:
         return
 
-    workbook = Workbook()
-    sheet = workbook.active
-    sheet.title = "CPM Results"
-
-    headers = ["Activity", "ES", "EF", "LS", "LF", "Reserve"]
-    sheet.append(headers)
-
-    for name, activity in results.activities.items():
-        sheet.append([name, activity.ES, activity.EF, activity.LS, activity.LF, activity.reserve])
-
-    sheet.append([])
-    sheet.append(["Critical Path", " -> ".join(results.critical_path)])
+    extra_sheets = messagebox.askyesno("Export", "Also export the Gantt and float data to extra sheets?")
 
     try:
-        workbook.save(file_path)
+        export_results(file_path, results, include_gantt=extra_sheets, include_float=extra_sheets)
         messagebox.showinfo("Success", f"Results saved successfully to {file_path}")
     except Exception as e:
         messagebox.showerror("Error", f"Failed to save file: {e}")
@@ -49,6 +87,173 @@ def save_to_excel(table_window, results):
     table_window.destroy()
 
 
+class ResultsTable:
+    """
+    Virtualized CPM results view.
+
+    Only VISIBLE_ROWS Treeview items exist at any time; scrolling just rewrites
+    their values. Rows are prepared in chunks with after() so the window stays
+    responsive while large results load, and the view can be sorted by any
+    column and filtered by critical flag, maximum reserve and ES range.
+    """
+
+    COLUMNS = ("Activity", "ES", "EF", "LS", "LF", "Reserve", "Free", "Interfering", "Independent")
+    VISIBLE_ROWS = 15
+    CHUNK_SIZE = 2000
+
+    def __init__(self, parent, results):
+        self.results = results
+        self.rows = []
+        self.view = []
+        self.offset = 0
+        self.sort_column = None
+        self.sort_reverse = False
+        self.filter = ("All", None, None, None)
+        self.critical = set(results.critical_path)
+        self._names = iter(list(results.activities.keys()))
+
+        frame = Frame(parent, bg="#4076FF")
+        frame.pack(pady=10, padx=10, fill="both", expand=True)
+
+        filters = Frame(frame, bg="#4076FF")
+        filters.pack(fill="x")
+        Label(filters, text="Show:", bg="#4076FF", fg="white").pack(side="left")
+        self.critical_filter = ttk.Combobox(filters, values=("All", "Critical", "Non-critical"),
+                                            state="readonly", width=12)
+        self.critical_filter.current(0)
+        self.critical_filter.pack(side="left", padx=5)
+        Label(filters, text="Max reserve:", bg="#4076FF", fg="white").pack(side="left")
+        self.reserve_entry = Entry(filters, width=6)
+        self.reserve_entry.pack(side="left", padx=5)
+        Label(filters, text="ES from:", bg="#4076FF", fg="white").pack(side="left")
+        self.es_from_entry = Entry(filters, width=6)
+        self.es_from_entry.pack(side="left", padx=5)
+        Label(filters, text="to:", bg="#4076FF", fg="white").pack(side="left")
+        self.es_to_entry = Entry(filters, width=6)
+        self.es_to_entry.pack(side="left", padx=5)
+        Button(filters, text="Apply", command=self.applyFilter).pack(side="left", padx=5)
+        self.status = Label(filters, text="", bg="#4076FF", fg="white")
+        self.status.pack(side="right")
+
+        body = Frame(frame, bg="#4076FF")
+        body.pack(fill="both", expand=True, pady=5)
+        self.tree = ttk.Treeview(body, columns=self.COLUMNS, show="headings", height=self.VISIBLE_ROWS)
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.scrollbar = ttk.Scrollbar(body, orient="vertical", command=self.onScroll)
+        self.scrollbar.pack(side="right", fill="y")
+
+        for col in self.COLUMNS:
+            self.tree.heading(col, text=col, command=lambda c=col: self.sortBy(c))
+            self.tree.column(col, anchor="center", width=85)
+
+        self.items = [self.tree.insert("", "end", values=()) for _ in range(self.VISIBLE_ROWS)]
+        self.tree.bind("<MouseWheel>", self.onWheel)
+        self.tree.bind("<Button-4>", lambda e: self.scrollTo(self.offset - 3))
+        self.tree.bind("<Button-5>", lambda e: self.scrollTo(self.offset + 3))
+
+        self.tree.after_idle(self._loadChunk)
+
+    def _loadChunk(self):
+        activities = self.results.activities
+        first = len(self.rows)
+        for _ in range(self.CHUNK_SIZE):
+            name = next(self._names, None)
+            if name is None:
+                break
+            act = activities[name]
+            self.rows.append((name, act.ES, act.EF, act.LS, act.LF, act.reserve,
+                              act.free_float, act.interfering_float, act.independent_float))
+
+        # The active filter and sort also apply to the rows loaded while the user browses
+        self.view = self._sorted(self.view + self._matching(range(first, len(self.rows))))
+        if len(self.rows) < len(activities):
+            self.status.config(text=f"Loading {len(self.rows)}/{len(activities)}...")
+            self.tree.after(1, self._loadChunk)
+        else:
+            self.status.config(text=f"{len(self.view)} of {len(self.rows)} activities")
+        self.scrollTo(self.offset)
+
+    def _matching(self, indices) -> list:
+        """
+        Returns the row indices that pass the active filter.
+        """
+        mode, max_reserve, es_from, es_to = self.filter
+        view = []
+        for i in indices:
+            row = self.rows[i]
+            is_critical = row[0] in self.critical
+            if mode == "Critical" and not is_critical:
+                continue
+            if mode == "Non-critical" and is_critical:
+                continue
+            if max_reserve is not None and row[5] > max_reserve:
+                continue
+            if es_from is not None and row[1] < es_from:
+                continue
+            if es_to is not None and row[1] > es_to:
+                continue
+            view.append(i)
+        return view
+
+    def _sorted(self, view) -> list:
+        if self.sort_column is not None:
+            key = self.COLUMNS.index(self.sort_column)
+            view.sort(key=lambda i: self.rows[i][key], reverse=self.sort_reverse)
+        return view
+
+    def applyFilter(self):
+        try:
+            max_reserve = float(self.reserve_entry.get()) if self.reserve_entry.get() else None
+            es_from = float(self.es_from_entry.get()) if self.es_from_entry.get() else None
+            es_to = float(self.es_to_entry.get()) if self.es_to_entry.get() else None
+        except ValueError:
+            messagebox.showerror("Error", "Filter values must be numbers!")
+            return
+
+        self.filter = (self.critical_filter.get(), max_reserve, es_from, es_to)
+        self.view = self._sorted(self._matching(range(len(self.rows))))
+        loading = len(self.rows) < len(self.results.activities)
+        if not loading:
+            self.status.config(text=f"{len(self.view)} of {len(self.rows)} activities")
+        self.scrollTo(0)
+
+
+    def sortBy(self, column):
+        if self.sort_column == column:
+            self.sort_reverse = not self.sort_reverse
+        else:
+            self.sort_column = column
+            self.sort_reverse = False
+        self.applyFilter()
+
+    def scrollTo(self, offset):
+        max_offset = max(0, len(self.view) - self.VISIBLE_ROWS)
+        self.offset = min(max(0, int(offset)), max_offset)
+        self.refresh()
+
+    def onScroll(self, action, value, unit=None):
+        if action == "moveto":
+            self.scrollTo(float(value) * len(self.view))
+        elif action == "scroll":
+            step = self.VISIBLE_ROWS if unit == "pages" else 1
+            self.scrollTo(self.offset + int(value) * step)
+
+    def onWheel(self, event):
+        self.scrollTo(self.offset - int(event.delta / 120) * 3)
+
+    def refresh(self):
+        for position, item in enumerate(self.items):
+            index = self.offset + position
+            if index < len(self.view):
+                name, *times = self.rows[self.view[index]]
+                self.tree.item(item, values=(name, *map(formatTime, times)))
+            else:
+                self.tree.item(item, values=())
+
+        total = max(len(self.view), 1)
+        self.scrollbar.set(self.offset / total, min(1.0, (self.offset + self.VISIBLE_ROWS) / total))
+
+
 def create_results_table(parent_window, results):
     if not results or not results.activities:
         messagebox.showerror("Error", "No results available to display!")
@@ -64,25 +269,20 @@ def create_results_table(parent_window, results):
         table_window, text="CPM Results", font=("Arial", 16, "bold"), bg="#4076FF", fg="white"
     ).pack(pady=10)
 
-    columns = ("Activity", "ES", "EF", "LS", "LF", "Reserve")
-    tree = ttk.Treeview(table_window, columns=columns, show="headings", height=15)
-    tree.pack(pady=10, padx=10, fill="both", expand=True)
-
-    for col in columns:
-        tree.heading(col, text=col)
-        tree.column(col, anchor="center", width=100)
-
-    for name, activity in results.activities.items():
-        tree.insert(
-            "", "end", values=(name, activity.ES, activity.EF, activity.LS, activity.LF, activity.reserve)
-        )
+    ResultsTable(table_window, results)
 
+    # Long critical paths are summarized; "Show: Critical" in the table lists all of them
+    critical_path = results.critical_path
+    if len(critical_path) > 2 * CRITICAL_LABEL_ITEMS:
+        critical_path = (critical_path[:CRITICAL_LABEL_ITEMS] + ["..."]
+                         + critical_path[-CRITICAL_LABEL_ITEMS:])
     critical_path_label = Label(
         table_window,
-        text=f"Critical Path: {' -> '.join(results.critical_path)}",
+        text=f"Critical Path ({len(results.critical_path)} activities): {' -> '.join(critical_path)}",
         font=("Arial", 12, "bold"),
         bg="#4076FF",
         fg="white",
+        wraplength=760,
     )
     critical_path_label.pack(pady=10)
 
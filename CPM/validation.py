@@ -0,0 +1,130 @@
+from collections import deque
+from common.profiling import count, profiled
+
+MESSAGE_LIMIT = 10
+
+
+class NetworkError(ValueError):
+    """
+    Invalid network: unknown predecessors and/or cycles.
+
+    unknown - [(activity, unknown predecessor name)]
+    cycles - [(member names, example cycle path)], one entry per group of activities
+             that depend on each other; the path starts and ends with the same activity
+    """
+
+    def __init__(self, unknown, cycles):
+        self.unknown = unknown
+        self.cycles = cycles
+        lines = ["The network is invalid:"]
+        for name, pred in unknown[:MESSAGE_LIMIT]:
+            lines.append(f"Predecessor {pred} for activity {name} is not in activities")
+        if len(unknown) > MESSAGE_LIMIT:
+            lines.append(f"... and {len(unknown) - MESSAGE_LIMIT} more unknown predecessors")
+        for members, path in cycles[:MESSAGE_LIMIT]:
+            lines.append(f"Cycle among {len(members)} activities: " + " -> ".join(path))
+        if len(cycles) > MESSAGE_LIMIT:
+            lines.append(f"... and {len(cycles) - MESSAGE_LIMIT} more cycles")
+        super().__init__("\n".join(lines))
+
+
+def stronglyConnectedComponents(successors) -> list:
+    """
+    Iterative Tarjan's algorithm over {name: [successor names]}, O(V + E).
+    Returns the components as lists of names, successors before predecessors.
+    """
+    index = {}
+    low = {}
+    stack = []
+    on_stack = set()
+    components = []
+
+    for root in successors:
+        if root in index:
+            continue
+        index[root] = low[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(successors[root]))]
+        while work:
+            node, children = work[-1]
+            for child in children:
+                if child not in index:
+                    index[child] = low[child] = len(index)
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(successors[child])))
+                    break
+                if child in on_stack:
+                    low[node] = min(low[node], index[child])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+    return components
+
+
+def _cyclePath(start, members, successors) -> list:
+    """
+    Shortest cycle through `start` inside the group of activities `members` (BFS).
+    """
+    parent = {start: None}
+    queue = deque([start])
+    while queue:
+        node = queue.popleft()
+        for succ in successors[node]:
+            if succ == start:
+                path = [start]
+                while node is not None:
+                    path.append(node)
+                    node = parent[node]
+                return path[::-1]
+            if succ in members and succ not in parent:
+                parent[succ] = node
+                queue.append(succ)
+    return [start]
+
+
+def findCycles(predecessors) -> list:
+    """
+    Returns [(member names, example cycle path)] for every group of mutually
+    dependent activities in {name: [predecessor names]}; unknown names are ignored.
+    """
+    successors = {name: [] for name in predecessors}
+    for name, preds in predecessors.items():
+        for pred in dict.fromkeys(preds):
+            if pred in successors:
+                successors[pred].append(name)
+
+    position = {name: i for i, name in enumerate(predecessors)}
+    cycles = []
+    for component in stronglyConnectedComponents(successors):
+        if len(component) == 1 and component[0] not in successors[component[0]]:
+            continue
+        component.sort(key=position.__getitem__)
+        cycles.append((component, _cyclePath(component[0], set(component), successors)))
+    cycles.sort(key=lambda cycle: position[cycle[0][0]])
+    return cycles
+
+
+@profiled("cpm.validate")
+def validateNetwork(predecessors) -> None:
+    """
+    Checks a network {name: [predecessor names]} in one pass and raises
+    NetworkError listing all unknown predecessors and all cycles.
+    """
+    unknown = [(name, pred) for name, preds in predecessors.items() for pred in preds if pred not in predecessors]
+    cycles = findCycles(predecessors)
+    count("cpm.cycles", len(cycles))
+    if unknown or cycles:
+        raise NetworkError(unknown, cycles)
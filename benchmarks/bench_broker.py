@@ -0,0 +1,184 @@
+"""
+Benchmark of the broker problem solver (ZZT) on generated instances.
+
+Each instance is solved by ZZT with per-stage timings and a pivot count and
+checked against a reference optimum from a min-cost-flow solver (networkx
+network simplex). Results are written as JSON.
+
+REGRESSION_CASES are instances ZZT used to get wrong (degenerate bases left
+potentials undetermined); --regression solves only those and fails if any of
+them differs from the reference.
+
+Usage: python -m benchmarks.bench_broker [--sizes 5 10 20 50] [--time-limit 60] [--output results.json]
+       python -m benchmarks.bench_broker --regression
+"""
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+import networkx as nx
+from Broker.broker import ZZT
+from Broker.generator import generate_problem
+from common.profiling import profile
+
+DEFAULT_SIZES = [5, 10, 20, 50]
+REFERENCE_LIMIT = 500
+# (size, density, variant, seed) of instances that once failed, with the old status
+REGRESSION_CASES = [
+    (5, 1.0, {"balanced": True, "contract": False, "degenerate": False}, 1),   # mismatch
+    (5, 1.0, {"balanced": True, "contract": False, "degenerate": True}, 1),    # max() arg is an empty sequence
+    (5, 0.3, {"balanced": True, "contract": False, "degenerate": True}, 1),    # max() arg is an empty sequence
+    (10, 0.3, {"balanced": True, "contract": False, "degenerate": False}, 1),  # mismatch
+    (10, 1.0, {"balanced": True, "contract": False, "degenerate": True}, 1),   # max() arg is an empty sequence
+    (10, 0.3, {"balanced": True, "contract": False, "degenerate": True}, 1),   # max() arg is an empty sequence
+]
+STAGES = ("balancing", "initial_plan", "potentials", "deltas", "cycle_search", "result_assembly")
+
+
+class TimeLimitExceeded(Exception):
+    pass
+
+
+def reference_profit(problem):
+    """
+    Optimal profit of the same model ZZT solves (fictitious supplier/receiver for
+    unbalanced problems, contracts forbid the fictitious routes), as min-cost flow.
+    """
+    supply, demand = problem.supply.astype(int), problem.demand.astype(int)
+    profit = problem.sale_price - problem.purchase_cost[:, None] - problem.transport_costs
+    supplier_contracts, receiver_contracts = problem.contract_arrays()
+    rows, cols = len(supply), len(demand)
+
+    G = nx.DiGraph()
+    for i in range(rows):
+        G.add_node(("S", i), demand=-int(supply[i]))
+    for j in range(cols):
+        G.add_node(("R", j), demand=int(demand[j]))
+    for i, j in itertools.product(range(rows), range(cols)):
+        G.add_edge(("S", i), ("R", j), weight=-int(profit[i, j]))
+
+    if supply.sum() != demand.sum():
+        G.add_node(("S", "F"), demand=-int(demand.sum()))
+        G.add_node(("R", "F"), demand=int(supply.sum()))
+        G.add_edge(("S", "F"), ("R", "F"), weight=0)
+        for i in range(rows):
+            if not supplier_contracts[i]:
+                G.add_edge(("S", i), ("R", "F"), weight=0)
+        for j in range(cols):
+            if not receiver_contracts[j]:
+                G.add_edge(("S", "F"), ("R", j), weight=0)
+
+    cost, _ = nx.network_simplex(G)
+    return -cost
+
+
+def run(problem, time_limit, with_reference=True):
+    deadline = time.perf_counter() + time_limit
+
+    def progress(fraction, message):
+        if time.perf_counter() > deadline:
+            raise TimeLimitExceeded()
+
+    started = time.perf_counter()
+    status = "ok"
+    profit = None
+    with profile() as profiler:
+        try:
+            profit = ZZT(*problem.zzt_args(), progress=progress)[1]
+        except TimeLimitExceeded:
+            status = "time limit"
+        except (ValueError, RecursionError) as e:
+            status = f"error: {e}"
+    seconds = time.perf_counter() - started
+    stats = profiler.summary()
+
+    started = time.perf_counter()
+    reference = None
+    if with_reference:
+        try:
+            reference = reference_profit(problem)
+        except nx.NetworkXUnfeasible:
+            pass
+    reference_seconds = time.perf_counter() - started
+
+    if status == "ok" and with_reference:
+        if reference is None:
+            status = "infeasible reference"
+        elif abs(profit - reference) > 1e-6 * max(1.0, abs(reference)):
+            status = "mismatch"
+    elif status == "ok":
+        status = "unchecked"
+    return {
+        "status": status,
+        "seconds": seconds,
+        "pivots": stats.get("broker.pivots", {}).get("total", 0),
+        "stages": {stage: stats.get(f"broker.{stage}", {}).get("total", 0.0) for stage in STAGES},
+        "profit": None if profit is None else float(profit),
+        "reference_profit": None if reference is None else float(reference),
+        "reference_seconds": reference_seconds,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="numbers of suppliers and receivers (square instances); 500 takes tens of seconds")
+    parser.add_argument("--densities", type=float, nargs="+", default=[1.0, 0.3])
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--time-limit", type=float, default=60.0,
+                        help="seconds per ZZT run (checked between optimisation iterations)")
+    parser.add_argument("--reference-limit", type=int, default=REFERENCE_LIMIT,
+                        help="largest size for which the reference optimum is computed")
+    parser.add_argument("--output", help="JSON file for the results (default: benchmarks/results/broker-<time>.json)")
+    parser.add_argument("--regression", action="store_true",
+                        help="solve only REGRESSION_CASES and exit with an error if any of them fails")
+    args = parser.parse_args()
+
+    if args.regression:
+        failed = 0
+        for size, density, variant, seed in REGRESSION_CASES:
+            problem = generate_problem(size, size, seed=seed, density=density, **variant)
+            status = run(problem, args.time_limit)["status"]
+            failed += status != "ok"
+            print(f"{size:>6} {density:>8.2f} {variant}  seed {seed}: {status}")
+        sys.exit(1 if failed else 0)
+
+    variants = [
+        {"balanced": True, "contract": False, "degenerate": False},
+        {"balanced": False, "contract": False, "degenerate": False},
+        {"balanced": False, "contract": True, "degenerate": False},
+        {"balanced": True, "contract": False, "degenerate": True},
+    ]
+
+    results = []
+    print(f"{'size':>6} {'kind':>28} {'density':>8} {'time [s]':>9} {'pivots':>7} {'ref [s]':>8}  status")
+    for size, density, variant in itertools.product(args.sizes, args.densities, variants):
+        problem = generate_problem(size, size, seed=args.seed, density=density, **variant)
+        row = {"size": size, "density": density, **variant,
+               **run(problem, args.time_limit, size <= args.reference_limit)}
+        results.append(row)
+        kind = ", ".join(["balanced" if variant["balanced"] else "unbalanced"]
+                         + [name for name in ("contract", "degenerate") if variant[name]])
+        print(f"{size:>6} {kind:>28} {density:>8.2f} {row['seconds']:>9.3f} {row['pivots']:>7} "
+              f"{row['reference_seconds']:>8.3f}  {row['status']}")
+
+    created = datetime.now(timezone.utc)
+    output = args.output or os.path.join(os.path.dirname(__file__), "results",
+                                         f"broker-{created:%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as file:
+        json.dump({
+            "benchmark": "broker",
+            "created": created.isoformat(),
+            "python": sys.version.split()[0],
+            "seed": args.seed,
+            "results": results,
+        }, file, indent=2)
+    print(f"\nResults saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
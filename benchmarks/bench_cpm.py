@@ -0,0 +1,151 @@
+"""
+Benchmark of the CPM pipeline on generated networks.
+
+Every stage (parse, topological sort, solve, CSV write/read, render) is timed
+and its peak memory is measured with tracemalloc in a separate run, so the
+tracing overhead does not distort the timings. Results are written as JSON;
+--compare prints the ratios against an earlier result file.
+
+Usage: python -m benchmarks.bench_cpm [--networks layered random] [--sizes 10 1000 100000]
+                                      [--output results.json] [--compare old.json]
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+import matplotlib.pyplot as plt
+from CPM.activity import parsePredecessorformat, parseEventSequenceFormat, reverseEventSequenceFormat
+from CPM.cpm import CPM
+from CPM.gantt import GanttChart
+from CPM.generator import NETWORKS, generateNetwork
+
+DEFAULT_SIZES = [10, 100, 1000, 10000, 100000]
+DIAGRAM_LIMIT = 200
+
+
+def renderGantt(cpm):
+    fig = Figure(figsize=(12, 8))
+    FigureCanvasAgg(fig)
+    chart = GanttChart(cpm)
+    chart.draw(fig.add_subplot())
+    fig.canvas.draw()
+
+
+def renderDiagram(build):
+    fig, _, _ = build()
+    fig.canvas.draw()
+    plt.close(fig)
+
+
+def stages(activities, diagram_limit):
+    """
+    Returns [(stage, function)]; each function can be run repeatedly.
+    """
+    data = {name: {'duration': act.duration, 'predecessors': act.predecessors} for name, act in activities.items()}
+    cpm = CPM(parsePredecessorformat(data))
+    cpm.calculate()
+    csv_path = os.path.join(tempfile.mkdtemp(), "network.csv")
+
+    result = [
+        ("parse", lambda: parsePredecessorformat(data)),
+        ("topologicalSort", cpm.topologicalSort),
+        ("solve", lambda: CPM(parsePredecessorformat(data)).calculate()),
+        ("csv write", lambda: cpm.save_to_csv(csv_path)),
+        ("csv read", lambda: CPM().read_from_csv(csv_path)),
+        ("render gantt", lambda: renderGantt(cpm)),
+    ]
+
+    events = reverseEventSequenceFormat(cpm.activities)
+    result.append(("event format", lambda: reverseEventSequenceFormat(cpm.activities)))
+    result.append(("parse events", lambda: parseEventSequenceFormat(events)))
+
+    if len(activities) <= diagram_limit:
+        result.append(("render AON", lambda: renderDiagram(cpm.buildAON)))
+        result.append(("render AOA", lambda: renderDiagram(cpm.buildAOA)))
+    return result
+
+
+def measure(function):
+    started = time.perf_counter()
+    function()
+    seconds = time.perf_counter() - started
+
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak / 2 ** 20
+
+
+def gitRevision():
+    try:
+        return subprocess.run(["git", "describe", "--always", "--dirty"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, old_path):
+    with open(old_path) as file:
+        old = {(r["network"], r["size"], r["stage"]): r for r in json.load(file)["results"]}
+    print(f"\nCompared with {old_path} (new / old):")
+    for row in results:
+        previous = old.get((row["network"], row["size"], row["stage"]))
+        if previous and previous["seconds"] > 0:
+            print(f"  {row['network']:>15} {row['size']:>8} {row['stage']:>16}: "
+                  f"time x{row['seconds'] / previous['seconds']:.2f}, "
+                  f"memory x{row['peak_mb'] / max(previous['peak_mb'], 1e-9):.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--networks", nargs="+", choices=list(NETWORKS), default=list(NETWORKS))
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--diagram-limit", type=int, default=DIAGRAM_LIMIT,
+                        help="largest network for which the AON/AOA diagrams are rendered")
+    parser.add_argument("--output", help="JSON file for the results (default: benchmarks/results/cpm-<time>.json)")
+    parser.add_argument("--compare", help="earlier JSON result file to compare against")
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'network':>15} {'size':>8} {'stage':>16} {'time [s]':>10} {'peak [MB]':>10}")
+    for network in args.networks:
+        for size in args.sizes:
+            activities = generateNetwork(network, size, seed=args.seed)
+            for stage, function in stages(activities, args.diagram_limit):
+                seconds, peak_mb = measure(function)
+                results.append({"network": network, "size": size, "stage": stage,
+                                "seconds": seconds, "peak_mb": peak_mb})
+                print(f"{network:>15} {size:>8} {stage:>16} {seconds:>10.4f} {peak_mb:>10.2f}")
+
+    created = datetime.now(timezone.utc)
+    output = args.output or os.path.join(os.path.dirname(__file__), "results",
+                                         f"cpm-{created:%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as file:
+        json.dump({
+            "benchmark": "cpm",
+            "created": created.isoformat(),
+            "revision": gitRevision(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "results": results,
+        }, file, indent=2)
+    print(f"\nResults saved to {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Benchmark of the resource-constrained scheduler on generated networks.
+
+Usage: python -m benchmarks.bench_resources [--sizes 1000 5000 20000] [--rule LS]
+"""
+import argparse
+import time
+from CPM.cpm import CPM
+from CPM.generator import randomDag, assignResources
+from CPM.resources import PRIORITY_RULES, scheduleResources
+
+RESOURCES = {"crew": 6, "crane": 2, "electricians": 4}
+
+
+def run(size, rule, seed):
+    activities = assignResources(randomDag(size, seed=seed), RESOURCES, seed=seed)
+    cpm = CPM(activities)
+
+    started = time.perf_counter()
+    cpm.calculate()
+    solve_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    schedule = scheduleResources(cpm, RESOURCES, rule)
+    schedule_time = time.perf_counter() - started
+
+    return {
+        "activities": size,
+        "cpm_s": solve_time,
+        "schedule_s": schedule_time,
+        "cpm_duration": max(a.EF for a in activities.values()),
+        "makespan": schedule.makespan,
+        "delayed": len(schedule.delays(cpm)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument("--rule", choices=list(PRIORITY_RULES), default="LS")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"{'activities':>10} {'cpm [s]':>9} {'schedule [s]':>13} {'cpm length':>11} {'makespan':>9} {'delayed':>8}")
+    for size in args.sizes:
+        row = run(size, args.rule, args.seed)
+        print(f"{row['activities']:>10} {row['cpm_s']:>9.3f} {row['schedule_s']:>13.3f} "
+              f"{row['cpm_duration']:>11} {row['makespan']:>9} {row['delayed']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+Opt-in stage profiling for the CPM and broker solvers.
+
+The solvers wrap their stages in stage("...") or decorate them with
+@profiled("..."), and report sizes with count("...", n). Nothing is
+recorded unless a Profiler is active:
+
+    with profile() as profiler:
+        cpm.calculate()
+    profiler.print()
+    profiler.dumpChromeTrace("trace.json")   # open in chrome://tracing or Perfetto
+
+While no profiler is active stage() returns one shared no-op context manager,
+so the instrumentation costs a global lookup per stage call.
+"""
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+_NO_PROFILING = nullcontext()
+_active = None
+
+
+class Profiler:
+    """
+    Collects stage events {"name", "start", "duration", "thread", "args"} and
+    counter events {"name", "time", "value", "thread"}; times are in seconds
+    from the moment the profiler was created.
+    """
+
+    def __init__(self, callback=None):
+        """
+        :param callback: Optional callable(event) called for every recorded event
+        """
+        self.callback = callback
+        self.origin = time.perf_counter()
+        self.events = []
+        self._lock = threading.Lock()
+
+    def _record(self, event):
+        with self._lock:
+            self.events.append(event)
+        if self.callback:
+            self.callback(event)
+
+    @contextmanager
+    def stage(self, name, **args):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._record({"type": "stage", "name": name, "start": started - self.origin,
+                          "duration": time.perf_counter() - started,
+                          "thread": threading.get_ident(), "args": args})
+
+    def count(self, name, value=1):
+        self._record({"type": "counter", "name": name, "time": time.perf_counter() - self.origin,
+                      "value": value, "thread": threading.get_ident()})
+
+    def summary(self) -> dict:
+        """
+        Returns {stage: {"calls", "total", "max"}} and {counter: {"total"}} entries in first-seen order.
+        """
+        summary = {}
+        for event in self.events:
+            entry = summary.setdefault(event["name"], {"calls": 0, "total": 0, "max": 0.0})
+            entry["calls"] += 1
+            if event["type"] == "stage":
+                entry["total"] += event["duration"]
+                entry["max"] = max(entry["max"], event["duration"])
+            else:
+                entry["total"] += event["value"]
+                entry["max"] = None
+        return summary
+
+    def print(self) -> None:
+        print("Profile:")
+        for name, entry in self.summary().items():
+            if entry["max"] is None:
+                print(f"  {name:<32} count {entry['total']:g}")
+            else:
+                print(f"  {name:<32} {entry['total'] * 1000:10.2f} ms  ({entry['calls']} calls, "
+                      f"max {entry['max'] * 1000:.2f} ms)")
+
+    def dumpChromeTrace(self, file_path) -> None:
+        """
+        Writes the events in the Chrome trace event format (JSON).
+        """
+        pid = os.getpid()
+        trace = []
+        for event in self.events:
+            if event["type"] == "stage":
+                trace.append({"name": event["name"], "cat": event["name"].split(".")[0], "ph": "X",
+                              "ts": event["start"] * 1e6, "dur": event["duration"] * 1e6,
+                              "pid": pid, "tid": event["thread"], "args": event["args"]})
+            else:
+                trace.append({"name": event["name"], "ph": "C", "ts": event["time"] * 1e6,
+                              "pid": pid, "tid": event["thread"], "args": {"value": event["value"]}})
+        with open(file_path, "w") as file:
+            json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, file)
+
+
+def stage(name, **args):
+    """
+    Context manager timing one stage of the active profiler (no-op when profiling is off).
+    """
+    if _active is None:
+        return _NO_PROFILING
+    return _active.stage(name, **args)
+
+
+def profiled(name):
+    """
+    Decorator timing every call of the function as stage `name`.
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if _active is None:
+                return function(*args, **kwargs)
+            with _active.stage(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def count(name, value=1) -> None:
+    """
+    Records a counter value in the active profiler (no-op when profiling is off).
+    """
+    if _active is not None:
+        _active.count(name, value)
+
+
+@contextmanager
+def profile(callback=None):
+    """
+    Activates a new Profiler for the duration of the block (for all threads).
+    """
+    global _active
+    previous = _active
+    _active = Profiler(callback)
+    try:
+        yield _active
+    finally:
+        _active = previous
+
+
+@contextmanager
+def profileFromEnvironment(variable="BOIL_PROFILE"):
+    """
+    Profiles the block when the environment variable is set: the summary is
+    printed at the end and, if the variable names a .json file, a Chrome
+    trace is written to it.
+    """
+    target = os.environ.get(variable)
+    if not target:
+        yield None
+        return
+    with profile() as profiler:
+        try:
+            yield profiler
+        finally:
+            profiler.print()
+            if target.endswith(".json"):
+                profiler.dumpChromeTrace(target)
@@ -0,0 +1,138 @@
+import queue
+import threading
+import time
+
+
+class Cancelled(Exception):
+    """
+    Raised inside a running job once it was cancelled or superseded.
+    """
+
+
+class Job:
+    """
+    Handle passed to a background function.
+    The function reports progress through it and may call check() to stop early.
+    """
+
+    def __init__(self, generation, messages):
+        self.generation = generation
+        self.started = time.perf_counter()
+        self._messages = messages
+        self._cancel = threading.Event()
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def check(self) -> None:
+        if self._cancel.is_set():
+            raise Cancelled()
+
+    def progress(self, fraction=None, message="") -> None:
+        """
+        Reports progress; fraction is in [0, 1] or None when unknown.
+        Raises Cancelled when the job should stop.
+        """
+        self.check()
+        self._messages.put(("progress", self.generation, (fraction, message, self.elapsed())))
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+
+class BackgroundSolver:
+    """
+    Runs one solve at a time on a worker thread and delivers the results on
+    the Tk thread by polling a queue with after().
+
+    Submitting a new job or calling invalidate() cancels the running job and
+    any result it still produces is discarded as stale; invalidate() also
+    calls the job's on_cancel so the UI can reset its status.
+    """
+
+    def __init__(self, widget, poll_ms=50):
+        self.widget = widget
+        self.poll_ms = poll_ms
+        self.generation = 0
+        self.job = None
+        self._messages = queue.Queue()
+        self._callbacks = {}
+        self._polling = False
+
+    @property
+    def busy(self) -> bool:
+        return self.job is not None
+
+    def submit(self, function, *args, on_done=None, on_error=None, on_progress=None, on_cancel=None) -> Job:
+        """
+        Starts function(job, *args) on a worker thread.
+        on_done(result, elapsed), on_error(exception), on_progress(fraction, message, elapsed)
+        and on_cancel() are called on the Tk thread.
+        """
+        self._discard()
+        job = Job(self.generation, self._messages)
+        self.job = job
+        self._callbacks = {
+            "done": on_done, "error": on_error, "progress": on_progress, "cancelled": on_cancel
+        }
+        threading.Thread(target=self._run, args=(job, function, args), daemon=True).start()
+        if not self._polling:
+            self._polling = True
+            self.widget.after(self.poll_ms, self._poll)
+        return job
+
+    def cancel(self) -> None:
+        """
+        Asks the running job to stop; on_cancel is called once it has stopped.
+        """
+        if self.job is not None:
+            self.job.cancel()
+
+    def invalidate(self) -> None:
+        """
+        Marks the running job (if any) as stale: it is cancelled, its result
+        will never be delivered and its on_cancel is called right away.
+        Call this whenever the inputs change.
+        """
+        on_cancel = self._callbacks.get("cancelled") if self.job is not None else None
+        self._discard()
+        if on_cancel is not None:
+            on_cancel()
+
+    def _discard(self) -> None:
+        if self.job is not None:
+            self.job.cancel()
+        self.job = None
+        self.generation += 1
+
+    def _run(self, job, function, args):
+        try:
+            result = function(job, *args)
+            self._messages.put(("done", job.generation, (result, job.elapsed())))
+        except Cancelled:
+            self._messages.put(("cancelled", job.generation, ()))
+        except Exception as e:
+            self._messages.put(("error", job.generation, (e,)))
+
+    def _poll(self):
+        while True:
+            try:
+                kind, generation, payload = self._messages.get_nowait()
+            except queue.Empty:
+                break
+            if generation != self.generation:
+                continue  # stale job
+            if kind != "progress":
+                self.job = None
+            callback = self._callbacks.get(kind)
+            if callback is not None:
+                callback(*payload)
+
+        if self.job is not None:
+            self.widget.after(self.poll_ms, self._poll)
+        else:
+            self._polling = False
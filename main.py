@@ -1,4 +1,6 @@
 from CPM import main_window
+from common.profiling import profileFromEnvironment
 
 if __name__ == "__main__":
-    main_window.create_main_gui()
+    with profileFromEnvironment():
+        main_window.create_main_gui()
@@ -0,0 +1,4 @@
+import os
+
+# CPM.cpm selects the Tk backend unless MPLBACKEND is set; the tests draw nothing on screen
+os.environ.setdefault("MPLBACKEND", "Agg")
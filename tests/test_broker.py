@@ -0,0 +1,50 @@
+import networkx as nx
+import numpy as np
+import pytest
+from benchmarks.bench_broker import REGRESSION_CASES, reference_profit
+from Broker.broker import ZZT, deltas, potentials
+from Broker.generator import generate_problem
+
+VARIANTS = [
+    {"balanced": True, "contract": False, "degenerate": False},
+    {"balanced": False, "contract": False, "degenerate": False},
+    {"balanced": False, "contract": True, "degenerate": False},
+    {"balanced": True, "contract": False, "degenerate": True},
+]
+
+
+def assert_optimal(problem):
+    try:
+        reference = reference_profit(problem)
+    except nx.NetworkXUnfeasible:
+        pytest.skip("the contract cannot be met")
+    assert ZZT(*problem.zzt_args())[1] == pytest.approx(reference)
+
+
+@pytest.mark.parametrize("size, density, variant, seed", REGRESSION_CASES)
+def test_regression_cases(size, density, variant, seed):
+    assert_optimal(generate_problem(size, size, seed=seed, density=density, **variant))
+
+
+@pytest.mark.parametrize("variant", VARIANTS)
+@pytest.mark.parametrize("seed", range(8))
+def test_random_problems_are_optimal(variant, seed):
+    rows, cols = 3 + seed % 4, 2 + seed % 5
+    assert_optimal(generate_problem(rows, cols, seed=seed, density=0.5 + 0.5 * (seed % 2), **variant))
+
+
+def test_potentials_and_deltas_on_basis_tree():
+    revenue = np.array([[5.0, 3.0, 1.0],
+                        [2.0, 6.0, 4.0]])
+    plan = np.array([[10.0, 5.0, np.nan],
+                     [np.nan, 0.0, 20.0]])
+    alpha, beta = potentials(revenue, plan)
+    # The last row is the root of the tree
+    assert alpha[1] == 0
+    for i, j in zip(*np.nonzero(~np.isnan(plan))):
+        assert alpha[i] + beta[j] == pytest.approx(revenue[i, j])
+
+    delta = deltas(revenue, plan, alpha, beta)
+    assert np.isnan(delta[~np.isnan(plan)]).all()
+    assert delta[0, 2] == pytest.approx(revenue[0, 2] - alpha[0] - beta[2])
+    assert delta[1, 0] == pytest.approx(revenue[1, 0] - alpha[1] - beta[0])
@@ -0,0 +1,26 @@
+import pytest
+from Broker.generator import generate_problem
+from Broker.problem_file import load_problem, save_problem_npz
+from Broker.workbook import read_problem, write_problem
+
+
+@pytest.mark.parametrize("contract", [False, True])
+@pytest.mark.parametrize("suffix", [".xlsx", ".npz"])
+def test_problem_round_trip(tmp_path, suffix, contract):
+    problem = generate_problem(4, 3, seed=5, balanced=False, contract=contract)
+    path = tmp_path / f"problem{suffix}"
+    if suffix == ".npz":
+        save_problem_npz(path, problem)
+    else:
+        write_problem(path, problem)
+
+    loaded = load_problem(path)
+    assert loaded == problem
+    assert loaded.contract == problem.contract
+
+
+def test_default_contract_survives_excel(tmp_path):
+    problem = generate_problem(2, 2, seed=1)
+    assert problem.contract == "None"
+    write_problem(tmp_path / "problem.xlsx", problem)
+    assert read_problem(tmp_path / "problem.xlsx").contract == "None"
@@ -0,0 +1,138 @@
+from datetime import date, datetime, timedelta
+import pytest
+from CPM.activity import Activity
+from CPM.calendars import WorkCalendar, parseDate, toDatetime, toTime
+from CPM.cpm import CPM
+
+MONDAY = date(2026, 3, 2)
+
+
+def isWorking(calendar, offset):
+    day = calendar.start + timedelta(days=offset)
+    return day.weekday() in calendar.workdays and day not in calendar.holidays
+
+
+def walkEarliest(calendar, start, duration):
+    """
+    Day-by-day walk: first working day from `start`, then `duration` working days.
+    """
+    day = start
+    while not isWorking(calendar, day):
+        day += 1
+    if duration == 0:
+        return day, day
+    begin, left = day, duration
+    while True:
+        if isWorking(calendar, day):
+            left -= 1
+            if left == 0:
+                return begin, day + 1
+        day += 1
+
+
+@pytest.mark.parametrize("workdays, holidays", [
+    ((0, 1, 2, 3, 4), ()),
+    ((0, 1, 2, 3, 4), (date(2026, 3, 4), date(2026, 3, 16), date(2026, 12, 25))),
+    ((0, 2, 4), ()),
+    ((5,), ()),
+])
+def test_earliest_matches_a_day_by_day_walk(workdays, holidays):
+    calendar = WorkCalendar(MONDAY, workdays, holidays)
+    for start in range(0, 30):
+        for duration in (0, 1, 2, 5, 13, 200):
+            assert calendar.earliest(start, duration) == walkEarliest(calendar, start, duration), (start, duration)
+
+
+def test_latest_is_the_mirror_of_earliest():
+    calendar = WorkCalendar(MONDAY, holidays=(date(2026, 3, 11),))
+    for start in range(0, 40):
+        for duration in (1, 3, 8):
+            begin, finish = calendar.earliest(start, duration)
+            assert calendar.latest(finish, duration) == (begin, finish)
+
+
+def test_index_grows_past_the_first_year():
+    calendar = WorkCalendar(MONDAY)
+    # 5 working days a week: 520 working days are exactly 104 weeks
+    assert calendar.earliest(0, 520) == (0, 7 * 104 - 2)
+
+
+def test_no_working_days():
+    with pytest.raises(ValueError, match="no working days"):
+        WorkCalendar(MONDAY, workdays=())
+
+
+@pytest.mark.parametrize("start", [MONDAY, datetime(2026, 3, 2, 8, 30)])
+def test_datetime_round_trip(start):
+    for t in (0, 1, 2.5, 10.25, -1):
+        moment = toDatetime(start, t)
+        assert toTime(start, moment) == pytest.approx(t)
+    assert toDatetime(date(2026, 3, 2), 1.5) == datetime(2026, 3, 3, 12)
+    assert toTime(MONDAY, date(2026, 3, 9)) == 7
+    assert parseDate(" 2026-03-02 ") == MONDAY
+
+
+def test_schedule_on_working_days():
+    # A(4) -> B(3) -> C(1), starting on a Monday with Tuesday of the second week off
+    activities = {"A": Activity("A", 4), "B": Activity("B", 3, ["A"]), "C": Activity("C", 1, ["B"])}
+    cpm = CPM(activities)
+    cpm.start_date = MONDAY
+    cpm.calendar = WorkCalendar(MONDAY, holidays=(date(2026, 3, 10),))
+    cpm.calculate()
+
+    a, b, c = (cpm.activities[name] for name in "ABC")
+    assert (a.ES, a.EF) == (0, 4)
+    # B starts on Friday, skips the weekend and the holiday
+    assert (b.ES, b.EF) == (4, 10)
+    assert (c.ES, c.EF) == (10, 11)
+    assert cpm.date(c.EF) == datetime(2026, 3, 13)
+    assert cpm.critical_path == ["A", "B", "C"]
+
+
+def test_activity_calendars():
+    activities = {"A": Activity("A", 2, calendar="weekends"), "B": Activity("B", 1, ["A"])}
+    cpm = CPM(activities)
+    cpm.start_date = MONDAY
+    cpm.calendars = {"weekends": WorkCalendar(MONDAY, workdays=(5, 6), name="weekends")}
+    cpm.calculate()
+    # A runs Saturday-Sunday; B has no calendar and follows in continuous time
+    assert (cpm.activities["A"].ES, cpm.activities["A"].EF) == (5, 7)
+    assert (cpm.activities["B"].ES, cpm.activities["B"].EF) == (7, 8)
+
+
+def test_check_calendars():
+    cpm = CPM({"A": Activity("A", 2, calendar="site")})
+    cpm.calendars = {"site": WorkCalendar(MONDAY, name="site")}
+    with pytest.raises(ValueError, match="need the project start date"):
+        cpm.calculate()
+
+    cpm.start_date = MONDAY + timedelta(days=1)
+    with pytest.raises(ValueError, match="Calendar site starts on 2026-03-02, but the project starts on 2026-03-03"):
+        cpm.calculate()
+
+    cpm.start_date = datetime(2026, 3, 2, 8)
+    cpm.calculate()
+    assert cpm.activities["A"].EF == 2
+
+    cpm.activities["A"].calendar = "office"
+    with pytest.raises(ValueError, match="Unknown calendar 'office' of activity A"):
+        cpm.calculate()
+
+
+def test_start_date_and_calendar_names_survive_csv(tmp_path):
+    cpm = CPM({"A": Activity("A", 2, calendar="site"), "B": Activity("B", 1.5, ["A"])})
+    cpm.start_date = datetime(2026, 3, 6, 8, 0)
+    cpm.calendars = {"site": WorkCalendar(cpm.start_date, name="site")}
+    cpm.calculate()
+    cpm.save_to_csv(tmp_path / "project.csv")
+
+    loaded = CPM()
+    loaded.read_from_csv(tmp_path / "project.csv")
+    assert loaded.start_date == cpm.start_date
+    assert loaded.activities["A"].calendar == "site"
+    assert loaded.activities["B"].calendar is None
+    # The calendar definitions are not in the file
+    loaded.calendars = cpm.calendars
+    loaded.calculate()
+    assert [(act.ES, act.EF) for act in loaded.activities.values()] == \
+           [(act.ES, act.EF) for act in cpm.activities.values()]
@@ -0,0 +1,83 @@
+import itertools
+import random
+import pytest
+from CPM.activity import Activity
+from CPM.cpm import CPM
+from CPM.crashing import crashProject
+
+
+def bruteForce(predecessors, normal, crash):
+    """
+    {project duration: cheapest extra cost} over all integer durations
+    (with integer data the time-cost LP has integer optimal durations).
+    """
+    slopes = {name: (crash_cost - normal_cost) / (normal[name] - crash_duration)
+              for name, (crash_duration, normal_cost, crash_cost) in crash.items()}
+    ranges = [range(crash[name][0] if name in crash else normal[name], normal[name] + 1) for name in predecessors]
+    best = {}
+    for durations in itertools.product(*ranges):
+        duration = dict(zip(predecessors, durations))
+        finish = {}
+        for name, preds in predecessors.items():  # names are in topological order
+            finish[name] = max((finish[pred] for pred in preds), default=0) + duration[name]
+        length = max(finish.values())
+        cost = sum(slope * (normal[name] - duration[name]) for name, slope in slopes.items())
+        best[length] = min(best.get(length, cost), cost)
+    return best
+
+
+def checkAgainstBruteForce(predecessors, normal, crash):
+    best = bruteForce(predecessors, normal, crash)
+    for target in sorted(best):
+        cpm = CPM({name: Activity(name, normal[name], list(preds)) for name, preds in predecessors.items()})
+        curve = crashProject(cpm, crash, target=target)
+        length, cost = curve.points[-1]
+        assert length <= target
+        assert cost == pytest.approx(min(c for l, c in best.items() if l <= target)), target
+
+
+def randomCase(seed, predecessors=None):
+    rng = random.Random(seed)
+    if predecessors is None:
+        count = rng.randint(3, 6)
+        predecessors = {f"a{i}": [f"a{p}" for p in rng.sample(range(i), rng.randint(0, min(i, 2)))]
+                        for i in range(count)}
+    normal = {name: rng.randint(2, 6) for name in predecessors}
+    crash = {}
+    for name in predecessors:
+        if rng.random() < 0.8:
+            crash_duration = rng.randint(max(0, normal[name] - 3), normal[name] - 1)
+            crash[name] = (crash_duration, 0, rng.randint(1, 9) * (normal[name] - crash_duration))
+    return predecessors, normal, crash
+
+
+@pytest.mark.parametrize("seed", range(60))
+def test_curve_matches_brute_force(seed):
+    checkAgainstBruteForce(*randomCase(seed))
+
+
+# Paths A-C, A-M-E and B-E: once all are critical, crashing A and E pays for lengthening M back
+BRIDGE = {"A": [], "B": [], "M": ["A"], "C": ["A"], "E": ["M", "B"]}
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_bridge_matches_brute_force(seed):
+    checkAgainstBruteForce(*randomCase(seed, BRIDGE))
+
+
+def test_crashed_activity_is_lengthened_back():
+    normal = {"A": 4, "B": 4, "M": 3, "C": 3, "E": 3}
+    crash = {"A": (1, 0, 12), "B": (1, 0, 15), "M": (0, 0, 3), "C": (0, 0, 21), "E": (2, 0, 3)}
+    checkAgainstBruteForce(BRIDGE, normal, crash)
+    curve = crashProject(CPM({name: Activity(name, normal[name], list(preds)) for name, preds in BRIDGE.items()}),
+                         crash)
+    assert curve.points[:3] == [(10, 0), (7, 3), (6, 9)]
+    assert curve.steps[1] == ["A", "E"] and curve.uncrashed[1] == ["M"]
+
+
+def test_slack_link_between_critical_activities_limits_the_step():
+    # A and D are both critical, but the path A-D is one unit shorter than the project
+    predecessors = {"A": [], "B": [], "C": ["A"], "D": ["A", "B"], "E": ["B"]}
+    normal = {"A": 3, "B": 4, "C": 5, "D": 3, "E": 3}
+    crash = {"A": (2, 0, 5), "B": (0, 0, 8), "C": (0, 0, 20), "D": (0, 0, 18), "E": (0, 0, 3)}
+    checkAgainstBruteForce(predecessors, normal, crash)
@@ -0,0 +1,57 @@
+import random
+import pytest
+from CPM.cpm import CPM, TIME_TOLERANCE
+from CPM.delays import DelayAnalysis, delayImpact
+from CPM.generator import generateNetwork
+
+
+def solved(kind, seed, slips=None):
+    activities = generateNetwork(kind, 150, seed=seed)
+    for name, slip in (slips or {}).items():
+        activities[name].duration += slip
+    cpm = CPM(activities)
+    cpm.calculate()
+    return cpm
+
+
+def critical(cpm):
+    return {name for name, act in cpm.activities.items() if abs(act.reserve) <= TIME_TOLERANCE}
+
+
+@pytest.mark.parametrize("kind", ["random", "layered", "series-parallel"])
+@pytest.mark.parametrize("seed", range(5))
+def test_scenarios_match_full_calculation(kind, seed):
+    cpm = solved(kind, seed)
+    rng = random.Random(seed)
+    names = list(cpm.activities)
+    scenarios = [{name: rng.choice([0.5, 1, 3, 10]) for name in rng.sample(names, rng.randint(1, 4))}
+                 for _ in range(12)]
+    impact = DelayAnalysis(cpm).query(scenarios)
+
+    before = critical(cpm)
+    for scenario, duration, newly_critical in zip(scenarios, impact.project_durations, impact.newly_critical):
+        expected = solved(kind, seed, scenario)
+        assert duration == pytest.approx(expected.project_duration)
+        assert set(newly_critical) == critical(expected) - before, scenario
+    assert impact.projectDelays() == pytest.approx(impact.project_durations - cpm.project_duration)
+
+
+def test_critical_slips_delay_the_project_by_their_size():
+    cpm = solved("random", 1)
+    name = cpm.critical_path[0]
+    impact = delayImpact(cpm, [{name: 2}, {name: 5}])
+    assert list(impact.projectDelays()) == pytest.approx([2, 5])
+
+
+def test_no_slips_keep_the_schedule():
+    cpm = solved("random", 2)
+    impact = delayImpact(cpm, [{}, {}])
+    assert list(impact.project_durations) == [cpm.project_duration] * 2
+    assert impact.newly_critical == [[], []]
+
+
+@pytest.mark.parametrize("scenario, message", [({"missing": 1}, "unknown activity"),
+                                               ({"a1": -1}, "must not be negative")])
+def test_invalid_scenarios_are_rejected(scenario, message):
+    with pytest.raises(ValueError, match=message):
+        delayImpact(solved("random", 3), [scenario])
@@ -0,0 +1,64 @@
+import matplotlib.pyplot as plt
+import pytest
+from matplotlib.colors import to_rgba
+from CPM.activity import Activity
+from CPM.cpm import CPM
+from CPM.diagram_view import DiagramView
+
+
+def network(c_duration=1):
+    cpm = CPM({"A": Activity("A", 2), "B": Activity("B", 3, ["A"]), "C": Activity("C", c_duration),
+               "D": Activity("D", 4, ["B", "C"]), "E": Activity("E", 1, ["A"])})
+    cpm.calculate()
+    return cpm
+
+
+def opened(kind, cpm):
+    """
+    A view as show() leaves it, without opening a window.
+    """
+    view = DiagramView(kind)
+    view._build(cpm)
+    view.structure = view._structure(cpm)
+    view.snapshot = view._snapshot(cpm)
+    view.critical = set(cpm.critical_path)
+    return view
+
+
+@pytest.fixture(autouse=True)
+def close_figures():
+    yield
+    plt.close("all")
+
+
+def test_aon_update_matches_a_new_diagram():
+    view = opened("AON", network())
+    cpm = network(c_duration=8)
+    view.update(cpm)
+
+    _, _, fresh = cpm.buildAON()
+    for name, text in fresh['inside'].items():
+        assert view.artists['inside'][name].get_text() == text.get_text(), name
+    for name, box in fresh['boxes'].items():
+        assert view.artists['boxes'][name].get_facecolor() == box.get_facecolor(), name
+    for edge, patch in fresh['edges'].items():
+        assert to_rgba(view.artists['edges'][edge].get_edgecolor()) == to_rgba(patch.get_edgecolor()), edge
+
+
+def test_aoa_update_matches_a_new_diagram():
+    view = opened("AOA", network())
+    cpm = network(c_duration=8)
+    view.update(cpm)
+
+    _, _, fresh = cpm.buildAOA()
+    for event, text in fresh['events'].items():
+        assert view.artists['events'][event].get_text() == text.get_text(), event
+    for name, patches in fresh['edges'].items():
+        for mine, theirs in zip(view.artists['edges'][name], patches):
+            assert to_rgba(mine.get_edgecolor()) == to_rgba(theirs.get_edgecolor()), name
+    assert (view.artists['nodes'].get_facecolor() == fresh['nodes'].get_facecolor()).all()
+
+
+def test_unknown_kind():
+    with pytest.raises(ValueError, match="Unknown diagram kind"):
+        DiagramView("PERT")
@@ -0,0 +1,74 @@
+from datetime import datetime
+import pytest
+from openpyxl import load_workbook
+from CPM.activity import Activity
+from CPM.cpm import CPM
+from CPM.table import export_results
+
+
+def solved(start_date=None):
+    cpm = CPM({"A": Activity("A", 2), "B": Activity("B", 3, ["A"]),
+               "C": Activity("C", 1), "D": Activity("D", 4, ["B", "C"])})
+    cpm.start_date = start_date
+    cpm.calculate()
+    return cpm
+
+
+def rows(path, sheet):
+    return [list(row) for row in load_workbook(path)[sheet].iter_rows(values_only=True)]
+
+
+def test_results_sheet_only_by_default(tmp_path):
+    cpm = solved()
+    export_results(tmp_path / "results.xlsx", cpm)
+    assert load_workbook(tmp_path / "results.xlsx").sheetnames == ["CPM Results"]
+
+    sheet = rows(tmp_path / "results.xlsx", "CPM Results")
+    assert sheet[0] == ["Activity", "ES", "EF", "LS", "LF", "Reserve", "Free Float", "Interfering Float",
+                        "Independent Float"]
+    for row, (name, act) in zip(sheet[1:], cpm.activities.items()):
+        assert row == [name, act.ES, act.EF, act.LS, act.LF, act.reserve, act.free_float,
+                       act.interfering_float, act.independent_float]
+    # One critical activity per row after an empty separator row
+    assert [row[0] for row in sheet[5:]] == [None, "Critical Path", "A", "B", "D"]
+
+
+def test_gantt_and_float_sheets(tmp_path):
+    cpm = solved()
+    export_results(tmp_path / "results.xlsx", cpm, include_gantt=True, include_float=True)
+    assert load_workbook(tmp_path / "results.xlsx").sheetnames == ["CPM Results", "Gantt", "Float"]
+
+    assert rows(tmp_path / "results.xlsx", "Gantt") == [
+        ["Activity", "Start", "Finish", "Duration", "Critical"],
+        ["A", 0, 2, 2, True],
+        ["B", 2, 5, 3, True],
+        ["C", 0, 1, 1, False],
+        ["D", 5, 9, 4, True],
+    ]
+    assert rows(tmp_path / "results.xlsx", "Float") == [
+        ["Activity", "Total Float", "Free Float", "Interfering Float", "Independent Float", "Critical"],
+        ["A", 0, 0, 0, 0, True],
+        ["B", 0, 0, 0, 0, True],
+        ["C", 4, 4, 0, 4, False],
+        ["D", 0, 0, 0, 0, True],
+    ]
+
+
+def test_dates_with_a_start_date(tmp_path):
+    start = datetime(2026, 3, 2)
+    cpm = solved(start)
+    export_results(tmp_path / "results.xlsx", cpm, include_gantt=True)
+
+    sheet = rows(tmp_path / "results.xlsx", "CPM Results")
+    assert sheet[0][-4:] == ["ES Date", "EF Date", "LS Date", "LF Date"]
+    assert sheet[3][-4:] == [datetime(2026, 3, 2), datetime(2026, 3, 3), datetime(2026, 3, 6), datetime(2026, 3, 7)]
+    assert rows(tmp_path / "results.xlsx", "Gantt")[4][:3] == ["D", datetime(2026, 3, 7), datetime(2026, 3, 11)]
+
+
+@pytest.mark.parametrize("count", [1, 3000])
+def test_large_results_keep_every_row(tmp_path, count):
+    cpm = CPM({f"a{i}": Activity(f"a{i}", 1, [f"a{i - 1}"] if i else []) for i in range(count)})
+    cpm.calculate()
+    export_results(tmp_path / "results.xlsx", cpm)
+    sheet = rows(tmp_path / "results.xlsx", "CPM Results")
+    assert len(sheet) == 1 + count + 2 + count
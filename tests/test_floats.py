@@ -0,0 +1,59 @@
+import copy
+import pytest
+from CPM.activity import Activity
+from CPM.cpm import CPM
+from CPM.generator import randomDag
+
+
+def delayed(cpm, name, delay):
+    """
+    Schedule with `name` finishing `delay` later (as if it started later).
+    """
+    other = copy.deepcopy(cpm)
+    other.activities[name].duration += delay
+    other.calculate()
+    return other
+
+
+def largestDelay(cpm, name, keeps):
+    delay = 0
+    while delay <= cpm.project_duration and keeps(delayed(cpm, name, delay + 1)):
+        delay += 1
+    return delay
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_floats_by_delaying_each_activity(seed):
+    cpm = CPM(randomDag(25, seed=seed, window=8))
+    cpm.calculate()
+    for name, act in cpm.activities.items():
+        others = [other for other in cpm.activities if other != name]
+
+        def keepsEnd(schedule):
+            return schedule.project_duration == cpm.project_duration
+
+        def keepsSuccessors(schedule):
+            return keepsEnd(schedule) and all(schedule.activities[o].ES == cpm.activities[o].ES for o in others)
+
+        assert act.reserve == largestDelay(cpm, name, keepsEnd), name
+        assert act.free_float == largestDelay(cpm, name, keepsSuccessors), name
+        assert act.interfering_float == act.reserve - act.free_float
+        assert 0 <= act.independent_float <= act.free_float <= act.reserve
+
+
+def test_textbook_floats():
+    # A(3) -> C(2) -> E(4); B(2) -> D(1) -> E; B -> C
+    cpm = CPM({"A": Activity("A", 3), "B": Activity("B", 2), "C": Activity("C", 2, ["A", "B"]),
+               "D": Activity("D", 1, ["B"]), "E": Activity("E", 4, ["C", "D"])})
+    cpm.calculate()
+    floats = {name: (act.reserve, act.free_float, act.interfering_float, act.independent_float)
+              for name, act in cpm.activities.items()}
+    assert floats == {
+        "A": (0, 0, 0, 0),
+        # B: D starts as soon as B finishes, so its float is all interfering
+        "B": (1, 0, 1, 0),
+        "C": (0, 0, 0, 0),
+        # D: ES 2, LS 4; E starts at 5, so D may slip 2 alone but only 1 after a late B
+        "D": (2, 2, 0, 1),
+        "E": (0, 0, 0, 0),
+    }
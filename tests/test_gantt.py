@@ -0,0 +1,110 @@
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+from matplotlib.collections import PolyCollection
+from CPM.activity import Activity
+from CPM.cpm import CPM
+from CPM.gantt import MAX_BAR_ROWS, GanttChart
+from CPM.generator import randomDag
+
+
+@pytest.fixture
+def ax():
+    fig, ax = plt.subplots(figsize=(12, 8))
+    yield ax
+    plt.close(fig)
+
+
+def chain():
+    """
+    A(0-2) -> B(2-5) -> D(5-9), C(0-1) off the critical path.
+    """
+    cpm = CPM({"A": Activity("A", 2), "B": Activity("B", 3, ["A"]),
+               "C": Activity("C", 1), "D": Activity("D", 4, ["B", "C"])})
+    cpm.calculate()
+    return cpm
+
+
+def test_bars_are_one_collection(ax):
+    chart = GanttChart(chain())
+    artists = chart.draw(ax)
+    bars = [artist for artist in artists if isinstance(artist, PolyCollection)]
+    assert len(bars) == 1
+    assert len(bars[0].get_paths()) == 4
+    assert list(chart._rows) == [0, 1, 2, 3]
+    # Red for critical, blue for the rest
+    colors = bars[0].get_facecolor()
+    assert [tuple(c[:3]) for c in colors] == [(1, 0, 0), (1, 0, 0), (0, 0, 1), (1, 0, 0)]
+
+
+def test_draw_culls_rows_and_time(ax):
+    chart = GanttChart(chain())
+    chart.draw(ax, rows=(1, 4), time_window=(3, 10))
+    # A is outside the rows, C ends before t = 3
+    assert list(chart._rows) == [1, 3]
+    assert ax.get_xlim() == (3, 10)
+    assert ax.get_ylim() == (3.5, 0.5)
+
+
+def test_labels_only_on_wide_bars(ax):
+    chart = GanttChart(chain())
+    chart.draw(ax)
+    assert sorted(chart._labels) == [0, 1, 2, 3]
+    assert chart._labels[3].get_text() == "D (4)"
+
+    chart.draw(ax, time_window=(0, 10000))
+    assert chart._labels == {}
+
+
+def test_density_counts_running_activities(ax):
+    cpm = CPM(randomDag(300, seed=3))
+    cpm.calculate()
+    chart = GanttChart(cpm)
+    chart.drawDensity(ax, bins=(10, 50))
+    image = chart._artists[0].get_array()
+    assert image.shape == (10, 50)
+    # Each activity covers at least one time bin of its row bin
+    assert image.sum() >= chart.rowCount()
+    assert image.max() <= chart.rowCount()
+
+
+def test_many_rows_draw_the_density_image(ax):
+    cpm = CPM(randomDag(MAX_BAR_ROWS + 1, seed=1))
+    cpm.calculate()
+    chart = GanttChart(cpm)
+    chart.draw(ax)
+    assert chart._bars is None
+    assert len(chart._artists) == 1
+    assert np.asarray(chart._artists[0].get_array()).ndim == 2
+
+
+def test_update_moves_changed_bars(ax):
+    cpm = chain()
+    chart = GanttChart(cpm)
+    chart.draw(ax)
+    before = chart._bars.get_paths()[2].vertices.copy()
+
+    assert not chart.update(cpm)
+
+    cpm.activities["C"].duration = 7
+    cpm.calculate()
+    assert chart.update(cpm)
+    # C is now the longest way into D: C critical, A and B not
+    assert list(chart.critical) == [False, False, True, True]
+    assert chart._labels[2].get_text() == "C (7)"
+    assert chart._labels[3].get_position() == (9.0, 3)
+    assert not np.array_equal(chart._bars.get_paths()[2].vertices, before)
+
+    fresh = GanttChart(cpm)
+    fresh.draw(ax)
+    for mine, theirs in zip(chart._bars.get_paths(), fresh._bars.get_paths()):
+        assert np.array_equal(mine.vertices, theirs.vertices)
+
+
+def test_update_refuses_other_activities(ax):
+    chart = GanttChart(chain())
+    chart.draw(ax)
+    other = CPM({"A": Activity("A", 2)})
+    other.calculate()
+    with pytest.raises(ValueError, match="drawn again"):
+        chart.update(other)
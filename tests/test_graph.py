@@ -0,0 +1,78 @@
+import networkx as nx
+import pytest
+from CPM.aoa import toArrowNetwork
+from CPM.cpm import CPM
+from CPM.generator import generateNetwork
+from CPM.graph import topologicalOrder, transitiveReduction
+
+KINDS = ["random", "layered", "series-parallel"]
+
+
+def predecessorsOf(activities):
+    return {name: list(act.predecessors) for name, act in activities.items()}
+
+
+def digraph(predecessors):
+    G = nx.DiGraph()
+    G.add_nodes_from(predecessors)
+    G.add_edges_from((pred, name) for name, preds in predecessors.items() for pred in preds)
+    return G
+
+
+@pytest.mark.parametrize("kind", KINDS)
+@pytest.mark.parametrize("seed", range(10))
+def test_transitive_reduction_matches_networkx(kind, seed):
+    predecessors = predecessorsOf(generateNetwork(kind, 80, seed=seed))
+    reduced, redundant = transitiveReduction(predecessors)
+
+    expected = nx.transitive_reduction(digraph(predecessors))
+    assert set(digraph(reduced).edges) == set(expected.edges)
+    kept = {(pred, name) for name, preds in reduced.items() for pred in preds}
+    links = {(pred, name) for name, preds in predecessors.items() for pred in preds}
+    assert kept | set(redundant) == links
+    assert not kept & set(redundant)
+
+
+def test_topological_order_leaves_out_cycles():
+    predecessors = {"A": [], "B": ["A", "C"], "C": ["B"], "D": ["A"]}
+    assert topologicalOrder(predecessors) == ["A", "D"]
+
+
+@pytest.mark.parametrize("kind", KINDS)
+@pytest.mark.parametrize("seed", range(10))
+def test_arrow_network_keeps_precedence(kind, seed):
+    activities = generateNetwork(kind, 60, seed=seed)
+    predecessors = predecessorsOf(activities)
+    network = toArrowNetwork(predecessors)
+
+    events = nx.DiGraph()
+    events.add_nodes_from(range(1, network.event_count + 1))
+    for _, start, end in network.arcs():
+        assert start < end
+        events.add_edge(start, end)
+    assert [event for event, degree in events.in_degree if degree == 0] == [1]
+    assert [event for event, degree in events.out_degree if degree == 0] == [network.event_count]
+
+    # b follows a in the AOA network exactly when a is an ancestor of b
+    closure = nx.transitive_closure_dag(digraph(predecessors))
+    reach = nx.transitive_closure_dag(events)
+    for a, (_, a_end) in network.activities.items():
+        for b, (b_start, _) in network.activities.items():
+            if a != b:
+                follows = a_end == b_start or reach.has_edge(a_end, b_start)
+                assert follows == closure.has_edge(a, b), (a, b)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_arrow_network_duration_matches_calculate(seed):
+    activities = generateNetwork("random", 100, seed=seed)
+    network = toArrowNetwork(predecessorsOf(activities))
+    cpm = CPM(activities)
+    cpm.calculate()
+
+    time = [0.0] * (network.event_count + 1)
+    arcs = sorted(((start, end, activities[name].duration if name in activities else 0)
+                   for name, start, end in network.arcs()))
+    for start, end, duration in arcs:
+        time[end] = max(time[end], time[start] + duration)
+    assert time[network.event_count] == pytest.approx(cpm.project_duration)
@@ -0,0 +1,129 @@
+import copy
+import random
+import pytest
+from CPM.activity import LINK_TYPES, Activity, formatLink, parseLink, parsePredecessorformat
+from CPM.cpm import CPM
+from CPM.generator import randomDag
+
+
+def withRandomLinks(seed, count=40):
+    rng = random.Random(seed)
+    activities = randomDag(count, seed=seed, window=10)
+    for act in activities.values():
+        for pred in act.predecessors:
+            if rng.random() < 0.6:
+                act.links[pred] = (rng.choice(LINK_TYPES), rng.randint(-3, 4))
+    return activities
+
+
+def bound(link, pred_start, pred_finish):
+    """
+    (side of the successor, earliest time) required by a link.
+    """
+    kind, lag = link
+    return ("start" if kind in ("FS", "SS") else "finish",
+            (pred_finish if kind in ("FS", "FF") else pred_start) + lag)
+
+
+def assertEarliestAndLatest(cpm):
+    """
+    Every link holds for both schedules, and every time that is not at its
+    limit (0 or the project end) is held there by some link.
+    """
+    end = cpm.project_duration
+    successors = cpm.successors()
+    for name, act in cpm.activities.items():
+        assert act.EF == act.ES + act.duration and act.LF == act.LS + act.duration
+        assert 0 <= act.ES <= act.LS and act.LF <= end
+
+        early_binding = act.ES == 0
+        for pred_name in act.predecessors:
+            pred = cpm.activities[pred_name]
+            side, time = bound(act.link(pred_name), pred.ES, pred.EF)
+            mine = act.ES if side == "start" else act.EF
+            assert mine >= time, (pred_name, name)
+            early_binding |= mine == time
+            side, time = bound(act.link(pred_name), pred.LS, pred.LF)
+            assert (act.LS if side == "start" else act.LF) >= time, (pred_name, name)
+        assert early_binding, name
+
+        late_binding = act.LF == end
+        for succ_name in successors[name]:
+            succ = cpm.activities[succ_name]
+            side, time = bound(succ.link(name), act.LS, act.LF)
+            late_binding |= (succ.LS if side == "start" else succ.LF) == time
+        assert late_binding, name
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_random_links(seed):
+    cpm = CPM(withRandomLinks(seed))
+    cpm.calculate()
+    assertEarliestAndLatest(cpm)
+    assert cpm.critical_path
+
+
+@pytest.mark.parametrize("kind, lag, expected_start", [
+    ("FS", 0, 5), ("FS", 2, 7), ("FS", -2, 3),
+    ("SS", 0, 0), ("SS", 2, 2),
+    ("FF", 0, 2), ("FF", 1, 3),
+    ("SF", 4, 1), ("SF", 0, 0),
+])
+def test_each_link_type(kind, lag, expected_start):
+    # A(5) -> B(3)
+    activities = parsePredecessorformat({"A": {"duration": "5"},
+                                         "B": {"duration": "3", "predecessors": [formatLink("A", kind, lag)]}})
+    cpm = CPM(activities)
+    cpm.calculate()
+    assert cpm.activities["B"].ES == expected_start
+    assert cpm.project_duration == max(5, expected_start + 3)
+    assertEarliestAndLatest(cpm)
+
+
+@pytest.mark.parametrize("token, expected", [
+    ("A", ("A", ("FS", 0))),
+    ("A:SS", ("A", ("SS", 0))),
+    ("A:ss+2", ("A", ("SS", 2))),
+    ("A:FF-1", ("A", ("FF", -1))),
+    ("A:+3", ("A", ("FS", 3))),
+    ("A:SF+1.5", ("A", ("SF", 1.5))),
+])
+def test_parse_link(token, expected):
+    assert parseLink(token) == expected
+    name, (kind, lag) = expected
+    assert parseLink(formatLink(name, kind, lag)) == expected
+
+
+@pytest.mark.parametrize("token", ["A:XX", ":SS", "A:SS+"])
+def test_parse_link_rejects(token):
+    with pytest.raises(ValueError, match="must be written as"):
+        parseLink(token)
+
+
+def test_links_survive_csv(tmp_path):
+    cpm = CPM(withRandomLinks(2, count=20))
+    cpm.calculate()
+    cpm.save_to_csv(tmp_path / "project.csv")
+    loaded = CPM()
+    loaded.read_from_csv(tmp_path / "project.csv")
+    assert {name: act.links for name, act in loaded.activities.items()} == \
+           {name: act.links for name, act in cpm.activities.items()}
+    loaded.calculate()
+    assert loaded.project_duration == cpm.project_duration
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_recalculate_with_links(seed):
+    rng = random.Random(seed)
+    cpm = CPM(withRandomLinks(seed))
+    cpm.calculate()
+    for _ in range(5):
+        name = rng.choice(list(cpm.activities))
+        cpm.activities[name].duration = rng.randint(0, 12)
+        cpm.recalculate([name])
+        expected = copy.deepcopy(cpm)
+        expected.calculate()
+        for other, act in expected.activities.items():
+            mine = cpm.activities[other]
+            assert (mine.ES, mine.EF, mine.LS, mine.LF, mine.free_float) == \
+                   (act.ES, act.EF, act.LS, act.LF, act.free_float), other
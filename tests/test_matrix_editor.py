@@ -0,0 +1,53 @@
+import tkinter as tk
+import numpy as np
+import pytest
+from Broker.matrix_editor import MatrixEditor
+
+
+@pytest.fixture
+def root():
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        pytest.skip("Tk needs a display")
+    root.withdraw()
+    yield root
+    root.destroy()
+
+
+def test_parse_block_accepts_excel_and_csv_text():
+    assert MatrixEditor.parseBlock("1\t2,5\n3\t4\n").tolist() == [[1, 2.5], [3, 4]]
+    assert MatrixEditor.parseBlock("1, 2\n3 4").tolist() == [[1, 2], [3, 4]]
+    with pytest.raises(ValueError):
+        MatrixEditor.parseBlock("1 2\n3")
+
+
+def test_invalid_edit_blocks_values_until_corrected(root, monkeypatch):
+    monkeypatch.setattr("tkinter.messagebox.showerror", lambda *args: None)
+    changes = []
+    editor = MatrixEditor(root, np.zeros((2, 2)), on_change=lambda: changes.append(1))
+
+    editor.edit(0, 1)
+    editor.editor[0].delete(0, "end")
+    editor.editor[0].insert(0, "abc")
+    with pytest.raises(ValueError, match="O1/D2"):
+        editor.values()
+    with pytest.raises(ValueError):
+        editor.values()
+
+    editor.edit(0, 1)
+    editor.editor[0].delete(0, "end")
+    editor.editor[0].insert(0, "7")
+    assert editor.values().tolist() == [[0, 7], [0, 0]]
+    assert changes
+
+
+def test_pasted_block_replaces_invalid_cells(root, monkeypatch):
+    monkeypatch.setattr("tkinter.messagebox.showerror", lambda *args: None)
+    editor = MatrixEditor(root, np.zeros((2, 2)))
+    editor.edit(1, 1)
+    editor.editor[0].delete(0, "end")
+    editor.editor[0].insert(0, "x")
+    editor._commitEdit()
+    editor.setBlock([[1, 2], [3, 4]])
+    assert editor.values().tolist() == [[1, 2], [3, 4]]
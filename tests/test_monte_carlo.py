@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+from CPM.activity import Activity
+from CPM.cpm import CPM
+from CPM.generator import randomDag
+from CPM.monte_carlo import runMonteCarlo
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_zero_variance_matches_cpm(seed):
+    cpm = CPM(randomDag(60, seed=seed))
+    cpm.calculate()
+    # Degenerate PERT estimates for half of the activities, fixed durations for the rest
+    distributions = {name: ("pert", act.duration, act.duration, act.duration)
+                     for name, act in list(cpm.activities.items())[::2]}
+
+    result = runMonteCarlo(cpm, distributions, samples=500, seed=seed, chunk_size=128)
+    assert np.all(result.completion == cpm.project_duration)
+    assert result.probability(cpm.project_duration) == 1
+    assert result.probability(cpm.project_duration - 0.5) == 0
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_criticality_matches_critical_path(seed):
+    cpm = CPM(randomDag(60, seed=seed))
+    cpm.calculate()
+
+    result = runMonteCarlo(cpm, {}, samples=100, seed=seed)
+    critical = {name for name, index in result.criticality.items() if index == 1}
+    assert critical == set(cpm.critical_path)
+    assert all(index in (0, 1) for index in result.criticality.values())
+
+
+def test_serial_chain_mean_matches_pert():
+    estimates = [(2, 4, 9), (1, 3, 5), (3, 3, 12), (4, 6, 7)]
+    activities = {f"a{i}": Activity(f"a{i}", 0, [f"a{i - 1}"] if i else [], estimates=abc)
+                  for i, abc in enumerate(estimates)}
+    cpm = CPM(activities)
+    cpm.calculate()
+
+    result = runMonteCarlo(cpm, {}, samples=200000, seed=7)
+    # The Beta-PERT mean is (a + 4m + b) / 6, so the chain's mean is the PERT duration
+    assert result.completion.mean() == pytest.approx(cpm.project_duration, rel=2e-3)
+    assert result.criticality == {name: 1 for name in activities}
+
+
+def test_seed_is_reproducible():
+    cpm = CPM(randomDag(30, seed=1))
+    distributions = {name: ("triangular", act.duration / 2, act.duration, act.duration * 2)
+                     for name, act in cpm.activities.items()}
+    first = runMonteCarlo(cpm, distributions, samples=1000, seed=3, chunk_size=300)
+    second = runMonteCarlo(cpm, distributions, samples=1000, seed=3, chunk_size=300)
+    assert np.array_equal(first.completion, second.completion)
+    assert first.criticality == second.criticality
+
+
+def test_unknown_distribution():
+    cpm = CPM({"A": Activity("A", 1)})
+    with pytest.raises(ValueError, match="Unknown distribution 'uniform'"):
+        runMonteCarlo(cpm, {"A": ("uniform", 0, 1)}, samples=10)
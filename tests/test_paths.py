@@ -0,0 +1,90 @@
+import networkx as nx
+import pytest
+from CPM.activity import Activity
+from CPM.cpm import CPM
+from CPM.generator import generateNetwork
+from CPM.paths import countCriticalPaths, criticalPaths, longestPaths, nearCriticalPaths
+
+
+def calculated(kind, count, seed, max_duration=9):
+    cpm = CPM(generateNetwork(kind, count, seed=seed, max_duration=max_duration))
+    cpm.calculate()
+    return cpm
+
+
+def allPaths(cpm):
+    """
+    Every start-to-finish path as (length, [names]), longest first.
+    """
+    G = nx.DiGraph()
+    G.add_nodes_from(cpm.activities)
+    G.add_edges_from((pred, name) for name, act in cpm.activities.items() for pred in act.predecessors)
+    sources = [name for name in G if G.in_degree(name) == 0]
+    sinks = [name for name in G if G.out_degree(name) == 0]
+    paths = []
+    for source in sources:
+        for sink in sinks:
+            paths.extend(nx.all_simple_paths(G, source, sink) if source != sink else [[source]])
+    measured = [(sum(cpm.activities[name].duration for name in path), path) for path in paths]
+    return sorted(measured, key=lambda item: -item[0])
+
+
+@pytest.mark.parametrize("kind", ["random", "layered", "series-parallel"])
+@pytest.mark.parametrize("seed", range(8))
+def test_longest_paths_match_brute_force(kind, seed):
+    cpm = calculated(kind, 25, seed)
+    expected = allPaths(cpm)
+    k = 15
+    found = longestPaths(cpm, k)
+
+    assert [length for length, _ in found] == [length for length, _ in expected[:k]]
+    assert found[0][0] == cpm.project_duration
+    # Paths of equal length may come in any order, but each must be a real, distinct path
+    real = {tuple(path): length for length, path in expected}
+    assert len({tuple(path) for _, path in found}) == len(found)
+    for length, path in found:
+        assert real[tuple(path)] == length
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_near_critical_and_critical_paths_match_brute_force(seed):
+    cpm = calculated("random", 25, seed, max_duration=3)
+    expected = allPaths(cpm)
+    threshold = 2
+
+    near = nearCriticalPaths(cpm, threshold)
+    assert sorted(map(tuple, (path for _, path in near))) == \
+        sorted(tuple(path) for length, path in expected if length >= cpm.project_duration - threshold)
+
+    critical = [path for length, path in expected if length == cpm.project_duration]
+    assert sorted(map(tuple, criticalPaths(cpm))) == sorted(map(tuple, critical))
+    assert countCriticalPaths(cpm) == len(critical)
+
+
+def test_parallel_critical_branches_are_separate_paths():
+    cpm = CPM({
+        "A": Activity("A", 2),
+        "B": Activity("B", 3, ["A"]),
+        "C": Activity("C", 3, ["A"]),
+        "D": Activity("D", 1, ["A"]),
+        "E": Activity("E", 1, ["B", "C", "D"]),
+    })
+    cpm.calculate()
+    assert sorted(criticalPaths(cpm)) == [["A", "B", "E"], ["A", "C", "E"]]
+    assert countCriticalPaths(cpm) == 2
+
+
+def test_exponential_number_of_paths_is_not_enumerated():
+    # 60 diamonds in a row: 2**60 critical paths
+    activities = {"S": Activity("S", 1)}
+    previous = "S"
+    for i in range(60):
+        activities[f"U{i}"] = Activity(f"U{i}", 1, [previous])
+        activities[f"L{i}"] = Activity(f"L{i}", 1, [previous])
+        activities[f"J{i}"] = Activity(f"J{i}", 1, [f"U{i}", f"L{i}"])
+        previous = f"J{i}"
+    cpm = CPM(activities)
+    cpm.calculate()
+    assert countCriticalPaths(cpm) == 2 ** 60
+    paths = longestPaths(cpm, 5)
+    assert len(paths) == 5 and all(length == cpm.project_duration for length, _ in paths)
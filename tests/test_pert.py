@@ -0,0 +1,100 @@
+import math
+import pytest
+from CPM.activity import Activity, parseDuration, parsePredecessorformat
+from CPM.cpm import CPM, normalCdf
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("5", (5, None)),
+    ("2.5", (2.5, None)),
+    ("0", (0, None)),
+    ("2/4/9", (4.5, (2, 4, 9))),
+    (" 1 / 1 / 1 ", (1, (1, 1, 1))),
+    ("0/0/6", (1, (0, 0, 6))),
+    ((2, 4, 9), (4.5, (2, 4, 9))),
+    (7, (7, None)),
+])
+def test_parse_duration(value, expected):
+    duration, estimates = parseDuration(value)
+    assert duration == pytest.approx(expected[0])
+    assert estimates == expected[1]
+
+
+@pytest.mark.parametrize("value, message", [
+    ("abc", "must be a number or 'a/m/b' estimates"),
+    ("1/2", "must have three values"),
+    ("1/2/3/4", "must have three values"),
+    ("-1", "must not be negative"),
+    ("-1/2/3", "0 <= optimistic <= most likely <= pessimistic"),
+    ("4/2/9", "0 <= optimistic <= most likely <= pessimistic"),
+    ("2/9/4", "0 <= optimistic <= most likely <= pessimistic"),
+    ((3, 2, 1), "0 <= optimistic <= most likely <= pessimistic"),
+])
+def test_parse_duration_rejects(value, message):
+    with pytest.raises(ValueError, match=message):
+        parseDuration(value)
+    with pytest.raises(ValueError, match=f"{message}.* in activity X$"):
+        parseDuration(value, "X")
+
+
+@pytest.mark.parametrize("value", ["-1/2/3", "4/2/9", "1/2", "-3"])
+def test_csv_rejects_what_the_tables_reject(tmp_path, value):
+    cpm = CPM({"A": Activity("A", 1), "B": Activity("B", 2, ["A"])})
+    cpm.calculate()
+    cpm.save_to_csv(tmp_path / "project.csv")
+    text = (tmp_path / "project.csv").read_text().replace("B\t2\t", f"B\t{value}\t")
+    (tmp_path / "project.csv").write_text(text)
+
+    with pytest.raises(ValueError) as from_csv:
+        CPM().read_from_csv(tmp_path / "project.csv")
+    with pytest.raises(ValueError) as from_table:
+        parsePredecessorformat({"B": {"duration": value, "predecessors": []}})
+    assert str(from_csv.value) == str(from_table.value)
+    assert str(from_csv.value).endswith("in activity B")
+
+
+def test_pert_estimates_survive_csv(tmp_path):
+    activities = parsePredecessorformat({"A": {"duration": "2/4/9"}, "B": {"duration": "1.5/2/3", "predecessors": ["A"]}})
+    cpm = CPM(activities)
+    cpm.calculate()
+    cpm.save_to_csv(tmp_path / "project.csv")
+
+    loaded = CPM()
+    loaded.read_from_csv(tmp_path / "project.csv")
+    assert loaded.activities["A"].estimates == (2, 4, 9)
+    assert loaded.activities["B"].estimates == (1.5, 2, 3)
+    loaded.calculate()
+    assert loaded.project_duration == pytest.approx(cpm.project_duration)
+    assert loaded.project_variance == pytest.approx(cpm.project_variance)
+
+
+def test_deadline_probability_follows_the_critical_path():
+    activities = parsePredecessorformat({
+        "A": {"duration": "2/4/9"},
+        "B": {"duration": "1/3/5", "predecessors": ["A"]},
+        "C": {"duration": "1/2/3"},
+        "D": {"duration": "3/3/12", "predecessors": ["B", "C"]},
+    })
+    cpm = CPM(activities)
+    cpm.calculate()
+    assert cpm.critical_path == ["A", "B", "D"]
+    assert cpm.project_duration == pytest.approx(4.5 + 3 + 4.5)
+    assert cpm.project_variance == pytest.approx((7 / 6) ** 2 + (4 / 6) ** 2 + (9 / 6) ** 2)
+
+    sigma = math.sqrt(cpm.project_variance)
+    assert cpm.deadlineProbability(cpm.project_duration) == pytest.approx(0.5)
+    assert cpm.deadlineProbability(cpm.project_duration + sigma) == pytest.approx(0.8413447, abs=1e-6)
+    deadlines = [10, 12, 14, 16]
+    assert cpm.deadlineProbability(deadlines) == pytest.approx(
+        [normalCdf((d - cpm.project_duration) / sigma) for d in deadlines])
+
+
+def test_deadline_probability_without_variance():
+    cpm = CPM({"A": Activity("A", 3), "B": Activity("B", 4, ["A"])})
+    cpm.calculate()
+    assert list(cpm.deadlineProbability([6.5, 7, 8])) == [0, 1, 1]
+
+
+def test_normal_cdf():
+    for x, expected in [(0, 0.5), (1, 0.8413447), (-1.96, 0.0249979), (3, 0.9986501)]:
+        assert normalCdf(x) == pytest.approx(expected, abs=2e-7)
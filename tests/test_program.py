@@ -0,0 +1,85 @@
+import random
+import pytest
+from common.profiling import profile
+from CPM.cpm import CPM
+from CPM.generator import randomDag
+from CPM.program import Program
+
+
+def build(count, size, links, seed, **options):
+    rng = random.Random(seed)
+    program = Program(**options)
+    for k in range(count):
+        program.addSubProject(f"S{k}", randomDag(size, seed=seed * 100 + k, window=8))
+    for _ in range(links):
+        source, target = sorted(rng.sample(range(count), 2))
+        program.link(f"S{source}", f"a{rng.randrange(size)}", f"S{target}", f"a{rng.randrange(size)}")
+    return program
+
+
+def solved(program):
+    with profile() as profiler:
+        result = program.schedule()
+    return result, profiler.summary().get("cpm.program.solved", {}).get("total", 0)
+
+
+def checkAgainstFlatten(program, result):
+    flat = CPM(program.flatten())
+    flat.calculate()
+    activities = flat.activities
+    assert result.duration == pytest.approx(flat.project_duration)
+    for (sub, name), finish in result.finish.items():
+        assert finish == pytest.approx(activities[f"{sub}.{name}"].EF)
+        assert result.reserve[sub, name] == pytest.approx(activities[f"{sub}.{name}"].reserve)
+    for (sub, name), ready in result.ready.items():
+        assert ready <= activities[f"{sub}.{name}"].ES + 1e-9
+    for sub, end in result.end.items():
+        assert end == pytest.approx(max(activities[f"{sub}.{name}"].EF for name in program.subprojects[sub]))
+    for (source, target), slack in result.link_float.items():
+        assert slack == pytest.approx(activities[".".join(target)].LS - activities[".".join(source)].EF)
+
+
+@pytest.mark.parametrize("seed", range(15))
+def test_schedule_matches_flattened_network(seed):
+    program = build(5, 30, 8, seed)
+    result, _ = solved(program)
+    checkAgainstFlatten(program, result)
+
+
+def test_only_changed_sub_projects_are_solved_again():
+    program = build(4, 25, 6, 1)
+    assert solved(program)[1] == 4
+    assert solved(program)[1] == 0
+
+    # Edited in place, without adding the sub-project again
+    program.subprojects["S2"]["a3"].duration += 5
+    result, count = solved(program)
+    assert count == 1
+    checkAgainstFlatten(program, result)
+
+    # A new link changes the boundary of both ends
+    program.link("S0", "a1", "S3", "a2")
+    result, count = solved(program)
+    assert count == 2
+    checkAgainstFlatten(program, result)
+
+
+def test_cache_keeps_the_most_recently_used_summaries():
+    program = build(3, 20, 3, 2, cache_size=4)
+    solved(program)
+    activity = program.subprojects["S0"]["a0"]
+    for _ in range(5):
+        activity.duration += 1
+        solved(program)
+        assert len(program.cache) <= 4
+    # The current summaries are kept even when the cache is smaller than the program
+    small = build(3, 20, 3, 2, cache_size=1)
+    solved(small)
+    assert len(small.cache) == 3 and solved(small)[1] == 0
+
+
+def test_cache_is_shared_between_programs():
+    first = build(3, 20, 3, 4)
+    solved(first)
+    second = build(3, 20, 3, 4, cache=first.cache)
+    assert solved(second)[1] == 0
@@ -0,0 +1,137 @@
+import copy
+import random
+from datetime import datetime
+import pytest
+from CPM.activity import Activity
+from CPM.cpm import CPM
+from CPM.generator import randomDag
+from CPM.progress import ProgressFeed, parseProgressLines
+
+FIELDS = ("ES", "EF", "LS", "LF", "reserve", "free_float", "interfering_float", "independent_float")
+
+
+def assertSameSchedule(cpm):
+    expected = copy.deepcopy(cpm)
+    expected.calculate()
+    for name, act in expected.activities.items():
+        mine = cpm.activities[name]
+        for field in FIELDS:
+            assert getattr(mine, field) == pytest.approx(getattr(act, field)), (name, field)
+    assert cpm.project_duration == pytest.approx(expected.project_duration)
+    assert cpm.critical_path == expected.critical_path
+
+
+def randomUpdates(rng, cpm, status_time):
+    """
+    Progress on a few activities that could have started by the status time.
+    """
+    candidates = [name for name, act in cpm.activities.items()
+                  if act.actual_finish is None and act.ES <= status_time]
+    updates = {}
+    for name in rng.sample(candidates, min(len(candidates), 3)):
+        act = cpm.activities[name]
+        start = act.actual_start if act.actual_start is not None else act.ES + rng.choice([0, 0, 1])
+        if rng.random() < 0.5:
+            updates[name] = {"actual_start": start, "actual_finish": start + max(1, act.duration + rng.randint(-2, 3))}
+        else:
+            updates[name] = {"actual_start": start, "percent_complete": rng.choice([10, 25, 50, 80])}
+    return updates
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_status_updates_match_calculate(seed):
+    rng = random.Random(seed)
+    cpm = CPM(randomDag(60, seed=seed, window=10))
+    cpm.calculate()
+    status_time = 0
+    for _ in range(6):
+        status_time += rng.randint(1, 5)
+        cpm.statusUpdate(randomUpdates(rng, cpm, status_time), status_time)
+        assertSameSchedule(cpm)
+    # Progress without moving the status time
+    cpm.statusUpdate(randomUpdates(rng, cpm, status_time))
+    assertSameSchedule(cpm)
+
+
+def test_remaining_work_after_the_status_time():
+    cpm = CPM({"A": Activity("A", 4), "B": Activity("B", 2, ["A"]), "C": Activity("C", 3)})
+    cpm.calculate()
+    cpm.statusUpdate({"A": {"actual_start": 0, "percent_complete": 50}}, status_time=3)
+    a, b, c = (cpm.activities[name] for name in "ABC")
+    # Half of A was due by t = 2; the other half resumes at the status time
+    assert (a.ES, a.EF) == (0, 5)
+    assert (b.ES, b.EF) == (5, 7)
+    # C has not started, so it cannot start before the status time either
+    assert (c.ES, c.EF) == (3, 6)
+    assert cpm.project_duration == 7
+
+
+def test_unknown_activity():
+    cpm = CPM({"A": Activity("A", 1)})
+    cpm.calculate()
+    with pytest.raises(ValueError, match="unknown activities: X"):
+        cpm.statusUpdate({"X": {"percent_complete": 10}})
+
+
+def test_parse_progress_lines():
+    lines = ["# field report", "", "A\t0\t\t50", "B\t1", "@status\t4", "A\t\t3.5", "B\t\t\t20"]
+    updates, status_time = parseProgressLines(lines)
+    assert updates == {"A": {"actual_start": 0, "percent_complete": 50, "actual_finish": 3.5},
+                       "B": {"actual_start": 1, "percent_complete": 20}}
+    assert status_time == 4
+
+    updates, _ = parseProgressLines(["A\t2026-10-20 12:00"], start_date=datetime(2026, 10, 19))
+    assert updates == {"A": {"actual_start": 1.5}}
+
+    with pytest.raises(ValueError, match="Line 2 of the progress feed: .* must be a number"):
+        parseProgressLines(["A\t1", "B\t2026-10-20"])
+    with pytest.raises(ValueError, match="Line 1 .*must give the status time"):
+        parseProgressLines(["@status\t"])
+
+
+def test_progress_feed_reads_appended_lines(tmp_path):
+    cpm = CPM({"A": Activity("A", 4), "B": Activity("B", 2, ["A"])})
+    cpm.calculate()
+    path = tmp_path / "progress.txt"
+    path.write_text("")
+    feed = ProgressFeed(cpm, path)
+    assert feed.poll() == 0
+
+    with open(path, "a") as file:
+        file.write("A\t0\t\t50\n@status\t3\nB\t")  # the B line is still being written
+    assert feed.poll() == 1
+    assert cpm.activities["A"].percent_complete == 50
+    assert cpm.status_time == 3
+    assert cpm.project_duration == 7
+    assert cpm.activities["B"].actual_start is None
+
+    with open(path, "a") as file:
+        file.write("5\nA\t\t5\n")
+    assert feed.poll() == 2
+    assert cpm.activities["A"].actual_finish == 5
+    assert cpm.activities["B"].actual_start == 5
+    assert feed.poll() == 0
+    assertSameSchedule(cpm)
+
+    # A replaced (shorter) file is read from the start
+    path.write_text("B\t\t6\n")
+    assert feed.poll() == 1
+    assert cpm.activities["B"].actual_finish == 6
+
+
+def test_progress_survives_csv(tmp_path):
+    cpm = CPM(randomDag(20, seed=5, window=5))
+    cpm.calculate()
+    cpm.statusUpdate(randomUpdates(random.Random(5), cpm, 6), status_time=6)
+    cpm.save_to_csv(tmp_path / "project.csv")
+    header = (tmp_path / "project.csv").read_text().splitlines()[0].split("\t")
+    assert len(header) == 19
+
+    loaded = CPM()
+    loaded.read_from_csv(tmp_path / "project.csv")
+    for name, act in cpm.activities.items():
+        mine = loaded.activities[name]
+        assert (mine.actual_start, mine.actual_finish, mine.percent_complete) == \
+               (act.actual_start, act.actual_finish, act.percent_complete), name
+        assert (mine.ES, mine.EF, mine.LS, mine.LF, mine.reserve, mine.free_float) == \
+               (act.ES, act.EF, act.LS, act.LF, act.reserve, act.free_float), name
@@ -0,0 +1,57 @@
+import copy
+import random
+import pytest
+from CPM.cpm import CPM
+from CPM.generator import generateNetwork
+
+FIELDS = ("ES", "EF", "LS", "LF", "reserve", "free_float", "interfering_float", "independent_float")
+
+
+def assertSameSchedule(cpm, expected):
+    for name, act in expected.activities.items():
+        mine = cpm.activities[name]
+        for field in FIELDS:
+            assert getattr(mine, field) == pytest.approx(getattr(act, field)), (name, field)
+    assert cpm.project_duration == pytest.approx(expected.project_duration)
+    assert cpm.project_variance == pytest.approx(expected.project_variance)
+    assert cpm.critical_path == expected.critical_path
+
+
+def fullyCalculated(cpm):
+    expected = copy.deepcopy(cpm)
+    expected.calculate()
+    return expected
+
+
+@pytest.mark.parametrize("kind", ["random", "layered", "series-parallel"])
+@pytest.mark.parametrize("seed", range(6))
+def test_recalculate_matches_calculate(kind, seed):
+    rng = random.Random(seed)
+    cpm = CPM(generateNetwork(kind, 80, seed=seed))
+    cpm.calculate()
+    names = list(cpm.activities)
+    for _ in range(10):
+        changed = rng.sample(names, rng.randint(1, 4))
+        for name in changed:
+            # Both longer and shorter, including zero
+            cpm.activities[name].duration = rng.randint(0, 15)
+        cpm.recalculate(changed)
+        assertSameSchedule(cpm, fullyCalculated(cpm))
+
+
+def test_recalculate_with_pert_estimates():
+    rng = random.Random(3)
+    cpm = CPM(generateNetwork("random", 40, seed=3))
+    cpm.calculate()
+    for _ in range(10):
+        name = rng.choice(list(cpm.activities))
+        a = rng.randint(0, 5)
+        cpm.activities[name].setEstimates(a, a + rng.randint(0, 5), a + rng.randint(5, 12))
+        cpm.recalculate([name])
+        assertSameSchedule(cpm, fullyCalculated(cpm))
+
+
+def test_recalculate_before_calculate():
+    cpm = CPM(generateNetwork("random", 20, seed=1))
+    cpm.recalculate(["a3"])
+    assertSameSchedule(cpm, fullyCalculated(cpm))
@@ -0,0 +1,65 @@
+import random
+import pytest
+from CPM.cpm import CPM
+from CPM.generator import assignResources, randomDag
+from CPM.resources import ResourceProfile, scheduleResources
+
+
+def naiveEarliestStart(usage, capacity, start, duration, demand):
+    t = start
+    while any(usage[s] + demand > capacity for s in range(t, t + duration)):
+        t += 1
+    return t
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_profile_matches_plain_usage_list(seed):
+    rng = random.Random(seed)
+    horizon, capacity = 50, 6
+    profile = ResourceProfile(capacity, horizon)
+    usage = [0] * (profile.size + horizon)
+    for _ in range(40):
+        start = rng.randrange(horizon)
+        end = rng.randint(start + 1, horizon)
+        amount = rng.randint(1, 3)
+        profile.add(start, end, amount)
+        for t in range(start, end):
+            usage[t] += amount
+
+        assert profile.usage(horizon) == usage[:horizon]
+        low = rng.randrange(horizon)
+        high = rng.randint(low + 1, horizon)
+        assert profile.maxUsage(low, high) == max(usage[low:high])
+        begin, duration, demand = rng.randrange(horizon), rng.randint(1, 8), rng.randint(1, capacity)
+        assert profile.earliestStart(begin, duration, demand) == \
+            naiveEarliestStart(usage, capacity, begin, duration, demand)
+
+
+@pytest.mark.parametrize("rule", ["LS", "LF", "reserve", "ES"])
+@pytest.mark.parametrize("seed", range(5))
+def test_schedule_respects_links_and_capacities(rule, seed):
+    capacities = {"crew": 4, "crane": 2}
+    activities = assignResources(randomDag(120, seed=seed, window=15), capacities, seed=seed)
+    cpm = CPM(activities)
+    schedule = scheduleResources(cpm, capacities, rule)
+
+    for name, act in activities.items():
+        assert schedule.start[name] >= act.ES
+        assert schedule.finish[name] - schedule.start[name] == act.duration
+        for pred in act.predecessors:
+            assert schedule.start[name] >= schedule.finish[pred]
+    for resource, capacity in capacities.items():
+        usage = [0] * (schedule.makespan + 1)
+        for name, act in activities.items():
+            for t in range(schedule.start[name], schedule.finish[name]):
+                usage[t] += act.resources.get(resource, 0)
+        assert max(usage) <= capacity
+        assert schedule.profiles[resource].usage(schedule.makespan) == usage[:schedule.makespan]
+
+
+def test_schedule_without_conflicts_keeps_early_starts():
+    activities = assignResources(randomDag(60, seed=7), {"crew": 1000}, seed=7)
+    cpm = CPM(activities)
+    schedule = scheduleResources(cpm, {"crew": 1000})
+    assert schedule.delays(cpm) == {}
+    assert schedule.makespan == cpm.project_duration
@@ -0,0 +1,72 @@
+import tkinter as tk
+import pytest
+from CPM.cpm import CPM
+from CPM.generator import randomDag
+from CPM.table import ResultsTable
+
+
+@pytest.fixture
+def root():
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        pytest.skip("Tk needs a display")
+    root.withdraw()
+    yield root
+    root.destroy()
+
+
+@pytest.fixture
+def table(root, monkeypatch):
+    monkeypatch.setattr(ResultsTable, "CHUNK_SIZE", 7)
+    cpm = CPM(randomDag(50, seed=4))
+    cpm.calculate()
+    table = ResultsTable(root, cpm)
+    while len(table.rows) < len(cpm.activities):
+        table._loadChunk()
+    return table
+
+
+def shown(table):
+    return [table.tree.item(item, "values") for item in table.items]
+
+
+def test_items_are_reused_while_scrolling(table):
+    assert len(table.tree.get_children()) == ResultsTable.VISIBLE_ROWS
+    assert [values[0] for values in shown(table)] == [f"a{i}" for i in range(ResultsTable.VISIBLE_ROWS)]
+
+    table.scrollTo(40)
+    # The last page is full: the offset stops at len(view) - VISIBLE_ROWS
+    assert table.offset == 50 - ResultsTable.VISIBLE_ROWS
+    assert shown(table)[-1][0] == "a49"
+    assert len(table.tree.get_children()) == ResultsTable.VISIBLE_ROWS
+
+
+def test_filter_and_sort(table):
+    critical = set(table.results.critical_path)
+    table.critical_filter.set("Critical")
+    table.applyFilter()
+    assert {table.rows[i][0] for i in table.view} == critical
+
+    table.critical_filter.set("All")
+    table.reserve_entry.insert(0, "3")
+    table.sortBy("ES")
+    rows = [table.rows[i] for i in table.view]
+    assert all(row[5] <= 3 for row in rows)
+    assert [row[1] for row in rows] == sorted(row[1] for row in rows)
+
+    table.sortBy("ES")
+    assert [table.rows[i][1] for i in table.view] == sorted((row[1] for row in rows), reverse=True)
+
+
+def test_rows_loaded_later_follow_the_filter(root, monkeypatch):
+    monkeypatch.setattr(ResultsTable, "CHUNK_SIZE", 7)
+    cpm = CPM(randomDag(50, seed=4))
+    cpm.calculate()
+    table = ResultsTable(root, cpm)
+    table._loadChunk()
+    table.critical_filter.set("Non-critical")
+    table.applyFilter()
+    while len(table.rows) < len(cpm.activities):
+        table._loadChunk()
+    assert {table.rows[i][0] for i in table.view} == set(cpm.activities) - set(cpm.critical_path)
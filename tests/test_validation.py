@@ -0,0 +1,66 @@
+import random
+import networkx as nx
+import pytest
+from CPM.cpm import CPM
+from CPM.generator import randomDag
+from CPM.validation import NetworkError, findCycles, stronglyConnectedComponents, validateNetwork
+
+
+def randomDigraph(count, edges, seed):
+    rng = random.Random(seed)
+    successors = {f"n{i}": [] for i in range(count)}
+    for _ in range(edges):
+        a, b = rng.randrange(count), rng.randrange(count)
+        successors[f"n{a}"].append(f"n{b}")
+    return successors
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_strongly_connected_components_match_networkx(seed):
+    successors = randomDigraph(60, 80, seed)
+    G = nx.DiGraph()
+    G.add_nodes_from(successors)
+    G.add_edges_from((a, b) for a, succs in successors.items() for b in succs)
+
+    components = stronglyConnectedComponents(successors)
+    assert sorted(map(sorted, components)) == sorted(map(sorted, nx.strongly_connected_components(G)))
+    # Successors come before predecessors
+    position = {name: k for k, component in enumerate(components) for name in component}
+    for a, succs in successors.items():
+        for b in succs:
+            assert position[b] <= position[a]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_find_cycles_reports_every_cyclic_group(seed):
+    successors = randomDigraph(40, 50, seed)
+    predecessors = {name: [] for name in successors}
+    for a, succs in successors.items():
+        for b in succs:
+            predecessors[b].append(a)
+
+    G = nx.DiGraph()
+    G.add_nodes_from(successors)
+    G.add_edges_from((a, b) for a, succs in successors.items() for b in succs)
+    expected = [set(c) for c in nx.strongly_connected_components(G)
+                if len(c) > 1 or G.has_edge(next(iter(c)), next(iter(c)))]
+
+    cycles = findCycles(predecessors)
+    assert sorted(map(sorted, (members for members, _ in cycles))) == sorted(map(sorted, expected))
+    for members, path in cycles:
+        assert path[0] == path[-1] and set(path) <= set(members)
+        assert all(G.has_edge(a, b) for a, b in zip(path, path[1:]))
+
+
+def test_validate_network_lists_unknown_predecessors_and_cycles():
+    predecessors = {"A": ["C"], "B": ["A"], "C": ["B"], "D": ["X"], "E": ["E"]}
+    with pytest.raises(NetworkError) as error:
+        validateNetwork(predecessors)
+    assert error.value.unknown == [("D", "X")]
+    assert [members for members, _ in error.value.cycles] == [["A", "B", "C"], ["E"]]
+
+
+def test_acyclic_network_is_valid():
+    cpm = CPM(randomDag(200, seed=3))
+    cpm.validate()
+    cpm.calculate()
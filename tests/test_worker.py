@@ -0,0 +1,67 @@
+import threading
+from common.worker import BackgroundSolver
+
+
+class Widget:
+    """
+    Stands in for the Tk widget: after() callbacks run when the test calls run().
+    """
+
+    def __init__(self):
+        self.pending = []
+
+    def after(self, ms, callback):
+        self.pending.append(callback)
+
+    def run(self):
+        while self.pending:
+            self.pending.pop(0)()
+
+
+def blocking(job, release):
+    while not release.wait(0.01):
+        job.check()
+    return "result"
+
+
+def test_result_is_delivered_on_the_polling_thread():
+    widget = Widget()
+    solver = BackgroundSolver(widget)
+    release = threading.Event()
+    events = []
+    job = solver.submit(blocking, release, on_done=lambda result, elapsed: events.append(result))
+    release.set()
+    while solver.busy:
+        widget.run()
+    assert events == ["result"] and job.generation == solver.generation
+
+
+def test_invalidate_reports_the_cancelled_job():
+    widget = Widget()
+    solver = BackgroundSolver(widget)
+    release = threading.Event()
+    events = []
+    solver.submit(blocking, release, on_done=lambda *a: events.append("done"),
+                  on_cancel=lambda: events.append("cancelled"))
+    solver.invalidate()
+    assert events == ["cancelled"] and not solver.busy
+    release.set()
+    widget.run()
+    assert events == ["cancelled"]
+
+    # Nothing is running any more: no second notification
+    solver.invalidate()
+    assert events == ["cancelled"]
+
+
+def test_resubmitting_does_not_report_the_superseded_job():
+    widget = Widget()
+    solver = BackgroundSolver(widget)
+    release = threading.Event()
+    events = []
+    solver.submit(blocking, release, on_cancel=lambda: events.append("first cancelled"))
+    solver.submit(blocking, release, on_done=lambda result, elapsed: events.append(result))
+    release.set()
+    while solver.busy:
+        widget.run()
+    assert events == ["result"]